@@ -1,18 +1,118 @@
-from .baza import Baza, History
-from .card import Card, CardSet
-from .contrada import CONTRADA, NORMAL, RECONTRADA, SANT_VICENTADA, Contrada
-from .deck import Deck
-from .descriptions import CardSetDescription, SuitDescription
-from .model import Model
-from .play_baza import PlayBazaInput, PlayBazaOutput, play_baza
-from .play_hand import PlayHandInput, PlayHandOutput
-from .schema import (
-    CantarInput,
-    CantarOutput,
-    ContrarInput,
-    ContrarOutput,
-    PlayInput,
-    PlayOutput,
-)
-from .suit import BASTOS, COPAS, ESPADAS, OROS, Suit
-from .variants import LIBRE, OBLIGADA, GameVariant
+"""butilib: play and study butifarra.
+
+The public names are loaded lazily, the submodule that defines a name is only imported the first time the name is
+accessed (e.g. butilib.Card imports butilib.card), so that importing butilib is cheap for short-lived processes.
+"""
+
+import sys
+from importlib import import_module
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from .baza import Baza, History
+    from .card import Card, CardSet
+    from .contrada import CONTRADA, NORMAL, RECONTRADA, SANT_VICENTADA, Contrada
+    from .deck import Deck
+    from .descriptions import CardSetDescription, SuitDescription
+    from .evaluation import (
+        DuplicateDealResult,
+        DuplicateResult,
+        SequentialDecision,
+        SequentialResult,
+        SequentialTest,
+        duplicate_match,
+        iter_duplicate_deals,
+        sequential_match,
+    )
+    from .model import Model
+    from .observer import GameObserver
+    from .play_baza import PlayBazaInput, PlayBazaOutput, play_baza
+    from .play_hand import PlayHandInput, PlayHandOutput, hand_score, play_hand
+    from .record import GameRecord
+    from .schema import (
+        CantarInput,
+        CantarOutput,
+        ContrarInput,
+        ContrarOutput,
+        PlayInput,
+        PlayOutput,
+    )
+    from .suit import BASTOS, COPAS, ESPADAS, OROS, Suit
+    from .variants import LIBRE, OBLIGADA, GameVariant
+
+# The submodule that defines every public name.
+_EXPORTS: Dict[str, str] = {
+    "Baza": "baza",
+    "History": "baza",
+    "Card": "card",
+    "CardSet": "card",
+    "CONTRADA": "contrada",
+    "NORMAL": "contrada",
+    "RECONTRADA": "contrada",
+    "SANT_VICENTADA": "contrada",
+    "Contrada": "contrada",
+    "Deck": "deck",
+    "CardSetDescription": "descriptions",
+    "SuitDescription": "descriptions",
+    "DuplicateDealResult": "evaluation",
+    "DuplicateResult": "evaluation",
+    "SequentialDecision": "evaluation",
+    "SequentialResult": "evaluation",
+    "SequentialTest": "evaluation",
+    "duplicate_match": "evaluation",
+    "iter_duplicate_deals": "evaluation",
+    "sequential_match": "evaluation",
+    "Model": "model",
+    "GameObserver": "observer",
+    "PlayBazaInput": "play_baza",
+    "PlayBazaOutput": "play_baza",
+    "play_baza": "play_baza",
+    "PlayHandInput": "play_hand",
+    "PlayHandOutput": "play_hand",
+    "hand_score": "play_hand",
+    "play_hand": "play_hand",
+    "GameRecord": "record",
+    "CantarInput": "schema",
+    "CantarOutput": "schema",
+    "ContrarInput": "schema",
+    "ContrarOutput": "schema",
+    "PlayInput": "schema",
+    "PlayOutput": "schema",
+    "BASTOS": "suit",
+    "COPAS": "suit",
+    "ESPADAS": "suit",
+    "OROS": "suit",
+    "Suit": "suit",
+    "LIBRE": "variants",
+    "OBLIGADA": "variants",
+    "GameVariant": "variants",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    # Later accesses find the name in the module and skip this function.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
+
+
+class _Package(ModuleType):
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Importing a submodule sets it as an attribute of the package, which would hide the public function of the
+        # same name (play_baza, play_hand): leave it to __getattr__.
+        if isinstance(value, ModuleType) and _EXPORTS.get(name) == name:
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
@@ -0,0 +1,133 @@
+from typing import Iterable, List
+
+import numpy as np
+
+from .contrada import Contrada
+from .record import GameRecord
+from .rules import POINTS, STRENGTH, SUITS, suit_index
+from .variants import LIBRE, OBLIGADA
+
+BAZA_DTYPE = np.dtype(
+    [
+        ("hand", "u4"),
+        ("baza", "u1"),
+        ("initial_player", "u1"),
+        ("card_0", "u1"),
+        ("card_1", "u1"),
+        ("card_2", "u1"),
+        ("card_3", "u1"),
+        ("winner", "u1"),
+        ("points", "u1"),
+        ("triumph", "i1"),
+        ("contrada", "u1"),
+        ("player_c", "u1"),
+        ("delegated", "?"),
+        ("game_variant", "u1"),
+    ]
+)
+
+_POINTS = np.array(POINTS, dtype=np.uint8)
+_STRENGTH = np.array(STRENGTH, dtype=np.int32)
+
+
+def to_array(records: Iterable[GameRecord]) -> np.ndarray:
+    """Convert recorded hands to a structured array with a row per baza (see BAZA_DTYPE). The winner and points of
+    every baza are computed at once for all the hands. The triumph column holds the suit index, -1 if butifarra, and
+    game_variant is 1 for OBLIGADA. Use GameRecord.from_history to convert histories.
+
+    Args:
+        records (Iterable[GameRecord]): The recorded hands.
+
+    Returns:
+        np.ndarray: The bazas of all the hands, ordered by hand and baza.
+    """
+    records = list(records)
+    n = len(records)
+
+    cards = np.array([r.cards for r in records], dtype=np.uint8).reshape(n, 12, 4)
+    leaders = np.array([r.leaders for r in records], dtype=np.uint8).reshape(n, 12)
+    triumph = np.array(
+        [-1 if r.butifarra else suit_index(r.triumph) for r in records], dtype=np.int8
+    ).reshape(n, 1, 1)
+
+    suits = cards // 12
+    lead = suits[:, :, :1]
+    values = np.where(
+        suits == triumph,
+        _STRENGTH[cards] + 10000,
+        np.where(suits == lead, _STRENGTH[cards] + 1000, -1),
+    )
+    win_i = values.argmax(axis=2)
+
+    array = np.zeros(n * 12, dtype=BAZA_DTYPE)
+    array["hand"] = np.repeat(np.arange(n), 12)
+    array["baza"] = np.tile(np.arange(12), n)
+    array["initial_player"] = leaders.ravel()
+    for i in range(4):
+        array[f"card_{i}"] = cards[:, :, i].ravel()
+    array["winner"] = ((leaders + win_i) % 4).ravel()
+    array["points"] = (1 + _POINTS[cards].sum(axis=2)).ravel()
+    array["triumph"] = np.repeat(triumph.ravel(), 12)
+    array["contrada"] = np.repeat([r.contrada.value for r in records], 12)
+    array["player_c"] = np.repeat([r.player_c for r in records], 12)
+    array["delegated"] = np.repeat([r.delegated for r in records], 12)
+    array["game_variant"] = np.repeat([r.game_variant == OBLIGADA for r in records], 12)
+
+    return array
+
+
+def from_array(array: np.ndarray) -> List[GameRecord]:
+    """Convert a structured array created with to_array back to recorded hands.
+
+    Args:
+        array (np.ndarray): The bazas of the hands, 12 consecutive rows per hand ordered by baza.
+
+    Raises:
+        ValueError: If the rows do not make up complete hands.
+
+    Returns:
+        List[GameRecord]: The recorded hands.
+    """
+    if len(array) % 12 != 0:
+        raise ValueError("The array does not contain 12 bazas per hand.")
+
+    cards = np.stack([array[f"card_{i}"] for i in range(4)], axis=1)
+    cards = cards.reshape(-1, 48).tolist()
+    leaders = array["initial_player"].reshape(-1, 12).tolist()
+    first = array[::12]
+
+    return [
+        GameRecord(
+            cards=tuple(cards[h]),
+            leaders=tuple(leaders[h]),
+            triumph=None if row["triumph"] == -1 else SUITS[row["triumph"]],
+            game_variant=OBLIGADA if row["game_variant"] else LIBRE,
+            player_c=int(row["player_c"]),
+            delegated=bool(row["delegated"]),
+            contrada=Contrada(int(row["contrada"])),
+        )
+        for h, row in enumerate(first)
+    ]
+
+
+def save(path: str, records: Iterable[GameRecord]) -> None:
+    """Save recorded hands to a .npy file, see to_array.
+
+    Args:
+        path (str): The path of the file.
+        records (Iterable[GameRecord]): The recorded hands.
+    """
+    np.save(path, to_array(records))
+
+
+def load(path: str, mmap: bool = False) -> np.ndarray:
+    """Load the structured array of a .npy file written with save.
+
+    Args:
+        path (str): The path of the file.
+        mmap (bool, optional): Wether to memory map the file instead of reading it. Defaults to False.
+
+    Returns:
+        np.ndarray: The bazas of all the hands, see to_array.
+    """
+    return np.load(path, mmap_mode="r" if mmap else None)
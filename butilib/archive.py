@@ -0,0 +1,214 @@
+import os
+from typing import BinaryIO, Iterable, Iterator, Optional, Union
+
+from .baza import History
+from .contrada import Contrada
+from .record import GameRecord
+from .rules import SUITS, suit_index
+from .variants import LIBRE, OBLIGADA
+
+MAGIC = b"BUTI"
+VERSION = 1
+HEADER_SIZE = 8
+RECORD_SIZE = 40
+
+
+def encode_record(record: GameRecord) -> bytes:
+    """Encode a recorded hand in 40 bytes. The first 4 bytes are a little endian word with the metadata:
+        bits 0-1    ->   triumph suit index (0 if butifarra)
+        bit 2       ->   butifarra
+        bits 3-4    ->   contrada level
+        bit 5       ->   game variant (1 if OBLIGADA)
+        bits 6-7    ->   player_c
+        bit 8       ->   delegated
+        bits 9-30   ->   initial player of bazas 2 to 12 (2 bits each)
+    The initial player of the first baza is implied by player_c and delegated. The next 36 bytes hold the 48 card
+    ids in the order they were played, 6 bits each, little endian.
+
+    Args:
+        record (GameRecord): The recorded hand.
+
+    Raises:
+        ValueError: If the record is not a complete hand, its cards are not the 48 card ids, its players are not in
+            0..3 or its first baza was not started by the expected player.
+
+    Returns:
+        bytes: The encoded hand.
+    """
+    if len(record.cards) != 48 or len(record.leaders) != 12:
+        raise ValueError("Only complete hands can be encoded.")
+    if sorted(record.cards) != list(range(48)):
+        raise ValueError("The cards must be the 48 card ids, each played once.")
+    if not all(0 <= p <= 3 for p in (*record.leaders, record.player_c)):
+        raise ValueError("The players must be in 0..3.")
+    called = record.player_c if not record.delegated else (record.player_c + 2) % 4
+    if record.leaders[0] != (called + 1) % 4:
+        raise ValueError("The first baza was not started by the expected player.")
+
+    meta = (
+        (suit_index(record.triumph) or 0)
+        | record.butifarra << 2
+        | record.contrada.value << 3
+        | (record.game_variant == OBLIGADA) << 5
+        | record.player_c << 6
+        | record.delegated << 8
+    )
+    for i in range(1, 12):
+        meta |= record.leaders[i] << (7 + 2 * i)
+
+    cards = 0
+    for i, c in enumerate(record.cards):
+        cards |= c << (6 * i)
+
+    return meta.to_bytes(4, "little") + cards.to_bytes(36, "little")
+
+
+def decode_record(data: bytes) -> GameRecord:
+    """Decode a hand encoded with encode_record.
+
+    Args:
+        data (bytes): The 40 bytes of the encoded hand.
+
+    Returns:
+        GameRecord: The recorded hand.
+    """
+    meta = int.from_bytes(data[:4], "little")
+    cards = int.from_bytes(data[4:RECORD_SIZE], "little")
+
+    player_c = meta >> 6 & 3
+    delegated = bool(meta >> 8 & 1)
+    called = player_c if not delegated else (player_c + 2) % 4
+
+    return GameRecord(
+        cards=tuple(cards >> (6 * i) & 63 for i in range(48)),
+        leaders=((called + 1) % 4,)
+        + tuple(meta >> (7 + 2 * i) & 3 for i in range(1, 12)),
+        triumph=None if meta >> 2 & 1 else SUITS[meta & 3],
+        game_variant=OBLIGADA if meta >> 5 & 1 else LIBRE,
+        player_c=player_c,
+        delegated=delegated,
+        contrada=Contrada(meta >> 3 & 3),
+    )
+
+
+class ArchiveWriter:
+    """Write recorded hands to a binary archive, a header of 8 bytes followed by a 40 bytes record per hand
+    (see encode_record). Use it as a context manager or call close when done.
+
+    Args:
+        file (Union[str, BinaryIO]): The path of the archive or a binary file open for writing.
+    """
+
+    def __init__(self, file: Union[str, BinaryIO]):
+        self._owned = isinstance(file, str)
+        self._file = open(file, "wb") if self._owned else file
+        self._file.write(MAGIC + bytes([VERSION, RECORD_SIZE, 0, 0]))
+
+    def write(self, record: GameRecord) -> None:
+        """Append a recorded hand to the archive.
+
+        Args:
+            record (GameRecord): The recorded hand.
+        """
+        self._file.write(encode_record(record))
+
+    def write_many(self, records: Iterable[GameRecord]) -> None:
+        """Append several recorded hands to the archive.
+
+        Args:
+            records (Iterable[GameRecord]): The recorded hands.
+        """
+        self._file.write(b"".join(encode_record(r) for r in records))
+
+    def close(self) -> None:
+        """Flush the archive, closing the file if it was opened by the writer."""
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def _check_header(header: bytes) -> None:
+    if header[:4] != MAGIC or header[4] != VERSION or header[5] != RECORD_SIZE:
+        raise ValueError("The file is not a butilib archive.")
+
+
+def archive_length(path: str) -> int:
+    """Return the number of recorded hands of a binary archive, from its size.
+
+    Args:
+        path (str): The path of the archive.
+
+    Raises:
+        ValueError: If the file is not a butilib archive or it is truncated.
+
+    Returns:
+        int: The number of recorded hands.
+    """
+    with open(path, "rb") as f:
+        _check_header(f.read(HEADER_SIZE))
+    size = os.path.getsize(path) - HEADER_SIZE
+    if size % RECORD_SIZE != 0:
+        raise ValueError("The archive is truncated.")
+    return size // RECORD_SIZE
+
+
+def read_archive(
+    file: Union[str, BinaryIO],
+    chunk_size: int = 4096,
+    start: int = 0,
+    stop: Optional[int] = None,
+) -> Iterator[GameRecord]:
+    """Iterate over the recorded hands of a binary archive, reading it in chunks instead of loading it in memory.
+
+    Args:
+        file (Union[str, BinaryIO]): The path of the archive or a binary file open for reading.
+        chunk_size (int, optional): The number of records read at once. Defaults to 4096.
+        start (int, optional): The index of the first record to read, the records before it are skipped with a seek
+            (the file must be seekable if not 0). Defaults to 0.
+        stop (Optional[int], optional): The index after the last record to read. Defaults to the end of the archive.
+
+    Raises:
+        ValueError: If the file is not a butilib archive or it is truncated.
+
+    Yields:
+        GameRecord: The recorded hands, in order.
+    """
+    f = open(file, "rb") if isinstance(file, str) else file
+    try:
+        _check_header(f.read(HEADER_SIZE))
+        if start > 0:
+            f.seek(start * RECORD_SIZE, os.SEEK_CUR)
+
+        left = float("inf") if stop is None else stop - start
+        while left > 0 and (data := f.read(RECORD_SIZE * min(chunk_size, left))):
+            if len(data) % RECORD_SIZE != 0:
+                raise ValueError("The archive is truncated.")
+            left -= len(data) // RECORD_SIZE
+            for i in range(0, len(data), RECORD_SIZE):
+                yield decode_record(data[i : i + RECORD_SIZE])
+    finally:
+        if isinstance(file, str):
+            f.close()
+
+
+def read_histories(
+    file: Union[str, BinaryIO], chunk_size: int = 4096
+) -> Iterator[History]:
+    """Iterate over the histories of the recorded hands of a binary archive, see read_archive.
+
+    Args:
+        file (Union[str, BinaryIO]): The path of the archive or a binary file open for reading.
+        chunk_size (int, optional): The number of records read at once. Defaults to 4096.
+
+    Yields:
+        History: The history of every recorded hand, in order.
+    """
+    for record in read_archive(file, chunk_size):
+        yield record.history()
@@ -1,6 +1,6 @@
 from typing import List
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from .card import Card
 
@@ -17,6 +17,8 @@ class Baza(BaseModel):
 
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     initial_player: int = Field(ge=0, le=3)
     cards: List[Card] = Field(max_length=4)
 
@@ -67,6 +69,8 @@ class History(BaseModel):
 
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     bazas: List[Baza] = Field(max_length=12)
 
     @field_validator("bazas")
@@ -0,0 +1,23 @@
+"""Benchmarks of the hot paths of butilib, run them with python -m butilib.bench (see --help)."""
+
+from .compare import (
+    IMPROVED,
+    MISSING,
+    NEW,
+    REGRESSED,
+    UNCHANGED,
+    Comparison,
+    compare,
+    compare_result,
+    mann_whitney,
+)
+from .runner import (
+    Benchmark,
+    BenchmarkResult,
+    dump,
+    load,
+    run,
+    run_benchmark,
+    select,
+)
+from .suite import BENCHMARKS
@@ -0,0 +1,126 @@
+import argparse
+import re
+import sys
+import warnings
+from typing import List, Optional
+
+from .compare import REGRESSED, compare, print_comparisons
+from .runner import BenchmarkResult, dump, load, print_result, run, select
+from .suite import BENCHMARKS
+
+
+def parser() -> argparse.ArgumentParser:
+    """Return the parser of the command line of python -m butilib.bench.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m butilib.bench",
+        description="Time the hot paths of butilib and write the results as JSON, or compare them against a "
+        "baseline written before and exit with status 1 if a benchmark regressed.",
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        help="only run the benchmarks whose name matches this regular expression",
+    )
+    parser.add_argument(
+        "-n", "--trials", type=int, default=5, help="trials per benchmark (default 5)"
+    )
+    parser.add_argument(
+        "-t",
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="target seconds per trial (default 0.2)",
+    )
+    parser.add_argument(
+        "-o", "--output", help="write the JSON results to this file instead of stdout"
+    )
+    parser.add_argument(
+        "-l", "--list", action="store_true", help="list the benchmarks and exit"
+    )
+    parser.add_argument(
+        "-c",
+        "--compare",
+        metavar="BASELINE",
+        help="compare against the JSON results in this file, printing a report instead of the results",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown of the median that counts as a regression (default 0.1)",
+    )
+    parser.add_argument(
+        "--alpha",
+        type=float,
+        default=0.05,
+        help="significance level of the comparison (default 0.05)",
+    )
+    parser.add_argument(
+        "--gate",
+        help="only fail on regressions of the benchmarks whose name matches this regular expression",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark suite from the command line. Progress goes to stderr and the JSON results to stdout or to
+    the output file. When comparing against a baseline, the report goes to stdout and the results are only written
+    to the output file.
+
+    Args:
+        argv (Optional[List[str]], optional): The arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        int: The exit status.
+    """
+    args = parser().parse_args(argv)
+    benchmarks = select(BENCHMARKS, args.filter)
+
+    if args.list:
+        for b in benchmarks:
+            print(f"{b.name:<28} {b.group}")
+        return 0
+
+    baseline: List[BenchmarkResult] = []
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = load(f)
+        if args.filter is not None:
+            baseline = [r for r in baseline if re.search(args.filter, r.name)]
+        # Only the benchmarks of the baseline can be compared.
+        names = {r.name for r in baseline}
+        benchmarks = [b for b in benchmarks if b.name in names]
+
+    # Warnings of the benchmarked code would be interleaved with the progress lines.
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        results = run(benchmarks, args.trials, args.min_time, progress=print_result)
+    if args.output is None:
+        if args.compare is None:
+            dump(results, sys.stdout)
+    else:
+        with open(args.output, "w") as f:
+            dump(results, f)
+    return 0 if args.compare is None else _compare(args, baseline, results)
+
+
+def _compare(
+    args: argparse.Namespace,
+    baseline: List[BenchmarkResult],
+    results: List[BenchmarkResult],
+) -> int:
+    comparisons = compare(baseline, results, args.threshold, args.alpha)
+    print_comparisons(comparisons, sys.stdout)
+
+    gated = {b.name for b in select(BENCHMARKS, args.gate)}
+    regressions = [
+        c.name for c in comparisons if c.status == REGRESSED and c.name in gated
+    ]
+    if regressions:
+        print(f"Regressed: {', '.join(regressions)}.", file=sys.stderr)
+        return 1
+    return 0
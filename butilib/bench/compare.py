@@ -0,0 +1,167 @@
+from functools import lru_cache
+from math import comb, erf, sqrt
+from typing import List, NamedTuple, Optional, Sequence, TextIO
+
+from .runner import BenchmarkResult, format_time
+
+REGRESSED = "regressed"
+IMPROVED = "improved"
+UNCHANGED = "unchanged"
+MISSING = "missing"
+NEW = "new"
+
+
+@lru_cache(maxsize=None)
+def _u_counts(m: int, n: int) -> List[int]:
+    # The number of orderings of m and n values with every U statistic, U counting the pairs where a value of the
+    # first sample is above one of the second.
+    if m == 0 or n == 0:
+        return [1]
+    counts = [0] * (m * n + 1)
+    # The greatest value belongs to the first sample (above the n values of the second) or to the second.
+    for u, c in enumerate(_u_counts(m - 1, n)):
+        counts[u + n] += c
+    for u, c in enumerate(_u_counts(m, n - 1)):
+        counts[u] += c
+    return counts
+
+
+def mann_whitney(a: Sequence[float], b: Sequence[float]) -> float:
+    """Return the one sided p-value of the Mann-Whitney U test that the values of a tend to be greater than the
+    ones of b. The p-value is exact for small samples (up to 400 pairs) and uses the normal approximation otherwise.
+
+    Args:
+        a (Sequence[float]): The first sample.
+        b (Sequence[float]): The second sample.
+
+    Returns:
+        float: The p-value.
+    """
+    m, n = len(a), len(b)
+    if m == 0 or n == 0:
+        return 1.0
+    u = sum((x > y) + 0.5 * (x == y) for x in a for y in b)
+
+    if m * n <= 400:
+        counts = _u_counts(m, n)
+        return sum(counts[int(u + 0.5) :]) / comb(m + n, m)
+
+    mean = m * n / 2
+    sd = sqrt(m * n * (m + n + 1) / 12)
+    z = (u - 0.5 - mean) / sd
+    return 0.5 * (1 - erf(z / sqrt(2)))
+
+
+class Comparison(NamedTuple):
+    """The comparison of a benchmark against its baseline.
+
+    Attributes:
+        name (str): The name of the benchmark.
+        status (str): REGRESSED, IMPROVED, UNCHANGED, MISSING (only in the baseline) or NEW (not in the baseline).
+        baseline (Optional[float]): The median of the baseline, in seconds per call.
+        current (Optional[float]): The median of the current run, in seconds per call.
+        ratio (Optional[float]): The current median over the baseline one.
+        p_value (Optional[float]): The p-value of the change, see mann_whitney.
+    """
+
+    name: str
+    status: str
+    baseline: Optional[float]
+    current: Optional[float]
+    ratio: Optional[float]
+    p_value: Optional[float]
+
+
+def compare_result(
+    baseline: BenchmarkResult,
+    current: BenchmarkResult,
+    threshold: float = 0.1,
+    alpha: float = 0.05,
+) -> Comparison:
+    """Compare a benchmark against its baseline: it regressed (or improved) if its median time grew (or shrank) by
+    more than the threshold and the trials of both runs tell the change from noise, that is the Mann-Whitney U test
+    of the change has a p-value under alpha. With few trials the test cannot reach small p-values (5 trials against
+    5 reach 0.004), so run enough trials for the alpha asked.
+
+    Args:
+        baseline (BenchmarkResult): The baseline result.
+        current (BenchmarkResult): The current result.
+        threshold (float, optional): The relative change of the median to report. Defaults to 0.1.
+        alpha (float, optional): The significance level. Defaults to 0.05.
+
+    Returns:
+        Comparison: The comparison.
+    """
+    ratio = current.median / baseline.median
+    if ratio > 1 + threshold:
+        p = mann_whitney(current.times, baseline.times)
+        status = REGRESSED if p < alpha else UNCHANGED
+    elif ratio < 1 / (1 + threshold):
+        p = mann_whitney(baseline.times, current.times)
+        status = IMPROVED if p < alpha else UNCHANGED
+    else:
+        p = min(
+            mann_whitney(current.times, baseline.times),
+            mann_whitney(baseline.times, current.times),
+        )
+        status = UNCHANGED
+    return Comparison(current.name, status, baseline.median, current.median, ratio, p)
+
+
+def compare(
+    baseline: Sequence[BenchmarkResult],
+    current: Sequence[BenchmarkResult],
+    threshold: float = 0.1,
+    alpha: float = 0.05,
+) -> List[Comparison]:
+    """Compare every benchmark of a run against a baseline, see compare_result. Benchmarks only in the baseline are
+    MISSING and benchmarks not in the baseline are NEW.
+
+    Args:
+        baseline (Sequence[BenchmarkResult]): The baseline results.
+        current (Sequence[BenchmarkResult]): The current results.
+        threshold (float, optional): The relative change of the median to report. Defaults to 0.1.
+        alpha (float, optional): The significance level. Defaults to 0.05.
+
+    Returns:
+        List[Comparison]: The comparisons, in the order of the current run followed by the missing benchmarks.
+    """
+    by_name = {r.name: r for r in baseline}
+    names = {r.name for r in current}
+    comparisons = []
+    for result in current:
+        base = by_name.get(result.name)
+        if base is None:
+            comparisons.append(
+                Comparison(result.name, NEW, None, result.median, None, None)
+            )
+        else:
+            comparisons.append(compare_result(base, result, threshold, alpha))
+    for result in baseline:
+        if result.name not in names:
+            comparisons.append(
+                Comparison(result.name, MISSING, result.median, None, None, None)
+            )
+    return comparisons
+
+
+def print_comparisons(comparisons: Sequence[Comparison], file: TextIO) -> None:
+    """Print a line per comparison with the medians, their ratio, the p-value and the status.
+
+    Args:
+        comparisons (Sequence[Comparison]): The comparisons.
+        file (TextIO): The text file to print to.
+    """
+    print(
+        f"{'benchmark':<28} {'baseline':>10} {'current':>10} {'ratio':>7} {'p':>7}  status",
+        file=file,
+    )
+    for c in comparisons:
+        baseline = "-" if c.baseline is None else format_time(c.baseline)
+        current = "-" if c.current is None else format_time(c.current)
+        ratio = "-" if c.ratio is None else f"{c.ratio:.3f}"
+        p = "-" if c.p_value is None else f"{c.p_value:.3f}"
+        print(
+            f"{c.name:<28} {baseline:>10} {current:>10} {ratio:>7} {p:>7}  {c.status}",
+            file=file,
+        )
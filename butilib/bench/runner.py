@@ -0,0 +1,259 @@
+import json
+import platform
+import re
+import sys
+import time
+import timeit
+from importlib.metadata import PackageNotFoundError, version
+from statistics import fmean, median, stdev
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, TextIO
+
+FORMAT = "butilib-bench"
+FORMAT_VERSION = 1
+
+
+class Benchmark(NamedTuple):
+    """A benchmark: a setup function, run once and out of the timings, that returns the function to time.
+
+    Attributes:
+        name (str): The name of the benchmark, dotted by the object it covers (e.g. "card.compare").
+        group (str): "micro" for single operations, "macro" for whole bazas and hands, "startup" for the imports
+            of a new interpreter.
+        setup (Callable[[], Callable[[], Any]]): The setup function.
+    """
+
+    name: str
+    group: str
+    setup: Callable[[], Callable[[], Any]]
+
+
+class BenchmarkResult(NamedTuple):
+    """The timings of a benchmark: the time per call of every trial, each trial timing the function number times.
+
+    Attributes:
+        name (str): The name of the benchmark.
+        group (str): The group of the benchmark.
+        number (int): The number of calls per trial.
+        times (List[float]): The seconds per call of every trial.
+    """
+
+    name: str
+    group: str
+    number: int
+    times: List[float]
+
+    @property
+    def best(self) -> float:
+        """float: The fastest trial, in seconds per call."""
+        return min(self.times)
+
+    @property
+    def median(self) -> float:
+        """float: The median trial, in seconds per call."""
+        return median(self.times)
+
+    @property
+    def mean(self) -> float:
+        """float: The mean of the trials, in seconds per call."""
+        return fmean(self.times)
+
+    @property
+    def stdev(self) -> float:
+        """float: The standard deviation of the trials, 0 with a single trial."""
+        return stdev(self.times) if len(self.times) > 1 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the result as a JSON object, with its statistics.
+
+        Returns:
+            Dict[str, Any]: The result.
+        """
+        return {
+            "name": self.name,
+            "group": self.group,
+            "number": self.number,
+            "times": list(self.times),
+            "best": self.best,
+            "median": self.median,
+            "mean": self.mean,
+            "stdev": self.stdev,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BenchmarkResult":
+        """Build a result from the JSON object written by to_dict.
+
+        Args:
+            data (Dict[str, Any]): The result.
+
+        Returns:
+            BenchmarkResult: The result.
+        """
+        return cls(data["name"], data["group"], data["number"], list(data["times"]))
+
+
+def run_benchmark(
+    benchmark: Benchmark, trials: int = 5, min_time: float = 0.2
+) -> BenchmarkResult:
+    """Time a benchmark: the number of calls per trial is calibrated so that a trial takes about min_time seconds.
+
+    Args:
+        benchmark (Benchmark): The benchmark.
+        trials (int, optional): The number of trials. Defaults to 5.
+        min_time (float, optional): The target duration of a trial in seconds. Defaults to 0.2.
+
+    Raises:
+        ValueError: If the number of trials is not positive.
+
+    Returns:
+        BenchmarkResult: The timings.
+    """
+    if trials < 1:
+        raise ValueError("The number of trials must be positive.")
+    timer = timeit.Timer(benchmark.setup(), timer=time.perf_counter)
+
+    number, elapsed = 1, timer.timeit(1)
+    while elapsed < min_time / 10:
+        number *= 10
+        elapsed = timer.timeit(number)
+    number = max(1, round(number * min_time / elapsed))
+
+    times = [t / number for t in timer.repeat(trials, number)]
+    return BenchmarkResult(benchmark.name, benchmark.group, number, times)
+
+
+def select(
+    benchmarks: Sequence[Benchmark], pattern: Optional[str] = None
+) -> List[Benchmark]:
+    """Return the benchmarks whose name matches a regular expression.
+
+    Args:
+        benchmarks (Sequence[Benchmark]): The benchmarks.
+        pattern (Optional[str], optional): The regular expression, searched in the names. Defaults to all.
+
+    Returns:
+        List[Benchmark]: The benchmarks selected.
+    """
+    if pattern is None:
+        return list(benchmarks)
+    regex = re.compile(pattern)
+    return [b for b in benchmarks if regex.search(b.name)]
+
+
+def run(
+    benchmarks: Sequence[Benchmark],
+    trials: int = 5,
+    min_time: float = 0.2,
+    progress: Optional[Callable[[BenchmarkResult], None]] = None,
+) -> List[BenchmarkResult]:
+    """Time some benchmarks, see run_benchmark.
+
+    Args:
+        benchmarks (Sequence[Benchmark]): The benchmarks.
+        trials (int, optional): The number of trials of every benchmark. Defaults to 5.
+        min_time (float, optional): The target duration of a trial in seconds. Defaults to 0.2.
+        progress (Optional[Callable[[BenchmarkResult], None]], optional): Called with every result as soon as it is
+            ready. Defaults to None.
+
+    Returns:
+        List[BenchmarkResult]: The timings, in the order of the benchmarks.
+    """
+    results = []
+    for benchmark in benchmarks:
+        result = run_benchmark(benchmark, trials, min_time)
+        if progress is not None:
+            progress(result)
+        results.append(result)
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    """Return the description of the machine and versions the benchmarks run on.
+
+    Returns:
+        Dict[str, Any]: The description.
+    """
+    try:
+        butilib = version("butilib")
+    except PackageNotFoundError:
+        butilib = None
+    return {
+        "butilib": butilib,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "pydantic": version("pydantic"),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def dump(results: Sequence[BenchmarkResult], file: TextIO) -> None:
+    """Write results as JSON, with the description of the environment.
+
+    Args:
+        results (Sequence[BenchmarkResult]): The results.
+        file (TextIO): The text file to write to.
+    """
+    json.dump(
+        {
+            "format": FORMAT,
+            "version": FORMAT_VERSION,
+            "environment": environment(),
+            "benchmarks": [r.to_dict() for r in results],
+        },
+        file,
+        indent=2,
+    )
+    file.write("\n")
+
+
+def load(file: TextIO) -> List[BenchmarkResult]:
+    """Read the results written by dump.
+
+    Args:
+        file (TextIO): The text file to read from.
+
+    Raises:
+        ValueError: If the file does not hold butilib benchmark results.
+
+    Returns:
+        List[BenchmarkResult]: The results.
+    """
+    data = json.load(file)
+    if not isinstance(data, dict) or data.get("format") != FORMAT:
+        raise ValueError("The file does not hold butilib benchmark results.")
+    if data.get("version") != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported benchmark results version {data.get('version')}."
+        )
+    return [BenchmarkResult.from_dict(r) for r in data["benchmarks"]]
+
+
+def format_time(seconds: float) -> str:
+    """Format a duration with the most readable unit.
+
+    Args:
+        seconds (float): The duration in seconds.
+
+    Returns:
+        str: The formatted duration.
+    """
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def print_result(result: BenchmarkResult, file: Optional[TextIO] = None) -> None:
+    """Print a line with the name, median and spread of a result.
+
+    Args:
+        result (BenchmarkResult): The result.
+        file (Optional[TextIO], optional): The text file to print to. Defaults to sys.stderr.
+    """
+    print(
+        f"{result.name:<28} {format_time(result.median):>10}"
+        f" +- {format_time(result.stdev):>10}  ({len(result.times)} x {result.number})",
+        file=file or sys.stderr,
+    )
@@ -0,0 +1,192 @@
+import os
+import random
+import subprocess
+import sys
+from typing import Any, Callable, Dict, List
+
+import butilib
+from butilib.baza import History
+from butilib.card import Card, CardSet
+from butilib.contrada import NORMAL
+from butilib.deck import Deck
+from butilib.models.baseline import GreedyModel, RandomLegalModel
+from butilib.play_baza import PlayBazaInput, play_baza
+from butilib.play_hand import PlayHandInput, PlayHandOutput, play_hand
+from butilib.schema import PlayInput
+from butilib.suit import BASTOS, OROS
+from butilib.variants import LIBRE
+
+from .runner import Benchmark
+
+
+def _deal(seed: int = 0) -> List[CardSet]:
+    cards = list(Deck.new().cards)
+    random.Random(seed).shuffle(cards)
+    return list(Deck(cards=cards).deal())
+
+
+def _hand(seed: int = 0) -> PlayHandOutput:
+    return play_hand(
+        PlayHandInput(
+            players=[GreedyModel(seed=seed) for _ in range(4)],
+            card_sets=_deal(seed),
+            score=(0, 0),
+            player_c=0,
+            game_variant=LIBRE,
+        )
+    )
+
+
+def _play_input_fields(hand: PlayHandOutput, bazas: int, cards: int) -> Dict[str, Any]:
+    # The fields of the PlayInput of the player to play after some bazas and cards of the current baza.
+    baza = hand.history.bazas[bazas]
+    player = (baza.initial_player + cards) % 4
+    left = [
+        b.cards[(player - b.initial_player) % 4] for b in hand.history.bazas[bazas:]
+    ]
+    return dict(
+        history=History(bazas=hand.history.bazas[:bazas]),
+        card_set=CardSet(cards=left),
+        triumph=hand.triumph,
+        butifarra=hand.butifarra,
+        player_number=player,
+        cards=baza.cards[:cards],
+        contrada=hand.contrada,
+        player_c=hand.player_c,
+        delegated=hand.delegated,
+        game_variant=hand.game_variant,
+    )
+
+
+def card_compare() -> Callable[[], Any]:
+    a, b = Card(number=9, suit=OROS), Card(number=1, suit=BASTOS)
+    return lambda: a.compare(b, OROS, BASTOS)
+
+
+def card_hash() -> Callable[[], Any]:
+    card = Card(number=9, suit=OROS)
+    return lambda: hash(card)
+
+
+def cardset_add_remove() -> Callable[[], Any]:
+    card_set = _deal()[0]
+    card = card_set.pop()
+
+    def add_remove():
+        card_set.add(card)
+        card_set.remove(card)
+
+    return add_remove
+
+
+def cardset_get() -> Callable[[], Any]:
+    card_set = _deal()[0]
+    return lambda: card_set.get(suit=OROS)
+
+
+def cardset_describe() -> Callable[[], Any]:
+    card_set = _deal()[0]
+    return card_set.describe
+
+
+def deck_new() -> Callable[[], Any]:
+    return Deck.new
+
+
+def deck_shuffle() -> Callable[[], Any]:
+    return Deck.new().shuffle
+
+
+def deck_deal() -> Callable[[], Any]:
+    # Dealing empties the deck, so every call deals a copy built without validation.
+    cards = Deck.new().cards
+    return lambda: Deck.model_construct(cards=list(cards)).deal()
+
+
+def play_input_early() -> Callable[[], Any]:
+    fields = _play_input_fields(_hand(), 0, 2)
+    return lambda: PlayInput(**fields)
+
+
+def play_input_late() -> Callable[[], Any]:
+    fields = _play_input_fields(_hand(), 11, 2)
+    return lambda: PlayInput(**fields)
+
+
+def model_play() -> Callable[[], Any]:
+    input = PlayInput(**_play_input_fields(_hand(), 0, 2))
+    model = RandomLegalModel(seed=0)
+    return lambda: model.play(input)
+
+
+def baza() -> Callable[[], Any]:
+    # play_baza does not remove the cards played from the card sets, so every call plays the first baza again.
+    input = PlayBazaInput(
+        history=History(bazas=[]),
+        players=[RandomLegalModel(seed=i) for i in range(4)],
+        card_sets=_deal(),
+        initial_player=1,
+        triumph=OROS,
+        player_c=0,
+        delegated=False,
+        game_variant=LIBRE,
+        contrada=NORMAL,
+    )
+    return lambda: play_baza(input)
+
+
+def _hand_benchmark(model: Callable[[int], Any]) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        input = PlayHandInput(
+            players=[model(i) for i in range(4)],
+            card_sets=_deal(),
+            score=(0, 0),
+            player_c=0,
+            game_variant=LIBRE,
+        )
+        return lambda: play_hand(input)
+
+    return setup
+
+
+def _startup(statement: str) -> Callable[[], Callable[[], Any]]:
+    # Imports are cached in the process, so every call runs the statement in a new interpreter. The interpreter
+    # startup is timed too, startup.interpreter measures it alone.
+    def setup() -> Callable[[], Any]:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(butilib.__file__)))
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            p for p in (root, env.get("PYTHONPATH")) if p
+        )
+        args = [sys.executable, "-c", statement]
+        return lambda: subprocess.run(args, env=env, check=True)
+
+    return setup
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("card.compare", "micro", card_compare),
+    Benchmark("card.hash", "micro", card_hash),
+    Benchmark("cardset.add_remove", "micro", cardset_add_remove),
+    Benchmark("cardset.get", "micro", cardset_get),
+    Benchmark("cardset.describe", "micro", cardset_describe),
+    Benchmark("deck.new", "micro", deck_new),
+    Benchmark("deck.shuffle", "micro", deck_shuffle),
+    Benchmark("deck.deal", "micro", deck_deal),
+    Benchmark("play_input.early", "micro", play_input_early),
+    Benchmark("play_input.late", "micro", play_input_late),
+    Benchmark("model.play", "micro", model_play),
+    Benchmark("play_baza", "macro", baza),
+    Benchmark(
+        "play_hand.random", "macro", _hand_benchmark(lambda i: RandomLegalModel(seed=i))
+    ),
+    Benchmark(
+        "play_hand.greedy", "macro", _hand_benchmark(lambda i: GreedyModel(seed=i))
+    ),
+    Benchmark("startup.interpreter", "startup", _startup("pass")),
+    Benchmark("startup.import", "startup", _startup("import butilib")),
+    Benchmark("startup.card", "startup", _startup("from butilib import Card")),
+    Benchmark(
+        "startup.play_hand", "startup", _startup("from butilib import play_hand")
+    ),
+]
@@ -0,0 +1,178 @@
+"""Canonical forms of hands, deals and positions under relabelling of suits, on card ids (see Card.to_id).
+
+A relabelling of suits is a permutation: a tuple with the new suit index of every suit index. Hands, deals or
+positions that only differ by a relabelling share the same canonical form, so caches and tables keyed on the
+canonical form are hit by all of them. Every canonical form comes with the permutation that maps the original to
+it; its inverse (see invert) maps the canonical form, or anything computed on it, back.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+from .card import Card, CardSet
+
+Permutation = Tuple[int, int, int, int]
+
+IDENTITY: Permutation = (0, 1, 2, 3)
+
+
+def invert(perm: Permutation) -> Permutation:
+    """Return the inverse of a permutation of suits.
+
+    Args:
+        perm (Permutation): The permutation.
+
+    Returns:
+        Permutation: The inverse permutation.
+    """
+    inverse = [0, 0, 0, 0]
+    for s, t in enumerate(perm):
+        inverse[t] = s
+    return (inverse[0], inverse[1], inverse[2], inverse[3])
+
+
+def permute_card(card: int, perm: Permutation) -> int:
+    """Relabel the suit of a card id.
+
+    Args:
+        card (int): The card id.
+        perm (Permutation): The permutation of suits.
+
+    Returns:
+        int: The relabelled card id.
+    """
+    return perm[card // 12] * 12 + card % 12
+
+
+def permute_cards(cards: Sequence[int], perm: Permutation) -> List[int]:
+    """Relabel the suits of card ids, keeping their order.
+
+    Args:
+        cards (Sequence[int]): The card ids.
+        perm (Permutation): The permutation of suits.
+
+    Returns:
+        List[int]: The relabelled card ids.
+    """
+    return [perm[c // 12] * 12 + c % 12 for c in cards]
+
+
+def permute_suit(suit: Optional[int], perm: Permutation) -> Optional[int]:
+    """Relabel a suit index, None (butifarra) is left as is.
+
+    Args:
+        suit (Optional[int]): The suit index.
+        perm (Permutation): The permutation of suits.
+
+    Returns:
+        Optional[int]: The relabelled suit index.
+    """
+    return None if suit is None else perm[suit]
+
+
+def _masks(cards: Sequence[int]) -> List[int]:
+    masks = [0, 0, 0, 0]
+    for c in cards:
+        masks[c // 12] |= 1 << (c % 12)
+    return masks
+
+
+def _sort(keys: Sequence[tuple]) -> Permutation:
+    # The permutation that sends the suit with the greatest key to 0, the next one to 1 and so on.
+    order = sorted(range(4), key=keys.__getitem__, reverse=True)
+    return invert((order[0], order[1], order[2], order[3]))
+
+
+def canonical_hand(cards: Sequence[int]) -> Tuple[Tuple[int, ...], Permutation]:
+    """Return the canonical form of a hand: its sorted card ids with the suits relabelled so that the 12 bit masks of
+    the suits decrease, and the permutation applied.
+
+    Args:
+        cards (Sequence[int]): The card ids of the hand.
+
+    Returns:
+        Tuple[Tuple[int, ...], Permutation]: The canonical card ids and the permutation.
+    """
+    masks = _masks(cards)
+    perm = _sort([(m,) for m in masks])
+    return tuple(sorted(permute_cards(cards, perm))), perm
+
+
+def canonical_card_set(card_set: CardSet) -> Tuple[CardSet, Permutation]:
+    """Return the canonical form of a card set, see canonical_hand.
+
+    Args:
+        card_set (CardSet): The card set.
+
+    Returns:
+        Tuple[CardSet, Permutation]: The canonical card set and the permutation.
+    """
+    cards, perm = canonical_hand([c.to_id() for c in card_set.cards])
+    return CardSet(cards=[Card.from_id(c) for c in cards]), perm
+
+
+def permute_card_set(card_set: CardSet, perm: Permutation) -> CardSet:
+    """Relabel the suits of a card set.
+
+    Args:
+        card_set (CardSet): The card set.
+        perm (Permutation): The permutation of suits.
+
+    Returns:
+        CardSet: The relabelled card set.
+    """
+    return CardSet(
+        cards=[Card.from_id(permute_card(c.to_id(), perm)) for c in card_set.cards]
+    )
+
+
+def canonical_deal(
+    hands: Sequence[Sequence[int]],
+) -> Tuple[Tuple[Tuple[int, ...], ...], Permutation]:
+    """Return the canonical form of a deal (the cards of every player): the sorted card ids of every player with the
+    suits relabelled so that the masks of the suit in the hands of players 0, 1, 2 and 3 decrease, and the
+    permutation applied.
+
+    Args:
+        hands (Sequence[Sequence[int]]): The card ids of every player.
+
+    Returns:
+        Tuple[Tuple[Tuple[int, ...], ...], Permutation]: The canonical hands and the permutation.
+    """
+    masks = [_masks(h) for h in hands]
+    perm = _sort([tuple(m[s] for m in masks) for s in range(4)])
+    return tuple(tuple(sorted(permute_cards(h, perm))) for h in hands), perm
+
+
+def canonical_position(
+    hands: Sequence[Sequence[int]],
+    triumph: Optional[int],
+    baza: Sequence[int] = (),
+) -> Tuple[Tuple[Tuple[int, ...], ...], Tuple[int, ...], Optional[int], Permutation]:
+    """Return the canonical form of a position: the remaining cards of every player and the cards played in the
+    current baza, with the triumph suit fixed. The triumph suit is relabelled to 0 and the other suits ordered as in
+    canonical_deal, the cards of the current baza breaking ties. The initial player and the points are not affected
+    by a relabelling and are left to the caller.
+
+    Args:
+        hands (Sequence[Sequence[int]]): The remaining card ids of every player.
+        triumph (Optional[int]): The triumph suit, None if butifarra.
+        baza (Sequence[int], optional): The card ids played in the current baza. Defaults to ().
+
+    Returns:
+        Tuple[Tuple[Tuple[int, ...], ...], Tuple[int, ...], Optional[int], Permutation]: The canonical hands, the
+            canonical baza (in the order played), the canonical triumph and the permutation.
+    """
+    masks = [_masks(h) for h in hands]
+    played = [
+        tuple(i * 16 + c % 12 for i, c in enumerate(baza) if c // 12 == s)
+        for s in range(4)
+    ]
+    perm = _sort(
+        [(s == triumph, tuple(m[s] for m in masks), played[s]) for s in range(4)]
+    )
+    return (
+        tuple(tuple(sorted(permute_cards(h, perm))) for h in hands),
+        tuple(permute_cards(baza, perm)),
+        permute_suit(triumph, perm),
+        perm,
+    )
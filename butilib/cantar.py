@@ -0,0 +1,239 @@
+import random
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from math import sqrt
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from .canonical import canonical_hand, invert
+from .contrada import NORMAL
+from .models.heuristics import heuristic_call
+from .play_hand import hand_score
+from .rollout import mean_standard_error, playout
+from .rules import SUITS
+from .schema import CantarInput, CantarOutput
+from .variants import LIBRE, OBLIGADA, GameVariant
+
+# The options of a call, as indices: the four suits (in SUITS order), butifarra and delegate.
+BUTIFARRA = 4
+DELEGATE = 5
+
+
+def _output(option: int) -> CantarOutput:
+    # A new output for every call, callers may change it.
+    if option == BUTIFARRA:
+        return CantarOutput(butifarra=True)
+    if option == DELEGATE:
+        return CantarOutput(delegate=True)
+    return CantarOutput(suit=SUITS[option])
+
+
+class CantarEstimate(NamedTuple):
+    """The estimated value of a call: the mean net score of the team of the caller (their hand score minus the one
+    of the other team) over the simulated hands.
+
+    Attributes:
+        output (CantarOutput): The call.
+        mean (float): The mean net score.
+        standard_error (float): The standard error of the mean.
+        rollouts (int): The number of simulated hands.
+    """
+
+    output: CantarOutput
+    mean: float
+    standard_error: float
+    rollouts: int
+
+
+def _rollout_batch(
+    hand: Tuple[int, ...],
+    option: int,
+    n: int,
+    seed: int,
+    game_variant: GameVariant,
+) -> Tuple[int, float, float]:
+    # Simulate n hands of a call by player 0 with the other cards dealt at random, returning the number of hands,
+    # the sum and the sum of squares of the net scores of team 0.
+    rng = random.Random(seed)
+    obligada = game_variant == OBLIGADA
+    rest = [c for c in range(48) if c not in hand]
+    total = total_sq = 0.0
+    for _ in range(n):
+        rng.shuffle(rest)
+        hands = [list(hand), rest[:12], rest[12:24], rest[24:]]
+
+        caller, call = 0, option
+        if option == DELEGATE:
+            caller = 2
+            call = heuristic_call(hands[2])
+            if call is None:
+                call = BUTIFARRA
+
+        butifarra = call == BUTIFARRA
+        triumph = None if butifarra else call
+        points = playout(hands, caller + 1, [], triumph, obligada, rng)
+        score = hand_score(points, NORMAL, butifarra)
+        net = score[0] - score[1]
+        total += net
+        total_sq += net * net
+    return n, total, total_sq
+
+
+class CantarEvaluator(BaseModel):
+    """Estimate the value of every call of a hand (the four suits, butifarra and delegate) by simulating hands with
+    the other cards dealt at random and every player following butilib.models.greedy_card, at normal contrada. The
+    simulations run in rounds of a batch per call, in parallel over processes if asked, and stop as soon as the best
+    call beats every other by cutoff_z standard errors. The estimates are kept in an LRU cache keyed by the canonical
+    hand (see butilib.canonical.canonical_hand), so hands that only differ by the suits share their estimates.
+
+    With more than one process the worker processes are started on the first simulation and kept for the lifetime of
+    the evaluator: use it as a context manager, or call close, to stop them.
+
+    Attributes:
+        max_rollouts (int): The maximum number of simulated hands per call. Defaults to 2000.
+        min_rollouts (int): The minimum number of simulated hands per call before stopping early. Defaults to 200.
+        batch_size (int): The number of simulated hands per call and round. Defaults to 100.
+        cutoff_z (float): The number of standard errors the best call must lead by to stop early. Defaults to 3.0.
+        processes (int): The number of worker processes, 1 runs the simulations in this process. Defaults to 1.
+        cache_size (int): The maximum number of hands in the cache. Defaults to 1024.
+        game_variant (GameVariant): The game variant of the simulated hands. Defaults to LIBRE.
+        seed (Optional[int]): The seed of the simulations. Defaults to None.
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+    max_rollouts: int = Field(default=2000, ge=1)
+    min_rollouts: int = Field(default=200, ge=1)
+    batch_size: int = Field(default=100, ge=1)
+    cutoff_z: float = Field(default=3.0, gt=0)
+    processes: int = Field(default=1, ge=1)
+    cache_size: int = Field(default=1024, ge=0)
+    game_variant: GameVariant = LIBRE
+    seed: Optional[int] = None
+
+    _cache: Dict[Tuple, List[Tuple[int, float, float]]] = PrivateAttr(
+        default_factory=OrderedDict
+    )
+    _hits: int = PrivateAttr(default=0)
+    _misses: int = PrivateAttr(default=0)
+    _rng: random.Random = PrivateAttr()
+    _executor: Optional[ProcessPoolExecutor] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context) -> None:
+        self._rng = random.Random(self.seed)
+
+    def evaluate(self, input: CantarInput) -> List[CantarEstimate]:
+        """Estimate the value of every call available: the four suits, butifarra and, if the call was not delegated,
+        delegate.
+
+        Args:
+            input (CantarInput): The input of the cantar function.
+
+        Returns:
+            List[CantarEstimate]: The estimates, best first.
+        """
+        canonical, perm = canonical_hand([c.to_id() for c in input.cards.cards])
+        options = [0, 1, 2, 3, BUTIFARRA] + ([] if input.delegated else [DELEGATE])
+        key = (canonical, input.delegated)
+
+        stats = self._cache.get(key)
+        if stats is not None:
+            self._hits += 1
+            self._cache.move_to_end(key)
+        else:
+            self._misses += 1
+            stats = self._simulate(canonical, options)
+            if self.cache_size > 0:
+                self._cache[key] = stats
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        inverse = invert(perm)
+        estimates = []
+        for option, (n, mean, se) in zip(options, stats):
+            output = _output(inverse[option] if option < 4 else option)
+            estimates.append(CantarEstimate(output, mean, se, n))
+        estimates.sort(key=lambda e: -e.mean)
+        return estimates
+
+    def cantar(self, input: CantarInput) -> CantarOutput:
+        """Return the call with the best estimate, see evaluate.
+
+        Args:
+            input (CantarInput): The input of the cantar function.
+
+        Returns:
+            CantarOutput: The call.
+        """
+        return self.evaluate(input)[0].output
+
+    def cache_info(self) -> Tuple[int, int, int]:
+        """Return the statistics of the cache.
+
+        Returns:
+            Tuple[int, int, int]: The number of hits, misses and hands in the cache.
+        """
+        return self._hits, self._misses, len(self._cache)
+
+    def cache_clear(self) -> None:
+        """Remove all the hands from the cache."""
+        self._cache.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def close(self) -> None:
+        """Stop the worker processes, the next simulation starts them again."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "CantarEvaluator":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _simulate(
+        self, hand: Tuple[int, ...], options: List[int]
+    ) -> List[Tuple[int, float, float]]:
+        sums = {o: [0, 0.0, 0.0] for o in options}
+        if self.processes > 1 and self._executor is None:
+            self._executor = ProcessPoolExecutor(self.processes)
+
+        while True:
+            batches = [
+                (
+                    hand,
+                    o,
+                    self.batch_size,
+                    self._rng.getrandbits(64),
+                    self.game_variant,
+                )
+                for o in options
+            ]
+            if self._executor is None:
+                results = [_rollout_batch(*b) for b in batches]
+            else:
+                results = list(self._executor.map(_rollout_batch, *zip(*batches)))
+            for o, (n, total, total_sq) in zip(options, results):
+                s = sums[o]
+                s[0] += n
+                s[1] += total
+                s[2] += total_sq
+
+            stats = {o: mean_standard_error(*sums[o]) for o in options}
+            n = sums[options[0]][0]
+            if n >= self.max_rollouts:
+                break
+            if n >= self.min_rollouts:
+                best = max(options, key=lambda o: stats[o][0])
+                if all(
+                    stats[best][0] - stats[o][0]
+                    > self.cutoff_z * sqrt(stats[best][1] ** 2 + stats[o][1] ** 2)
+                    for o in options
+                    if o != best
+                ):
+                    break
+
+        return [(sums[o][0],) + mean_standard_error(*sums[o]) for o in options]
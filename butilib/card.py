@@ -1,8 +1,9 @@
 from typing import List, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from .descriptions import CardSetDescription, SuitDescription
+from .rules import SUIT_INDEX, SUITS
 from .suit import BASTOS, COPAS, ESPADAS, OROS, Suit
 
 
@@ -14,6 +15,8 @@ class Card(BaseModel):
         suit (Suit): The suit of the card.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     number: int = Field(ge=1, le=12)
     suit: Suit
 
@@ -64,6 +67,26 @@ class Card(BaseModel):
         """
         return hash(str(self))
 
+    def to_id(self) -> int:
+        """Return the id of the card, its position in a new deck (from 0 to 47): 12 * suit index + number - 1.
+
+        Returns:
+            int: Id of the card.
+        """
+        return SUIT_INDEX[self.suit] * 12 + self.number - 1
+
+    @classmethod
+    def from_id(cls, id: int) -> "Card":
+        """Create the card with the given id, see to_id.
+
+        Args:
+            id (int): Id of the card (from 0 to 47).
+
+        Returns:
+            Card: The card with that id.
+        """
+        return cls(number=id % 12 + 1, suit=SUITS[id // 12])
+
     def compare(self, other: "Card", t1: Suit, t2: Optional[Suit] = None) -> bool:
         """Compare for which of the two cards win. t1 and t2 are the two triumphs, if both are defined, t1 rules over t2.
 
@@ -104,6 +127,8 @@ class CardSet(BaseModel):
         check_that_all_the_cards_in_the_deck_are_different: raise an error if there are repeated cards.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     cards: List[Card]
 
     @field_validator("cards")
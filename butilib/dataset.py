@@ -0,0 +1,140 @@
+import os
+from itertools import islice
+from typing import Iterable, Union
+
+import numpy as np
+
+from .baza import History
+from .contrada import Contrada
+from .record import GameRecord
+from .rules import SUITS, suit_index
+from .variants import LIBRE, OBLIGADA
+
+MAGIC = b"BUTD"
+VERSION = 1
+HEADER_SIZE = 8
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("cards", "u1", (48,)),
+        ("leaders", "u1", (12,)),
+        ("triumph", "u1"),
+        ("butifarra", "u1"),
+        ("game_variant", "u1"),
+        ("player_c", "u1"),
+        ("delegated", "u1"),
+        ("contrada", "u1"),
+    ]
+)
+
+
+def write_dataset(
+    path: str, records: Iterable[GameRecord], chunk_size: int = 65536
+) -> int:
+    """Write recorded hands to a dataset file: a header of 8 bytes followed by a fixed size record per hand
+    (see RECORD_DTYPE), with a byte per card id so they can be viewed without copying.
+
+    Args:
+        path (str): The path of the dataset file.
+        records (Iterable[GameRecord]): The recorded hands, they are consumed in chunks.
+        chunk_size (int, optional): The number of records converted at once. Defaults to 65536.
+
+    Returns:
+        int: The number of records written.
+    """
+    it = iter(records)
+    n = 0
+    with open(path, "wb") as f:
+        f.write(MAGIC + bytes([VERSION, 0, 0, 0]))
+        while chunk := list(islice(it, chunk_size)):
+            array = np.zeros(len(chunk), dtype=RECORD_DTYPE)
+            array["cards"] = [r.cards for r in chunk]
+            array["leaders"] = [r.leaders for r in chunk]
+            array["triumph"] = [suit_index(r.triumph) or 0 for r in chunk]
+            array["butifarra"] = [r.butifarra for r in chunk]
+            array["game_variant"] = [r.game_variant == OBLIGADA for r in chunk]
+            array["player_c"] = [r.player_c for r in chunk]
+            array["delegated"] = [r.delegated for r in chunk]
+            array["contrada"] = [r.contrada.value for r in chunk]
+            array.tofile(f)
+            n += len(chunk)
+    return n
+
+
+class GameDataset:
+    """A memory mapped dataset of recorded hands written with write_dataset. Opening it reads nothing but the
+    header, and indexing returns views on the mapped file, so many processes can share it through the page cache.
+
+        dataset[i]        ->   the record of hand i (a numpy structured scalar, see RECORD_DTYPE)
+        dataset[i:j]      ->   a structured array view of hands i to j
+        dataset.cards     ->   a (len(dataset), 48) view of the card ids in the order they were played
+
+    Args:
+        path (str): The path of the dataset file.
+
+    Raises:
+        ValueError: If the file is not a butilib dataset or it is truncated.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        if header[:4] != MAGIC or header[4] != VERSION:
+            raise ValueError("The file is not a butilib dataset.")
+
+        size = os.path.getsize(path) - HEADER_SIZE
+        if size % RECORD_DTYPE.itemsize != 0:
+            raise ValueError("The dataset is truncated.")
+
+        if size == 0:
+            self._array = np.zeros(0, dtype=RECORD_DTYPE)
+        else:
+            self._array = np.memmap(
+                path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE
+            )
+
+    def __reduce__(self):
+        return (GameDataset, (self.path,))
+
+    def __len__(self) -> int:
+        return len(self._array)
+
+    def __getitem__(self, key: Union[int, slice]):
+        return self._array[key]
+
+    @property
+    def cards(self) -> np.ndarray:
+        """The card ids of every hand, in the order they were played."""
+        return self._array["cards"]
+
+    def record(self, i: int) -> GameRecord:
+        """Materialize the record of a hand.
+
+        Args:
+            i (int): The index of the hand.
+
+        Returns:
+            GameRecord: The recorded hand.
+        """
+        row = self._array[i]
+        return GameRecord(
+            cards=tuple(row["cards"].tolist()),
+            leaders=tuple(row["leaders"].tolist()),
+            triumph=None if row["butifarra"] else SUITS[row["triumph"]],
+            game_variant=OBLIGADA if row["game_variant"] else LIBRE,
+            player_c=int(row["player_c"]),
+            delegated=bool(row["delegated"]),
+            contrada=Contrada(int(row["contrada"])),
+        )
+
+    def history(self, i: int) -> History:
+        """Materialize the history of a hand.
+
+        Args:
+            i (int): The index of the hand.
+
+        Returns:
+            History: The history of the hand.
+        """
+        return self.record(i).history()
@@ -1,7 +1,7 @@
 from random import shuffle
 from typing import List, Tuple
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator
 
 from .card import Card, CardSet
 from .suit import Suit
@@ -17,6 +17,8 @@ class Deck(BaseModel):
         check_that_all_the_cards_in_the_deck_are_different: an error is raised if there are two equal cards in the deck.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     cards: List[Card]
 
     @field_validator("cards")
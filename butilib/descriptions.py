@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from .suit import BASTOS, COPAS, ESPADAS, OROS, Suit
 
@@ -11,6 +11,8 @@ class SuitDescription(BaseModel):
         points (int): number of points of that suit in the card set.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     number: int
     points: int
 
@@ -25,6 +27,8 @@ class CardSetDescription(BaseModel):
         espadas (SuitDescription): Description of the ESPADAS suit.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     oros: SuitDescription
     bastos: SuitDescription
     copas: SuitDescription
@@ -0,0 +1,295 @@
+import random
+import struct
+import sys
+from array import array
+from typing import BinaryIO, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from .models.heuristics import heuristic_call
+from .rollout import playout
+from .schema import ContrarInput, ContrarOutput
+from .variants import LIBRE, OBLIGADA, GameVariant
+
+MAGIC = b"BUTE"
+VERSION = 1
+HEADER = struct.Struct("<4sBH")
+
+# The score a team must reach to win the match.
+TARGET = 101
+
+
+class SwingDistribution(NamedTuple):
+    """The distribution of the result of a hand for the team that calls triumph: the probability of calling
+    butifarra and, for a triumph suit and for butifarra, the probability of every difference d (from -36 to 36)
+    such that the calling team scores d times the multiplier of the hand if d is positive and the other team -d
+    times it if negative (see hand_score).
+
+    Attributes:
+        butifarra (float): The probability of calling butifarra.
+        suit_diffs (Tuple[float, ...]): The probabilities of the differences -36 to 36 when a suit is called.
+        butifarra_diffs (Tuple[float, ...]): The probabilities of the differences -36 to 36 when butifarra is called.
+    """
+
+    butifarra: float
+    suit_diffs: Tuple[float, ...]
+    butifarra_diffs: Tuple[float, ...]
+
+    @classmethod
+    def simulate(
+        cls,
+        hands: int = 10000,
+        seed: Optional[int] = None,
+        game_variant: GameVariant = LIBRE,
+    ) -> "SwingDistribution":
+        """Estimate the distribution by simulating hands: random deals, the caller calling with heuristic_call (or
+        butifarra if it finds no suit) and every player following butilib.models.greedy_card.
+
+        Args:
+            hands (int, optional): The number of simulated hands. Defaults to 10000.
+            seed (Optional[int], optional): The seed of the simulations. Defaults to None.
+            game_variant (GameVariant, optional): The game variant. Defaults to LIBRE.
+
+        Returns:
+            SwingDistribution: The estimated distribution.
+        """
+        rng = random.Random(seed)
+        obligada = game_variant == OBLIGADA
+        counts = [[0] * 73, [0] * 73]
+        ids = list(range(48))
+        for _ in range(hands):
+            rng.shuffle(ids)
+            deal = [ids[i * 12 : (i + 1) * 12] for i in range(4)]
+            triumph = heuristic_call(deal[0])
+            points = playout(deal, 1, [], triumph, obligada, rng)
+            counts[triumph is None][(points[0] - points[1]) // 2 + 36] += 1
+
+        butifarra = sum(counts[1])
+        return cls(
+            butifarra / hands,
+            _normalize(counts[0]),
+            _normalize(counts[1]),
+        )
+
+
+def _normalize(counts: List[int]) -> Tuple[float, ...]:
+    total = sum(counts)
+    if total == 0:
+        return tuple(1.0 if i == 36 else 0.0 for i in range(73))
+    return tuple(c / total for c in counts)
+
+
+def _swings(
+    distribution: SwingDistribution, butifarra: bool, contrada: int
+) -> List[Tuple[int, float]]:
+    # The score swings of the calling team (positive if they score) and their probabilities for a hand.
+    diffs = distribution.butifarra_diffs if butifarra else distribution.suit_diffs
+    multiplier = 2**contrada * (2 if butifarra else 1)
+    return [((i - 36) * multiplier, p) for i, p in enumerate(diffs) if p > 0]
+
+
+class MatchEquity:
+    """A match equity table: the probability that a team wins the match (the first to reach the target score) from
+    every score, assuming the calling team alternates between hands and every hand follows a SwingDistribution.
+    Besides the equity before a hand, it keeps the equity of the calling team once the hand is set for every call
+    (suit or butifarra) and contrada level, so a contrar decision is a lookup of the equities with and without the
+    next contrada level. Later hands are assumed to be played at normal contrada.
+
+    Tables are computed by dynamic programming from the highest scores down, the hands that score nothing (which
+    leave the scores as they are and pass the call to the other team) being solved in closed form. Build them once
+    with build, write them with save and read them back with load.
+
+    Args:
+        target (int): The score that wins the match.
+        tables (Dict[Tuple[Optional[bool], int], array]): The tables by (butifarra, contrada level), (None, 0) being
+            the equity before the hand. Entry a * target + b is the equity of the calling team with a points when
+            the other team has b.
+    """
+
+    def __init__(self, target: int, tables: Dict[Tuple[Optional[bool], int], array]):
+        self.target = target
+        self._tables = tables
+
+    @classmethod
+    def build(
+        cls, distribution: SwingDistribution, target: int = TARGET
+    ) -> "MatchEquity":
+        """Compute the tables for a distribution of the hands.
+
+        Args:
+            distribution (SwingDistribution): The distribution of the hands.
+            target (int, optional): The score that wins the match. Defaults to 101.
+
+        Returns:
+            MatchEquity: The tables.
+        """
+        t = target
+        base = array("d", bytes(8 * t * t))
+
+        def after(a: int, b: int, swing: int) -> float:
+            # The equity of the calling team after a hand, the other team calling next.
+            if swing > 0:
+                return 1.0 if a + swing >= t else 1.0 - base[b * t + a + swing]
+            return 0.0 if b - swing >= t else 1.0 - base[(b - swing) * t + a]
+
+        swings: Dict[int, float] = {}
+        for butifarra, weight in (
+            (False, 1 - distribution.butifarra),
+            (True, distribution.butifarra),
+        ):
+            for swing, p in _swings(distribution, butifarra, 0):
+                swings[swing] = swings.get(swing, 0.0) + weight * p
+        p0 = swings.pop(0, 0.0)
+        moves = list(swings.items())
+
+        # Every hand that scores raises a + b, so equities are computed by decreasing sum of scores. A hand that
+        # scores nothing leads from (a, b) to (b, a) with the other team calling:
+        #   E(a, b) = X(a, b) + p0 * (1 - E(b, a))
+        for s in range(2 * t - 2, -1, -1):
+            for a in range(max(0, s - t + 1), min(s, t - 1) + 1):
+                b = s - a
+                if a > b:
+                    continue
+                x_ab = sum(p * after(a, b, swing) for swing, p in moves)
+                x_ba = sum(p * after(b, a, swing) for swing, p in moves)
+                d = 1 - p0 * p0
+                base[a * t + b] = (x_ab + p0 * (1 - x_ba) - p0 * p0) / d
+                base[b * t + a] = (x_ba + p0 * (1 - x_ab) - p0 * p0) / d
+
+        tables = {(None, 0): base}
+        for butifarra in (False, True):
+            for contrada in range(4):
+                moves = _swings(distribution, butifarra, contrada)
+                table = array("d", bytes(8 * t * t))
+                for a in range(t):
+                    for b in range(t):
+                        table[a * t + b] = sum(
+                            p * after(a, b, swing) for swing, p in moves
+                        )
+                tables[(butifarra, contrada)] = table
+        return cls(target, tables)
+
+    def equity(self, score: Tuple[int, int]) -> float:
+        """Return the probability that the team calling the next hand wins the match.
+
+        Args:
+            score (Tuple[int, int]): The score of the calling team and of the other team.
+
+        Returns:
+            float: The probability.
+        """
+        return self._lookup((None, 0), score)
+
+    def hand_equity(
+        self, score: Tuple[int, int], butifarra: bool, contrada: int
+    ) -> float:
+        """Return the probability that the calling team wins the match once the call and contrada of the hand are
+        set.
+
+        Args:
+            score (Tuple[int, int]): The score of the calling team and of the other team.
+            butifarra (bool): Wether butifarra was called.
+            contrada (int): The contrada level of the hand (see Contrada.value).
+
+        Returns:
+            float: The probability.
+        """
+        return self._lookup((butifarra, contrada), score)
+
+    def _lookup(self, key: Tuple[Optional[bool], int], score: Tuple[int, int]) -> float:
+        a, b = score
+        if a >= self.target:
+            return 1.0
+        if b >= self.target:
+            return 0.0
+        return self._tables[key][a * self.target + b]
+
+    def lookup(self, input: ContrarInput) -> Tuple[float, float]:
+        """Return the probability that the team of the player of a ContrarInput wins the match if the hand is
+        played at the current contrada level and at the next one.
+
+        Args:
+            input (ContrarInput): The input of the contrar function.
+
+        Returns:
+            Tuple[float, float]: The probabilities without and with contrar.
+        """
+        level = input.contrada.value
+        if input.player % 2 == 0:
+            return (
+                self.hand_equity(input.score, input.butifarra, level),
+                self.hand_equity(input.score, input.butifarra, level + 1),
+            )
+        theirs = (input.score[1], input.score[0])
+        return (
+            1.0 - self.hand_equity(theirs, input.butifarra, level),
+            1.0 - self.hand_equity(theirs, input.butifarra, level + 1),
+        )
+
+    def contrar(self, input: ContrarInput) -> ContrarOutput:
+        """Contrar if it raises the probability of winning the match, see lookup.
+
+        Args:
+            input (ContrarInput): The input of the contrar function.
+
+        Returns:
+            ContrarOutput: The decision.
+        """
+        current, raised = self.lookup(input)
+        return ContrarOutput(contrar=raised > current)
+
+    def save(self, file: Union[str, BinaryIO]) -> None:
+        """Write the tables to a file.
+
+        Args:
+            file (Union[str, BinaryIO]): The path or binary file to write to.
+        """
+        if isinstance(file, str):
+            with open(file, "wb") as f:
+                self.save(f)
+            return
+        file.write(HEADER.pack(MAGIC, VERSION, self.target))
+        for key in _KEYS:
+            table = self._tables[key]
+            if sys.byteorder != "little":
+                table = array("d", table)
+                table.byteswap()
+            table.tofile(file)
+
+    @classmethod
+    def load(cls, file: Union[str, BinaryIO]) -> "MatchEquity":
+        """Read the tables written by save.
+
+        Args:
+            file (Union[str, BinaryIO]): The path or binary file to read from.
+
+        Raises:
+            ValueError: If the file is not a butilib match equity table or it is truncated.
+
+        Returns:
+            MatchEquity: The tables.
+        """
+        if isinstance(file, str):
+            with open(file, "rb") as f:
+                return cls.load(f)
+        header = file.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise ValueError("The file is not a butilib match equity table.")
+        magic, version, target = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("The file is not a butilib match equity table.")
+
+        tables = {}
+        for key in _KEYS:
+            table = array("d")
+            try:
+                table.fromfile(file, target * target)
+            except EOFError:
+                raise ValueError("The match equity table is truncated.")
+            if sys.byteorder != "little":
+                table.byteswap()
+            tables[key] = table
+        return cls(target, tables)
+
+
+_KEYS: List[Tuple[Optional[bool], int]] = [(None, 0)] + [
+    (butifarra, contrada) for butifarra in (False, True) for contrada in range(4)
+]
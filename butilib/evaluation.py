@@ -0,0 +1,347 @@
+from enum import Enum
+from math import log, sqrt
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from .deck import Deck
+from .model import Model
+from .observer import GameObserver
+from .play_hand import PlayHandInput, play_hand
+from .variants import LIBRE, GameVariant
+
+
+class DuplicateDealResult(BaseModel):
+    """The paired results of a deal replayed with the teams swapped across seats.
+
+    Attributes:
+        deal (int): The index of the deal.
+        scores (List[int]): The net score of model A (its score minus model B score) in every replay of the deal.
+            Replays come in pairs: A sitting on players 0 and 2, then A sitting on players 1 and 3.
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+    deal: int = Field(ge=0)
+    scores: List[int]
+
+    def net(self) -> int:
+        """Return the net score of model A over all the replays of the deal, where the luck of the cards cancels out.
+
+        Returns:
+            int: Net score of model A.
+        """
+        return sum(self.scores)
+
+
+class DuplicateResult(BaseModel):
+    """The results of a duplicate match between two models.
+
+    Attributes:
+        deals (List[DuplicateDealResult]): The paired results of every deal.
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+    deals: List[DuplicateDealResult]
+
+    def mean(self) -> float:
+        """Return the mean net score of model A per deal.
+
+        Returns:
+            float: Mean net score per deal.
+        """
+        return sum(d.net() for d in self.deals) / len(self.deals)
+
+    def standard_error(self) -> float:
+        """Return the standard error of the mean net score of model A per deal.
+
+        Returns:
+            float: Standard error of the mean.
+        """
+        n = len(self.deals)
+        if n < 2:
+            return float("inf")
+        mean = self.mean()
+        var = sum((d.net() - mean) ** 2 for d in self.deals) / (n - 1)
+        return sqrt(var / n)
+
+
+def iter_duplicate_deals(
+    model_a: Model,
+    model_b: Model,
+    n_deals: int,
+    rotate: bool = False,
+    game_variant: GameVariant = LIBRE,
+    observers: Sequence[GameObserver] = (),
+) -> Iterator[DuplicateDealResult]:
+    """Play random deals in duplicate mode and yield the paired result of each deal as soon as it is played.
+    Every deal is played twice with the teams swapped across seats, and if rotate is set, each of these is
+    played with the card sets rotated to the four seats. The player that calls triumph rotates between deals.
+
+    Args:
+        model_a (Model): The model under evaluation, plays as a team with itself.
+        model_b (Model): The model to compare against, plays as a team with itself.
+        n_deals (int): The number of deals to play.
+        rotate (bool, optional): Wether to also rotate the card sets around the table. Defaults to False.
+        game_variant (GameVariant, optional): The game variant to play. Defaults to LIBRE.
+        observers (Sequence[GameObserver], optional): Notified of the start of every hand, with the deal, the replay
+            and the team of model_a, and of every hand played, see play_hand. Defaults to none.
+
+    Yields:
+        DuplicateDealResult: The paired results of every deal.
+    """
+    rotations = range(4) if rotate else range(1)
+    for d in range(n_deals):
+        deck = Deck.new()
+        deck.shuffle()
+        card_sets = deck.deal()
+
+        scores = []
+        for r in rotations:
+            rotated = [card_sets[(i + r) % 4] for i in range(4)]
+            for a_seat in range(2):
+                players = [model_a if i % 2 == a_seat else model_b for i in range(4)]
+                for observer in observers:
+                    observer.on_hand_start(d, len(scores), a_seat)
+                output = play_hand(
+                    PlayHandInput(
+                        players=players,
+                        card_sets=rotated,
+                        score=(0, 0),
+                        player_c=d % 4,
+                        game_variant=game_variant,
+                    ),
+                    observers=observers,
+                )
+                scores.append(output.score[a_seat] - output.score[1 - a_seat])
+
+        yield DuplicateDealResult(deal=d, scores=scores)
+
+
+def duplicate_match(
+    model_a: Model,
+    model_b: Model,
+    n_deals: int,
+    rotate: bool = False,
+    game_variant: GameVariant = LIBRE,
+    observers: Sequence[GameObserver] = (),
+) -> DuplicateResult:
+    """Compare two models on random deals in duplicate mode, see iter_duplicate_deals.
+
+    Args:
+        model_a (Model): The model under evaluation, plays as a team with itself.
+        model_b (Model): The model to compare against, plays as a team with itself.
+        n_deals (int): The number of deals to play.
+        rotate (bool, optional): Wether to also rotate the card sets around the table. Defaults to False.
+        game_variant (GameVariant, optional): The game variant to play. Defaults to LIBRE.
+        observers (Sequence[GameObserver], optional): Notified of every hand played, see iter_duplicate_deals.
+            Defaults to none.
+
+    Returns:
+        DuplicateResult: The paired results of all the deals.
+    """
+    return DuplicateResult(
+        deals=list(
+            iter_duplicate_deals(
+                model_a, model_b, n_deals, rotate, game_variant, observers
+            )
+        )
+    )
+
+
+class SequentialDecision(str, Enum):
+    """The decisions a sequential test can reach."""
+
+    A_BETTER = "A_BETTER"
+    B_BETTER = "B_BETTER"
+    NEGLIGIBLE = "NEGLIGIBLE"
+    UNDECIDED = "UNDECIDED"
+
+
+class SequentialTest(BaseModel):
+    """A sequential probability ratio test (SPRT) over a stream of net scores of model A, with the variance estimated
+    from the samples. Two one sided tests are run at the same time: mean 0 against mean delta (A is better) and mean 0
+    against mean -delta (B is better). If both accept mean 0 the difference is negligible.
+
+    Attributes:
+        delta (float): The smallest difference in mean net score per deal that is worth detecting.
+        alpha (float): The probability of declaring a difference when there is none. Defaults to 0.05.
+        beta (float): The probability of missing a difference of delta. Defaults to 0.05.
+        min_samples (int): The number of samples before any decision is taken. Defaults to 10.
+        max_samples (int): The maximum number of samples to consume. Defaults to 10000.
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+    delta: float = Field(gt=0)
+    alpha: float = Field(default=0.05, gt=0, lt=1)
+    beta: float = Field(default=0.05, gt=0, lt=1)
+    min_samples: int = Field(default=10, ge=2)
+    max_samples: int = Field(default=10000, ge=2)
+
+    _n: int = PrivateAttr(default=0)
+    _sum: float = PrivateAttr(default=0.0)
+    _sum_sq: float = PrivateAttr(default=0.0)
+    _upper: Optional[bool] = PrivateAttr(default=None)
+    _lower: Optional[bool] = PrivateAttr(default=None)
+
+    @property
+    def n(self) -> int:
+        """The number of samples consumed."""
+        return self._n
+
+    def mean(self) -> float:
+        """Return the mean of the samples consumed.
+
+        Returns:
+            float: The sample mean.
+        """
+        return self._sum / self._n if self._n > 0 else 0.0
+
+    def variance(self) -> float:
+        """Return the unbiased variance of the samples consumed.
+
+        Returns:
+            float: The sample variance.
+        """
+        if self._n < 2:
+            return float("inf")
+        return max(self._sum_sq - self._sum**2 / self._n, 0.0) / (self._n - 1)
+
+    def llr(self, mu0: float, mu1: float) -> float:
+        """Return the log-likelihood ratio of mean mu1 against mean mu0 for the samples consumed.
+
+        Args:
+            mu0 (float): The mean under the null hypothesis.
+            mu1 (float): The mean under the alternative hypothesis.
+
+        Returns:
+            float: The log-likelihood ratio.
+        """
+        var = self.variance()
+        if var == float("inf"):
+            return 0.0
+        var = max(var, 1e-9)
+        return ((mu1 - mu0) * self._sum - self._n * (mu1**2 - mu0**2) / 2) / var
+
+    def decision(self) -> SequentialDecision:
+        """Return the decision reached with the samples consumed so far.
+
+        Returns:
+            SequentialDecision: The decision, UNDECIDED if the test has to go on.
+        """
+        if self._upper is True:
+            return SequentialDecision.A_BETTER
+        if self._lower is True:
+            return SequentialDecision.B_BETTER
+        if self._upper is False and self._lower is False:
+            return SequentialDecision.NEGLIGIBLE
+        return SequentialDecision.UNDECIDED
+
+    def done(self) -> bool:
+        """Return wether the test has reached a decision or consumed max_samples samples.
+
+        Returns:
+            bool: Wether to stop consuming samples.
+        """
+        return (
+            self.decision() != SequentialDecision.UNDECIDED
+            or self._n >= self.max_samples
+        )
+
+    def update(self, x: float) -> SequentialDecision:
+        """Consume a new sample and return the decision reached.
+
+        Args:
+            x (float): The net score of model A in a new deal.
+
+        Returns:
+            SequentialDecision: The decision, UNDECIDED if the test has to go on.
+        """
+        self._n += 1
+        self._sum += x
+        self._sum_sq += x * x
+
+        if self._n < self.min_samples:
+            return SequentialDecision.UNDECIDED
+
+        upper_bound = log((1 - self.beta) / self.alpha)
+        lower_bound = log(self.beta / (1 - self.alpha))
+
+        if self._upper is None:
+            llr = self.llr(0.0, self.delta)
+            if llr >= upper_bound:
+                self._upper = True
+            elif llr <= lower_bound:
+                self._upper = False
+
+        if self._lower is None:
+            llr = self.llr(0.0, -self.delta)
+            if llr >= upper_bound:
+                self._lower = True
+            elif llr <= lower_bound:
+                self._lower = False
+
+        return self.decision()
+
+    def run(self, samples: Iterable[float]) -> SequentialDecision:
+        """Consume samples until the test is done or the samples run out.
+
+        Args:
+            samples (Iterable[float]): The stream of net scores of model A.
+
+        Returns:
+            SequentialDecision: The decision reached.
+        """
+        for x in samples:
+            self.update(x)
+            if self.done():
+                break
+        return self.decision()
+
+
+class SequentialResult(BaseModel):
+    """The result of a sequential match between two models.
+
+    Attributes:
+        decision (SequentialDecision): The decision reached.
+        n_deals (int): The number of deals played before stopping.
+        mean (float): The mean net score of model A per deal.
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+    decision: SequentialDecision
+    n_deals: int
+    mean: float
+
+
+def sequential_match(
+    model_a: Model,
+    model_b: Model,
+    test: SequentialTest,
+    rotate: bool = False,
+    game_variant: GameVariant = LIBRE,
+    observers: Sequence[GameObserver] = (),
+) -> SequentialResult:
+    """Compare two models on duplicate deals, stopping as soon as the sequential test reaches a decision.
+
+    Args:
+        model_a (Model): The model under evaluation, plays as a team with itself.
+        model_b (Model): The model to compare against, plays as a team with itself.
+        test (SequentialTest): The sequential test to run, it must not have consumed samples yet.
+        rotate (bool, optional): Wether to also rotate the card sets around the table. Defaults to False.
+        game_variant (GameVariant, optional): The game variant to play. Defaults to LIBRE.
+        observers (Sequence[GameObserver], optional): Notified of every hand played, see iter_duplicate_deals.
+            Defaults to none.
+
+    Returns:
+        SequentialResult: The decision and the number of deals played.
+    """
+    deals = iter_duplicate_deals(
+        model_a, model_b, test.max_samples, rotate, game_variant, observers
+    )
+    decision = test.run(d.net() for d in deals)
+
+    return SequentialResult(decision=decision, n_deals=test.n, mean=test.mean())
@@ -0,0 +1,211 @@
+import os
+import struct
+import threading
+import time
+import zlib
+from queue import Empty, Queue
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+from .archive import decode_record, encode_record
+from .play_hand import PlayHandOutput
+from .record import GameRecord
+
+MAGIC = b"BUTL"
+VERSION = 1
+HEADER_SIZE = 8
+HEADER = MAGIC + bytes([VERSION, 0, 0, 0])
+
+_FRAME = struct.Struct("<HI")
+_CLOSE = object()
+
+
+def encode_frame(record: GameRecord) -> bytes:
+    """Encode a record in a log frame: a little endian 2 bytes length and 4 bytes CRC32 of the payload, followed by
+    the payload (the record encoded with butilib.archive.encode_record).
+
+    Args:
+        record (GameRecord): The recorded hand.
+
+    Returns:
+        bytes: The frame.
+    """
+    payload = encode_record(record)
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+class GameLogWriter:
+    """An append-only log of played hands. Writes only put the hand in a bounded queue, a background thread encodes
+    the queued hands and appends them to the file in batches. When the queue is full writes block until the
+    background thread catches up. Every hand is framed with its length and checksum, so a crash can only lose the
+    hands of the last unflushed batch, see read_game_log.
+
+    Args:
+        path (str): The path of the log, it is created if it does not exist and appended to otherwise. A torn or
+            corrupted frame left at the end of the log by a crash is truncated before appending, so that the hands
+            appended after it can be read.
+        batch_size (int, optional): The maximum number of hands appended at once. Defaults to 256.
+        queue_size (int, optional): The maximum number of hands waiting to be written. Defaults to 4096.
+        flush_interval (float, optional): The maximum number of seconds a hand waits in the batch. Defaults to 1.0.
+        fsync (bool, optional): Wether to fsync the file after every batch. Defaults to False.
+
+    Raises:
+        ValueError: If the file is not empty and is not a butilib game log.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 256,
+        queue_size: int = 4096,
+        flush_interval: float = 1.0,
+        fsync: bool = False,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+
+        self._file = open(path, "a+b")
+        try:
+            self._truncate_torn_tail()
+        except BaseException:
+            self._file.close()
+            raise
+
+        self._queue = Queue(maxsize=queue_size)
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _truncate_torn_tail(self) -> None:
+        self._file.seek(0)
+        header = self._file.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            # New, or the header itself was torn.
+            if not HEADER.startswith(header):
+                raise ValueError("The file is not a butilib game log.")
+            self._file.truncate(0)
+            self._file.write(HEADER)
+        else:
+            end = HEADER_SIZE
+            for _, end in _frames(self._file):
+                pass
+            self._file.truncate(end)
+        self._file.flush()
+
+    def write(self, record: Union[GameRecord, PlayHandOutput]) -> None:
+        """Queue a hand to be appended to the log, blocking if the queue is full.
+
+        Args:
+            record (Union[GameRecord, PlayHandOutput]): The played hand.
+
+        Raises:
+            ValueError: If the log is closed.
+            RuntimeError: If the background thread failed to write.
+        """
+        if self._closed:
+            raise ValueError("The game log is closed.")
+        if self._error is not None:
+            raise RuntimeError("The game log failed to write.") from self._error
+        self._queue.put(record)
+
+    def close(self) -> None:
+        """Write all the queued hands and close the log.
+
+        Raises:
+            RuntimeError: If the background thread failed to write.
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_CLOSE)
+            self._thread.join()
+            self._file.close()
+        if self._error is not None:
+            raise RuntimeError("The game log failed to write.") from self._error
+
+    def __enter__(self) -> "GameLogWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        batch: List[bytes] = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except Empty:
+                item = None
+
+            if item is not None and item is not _CLOSE and self._error is None:
+                try:
+                    if isinstance(item, PlayHandOutput):
+                        item = GameRecord.from_hand(item)
+                    batch.append(encode_frame(item))
+                except Exception as e:
+                    self._error = e
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            full = len(batch) >= self.batch_size
+            expired = deadline is not None and time.monotonic() >= deadline
+            if batch and (full or expired or item is _CLOSE):
+                self._flush(batch)
+                batch = []
+                deadline = None
+            elif not batch:
+                deadline = None
+
+            if item is _CLOSE:
+                return
+
+    def _flush(self, batch: List[bytes]) -> None:
+        if self._error is not None:
+            return
+        try:
+            self._file.write(b"".join(batch))
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+        except Exception as e:
+            self._error = e
+
+
+def _frames(f: BinaryIO) -> Iterator[Tuple[bytes, int]]:
+    # The payloads of the valid frames of a log, with the offset of their end, from the header to the first
+    # truncated or corrupted frame.
+    f.seek(0)
+    header = f.read(HEADER_SIZE)
+    if header[:4] != MAGIC or header[4] != VERSION:
+        raise ValueError("The file is not a butilib game log.")
+
+    end = HEADER_SIZE
+    while len(frame := f.read(_FRAME.size)) == _FRAME.size:
+        length, crc = _FRAME.unpack(frame)
+        payload = f.read(length)
+        if len(payload) != length or zlib.crc32(payload) != crc:
+            return
+        end += _FRAME.size + length
+        yield payload, end
+
+
+def read_game_log(path: str) -> Iterator[GameRecord]:
+    """Iterate over the hands of a game log written with GameLogWriter. Reading stops at the first truncated or
+    corrupted frame, which can only be found at the end of the log after a crash: GameLogWriter truncates it when
+    the log is opened again.
+
+    Args:
+        path (str): The path of the log.
+
+    Raises:
+        ValueError: If the file is not a butilib game log.
+
+    Yields:
+        GameRecord: The logged hands, in order.
+    """
+    with open(path, "rb") as f:
+        for payload, _ in _frames(f):
+            yield decode_record(payload)
@@ -0,0 +1,247 @@
+from time import perf_counter_ns, process_time_ns
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# The phases recorded by the engine.
+CANTAR = "cantar"  # a cantar call of a model
+CONTRAR = "contrar"  # a contrar call of a model
+BAZA_INPUT = "baza_input"  # building (and validating) the PlayBazaInput of a baza, by the hand engine
+INPUT = "input"  # building (and validating) the PlayInput of a player
+PLAY = "play"  # the whole Model.play call
+LEGALITY = "legality"  # the playable cards filtering of Model.play
+MODEL = "model"  # the inner _play, _play_libre or _play_obligada call of Model.play
+
+Clock = Tuple[int, int]
+
+
+class LatencyHistogram:
+    """A histogram of durations in nanoseconds with a bounded relative error, like an HDR histogram: values are
+    counted in buckets of width 2^k for values in [2^(k + significant_bits - 1), 2^(k + significant_bits)), so the
+    percentiles are within 2^-(significant_bits - 1) of the recorded values while the histogram keeps a few hundred
+    buckets at most. The count, total, minimum and maximum are exact.
+
+    Args:
+        significant_bits (int, optional): The bits of precision of the buckets. Defaults to 7 (under 1.6% error).
+    """
+
+    def __init__(self, significant_bits: int = 7):
+        self.significant_bits = significant_bits
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        """Record a duration.
+
+        Args:
+            value (int): The duration in nanoseconds.
+        """
+        shift = value.bit_length() - self.significant_bits
+        key = value >> shift << shift if shift > 0 else value
+        self.counts[key] = self.counts.get(key, 0) + 1
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add the durations recorded by another histogram with the same precision.
+
+        Args:
+            other (LatencyHistogram): The other histogram.
+
+        Raises:
+            ValueError: If the histograms do not have the same precision.
+        """
+        if other.significant_bits != self.significant_bits:
+            raise ValueError("Only histograms with the same precision can be merged.")
+        if other.count == 0:
+            return
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.min = other.min if self.count == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    @property
+    def mean(self) -> float:
+        """float: The mean duration in nanoseconds, 0 if empty."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> int:
+        """Return the duration under which a percentage of the recorded durations are: the highest value of the
+        bucket of the percentile, bounded by the maximum.
+
+        Args:
+            p (float): The percentage, between 0 and 100.
+
+        Returns:
+            int: The duration in nanoseconds, 0 if empty.
+        """
+        if self.count == 0:
+            return 0
+        rank = max(1, -(-self.count * p // 100))
+        seen = 0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if seen >= rank:
+                shift = key.bit_length() - self.significant_bits
+                top = key + (1 << shift) - 1 if shift > 0 else key
+                return min(top, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Return the count, mean, p50, p90, p99 and maximum of the durations, in nanoseconds.
+
+        Returns:
+            Dict[str, float]: The summary.
+        """
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class LatencyRecorder:
+    """Record the wall and CPU (process) time of the phases of the engine per seat, handed to play_hand or
+    play_baza. The engine only reads the clocks when a recorder is given, so leaving it out costs nothing but a check
+    per phase. The durations are kept in LatencyHistograms per phase and seat, and the class name of the model of
+    every seat is kept to aggregate them per model.
+
+    Phases (see the constants of this module): CANTAR and CONTRAR model calls, BAZA_INPUT (the PlayBazaInput of
+    every baza), INPUT (the PlayInput of every card, pydantic validates it while building it), PLAY (the whole
+    Model.play call) and, inside it, LEGALITY (the playable cards) and MODEL (the inner _play call).
+
+    Args:
+        significant_bits (int, optional): The precision of the histograms, see LatencyHistogram. Defaults to 7.
+    """
+
+    def __init__(self, significant_bits: int = 7):
+        self.significant_bits = significant_bits
+        self.models: Dict[int, str] = {}
+        self._wall: Dict[Tuple[str, Optional[int]], LatencyHistogram] = {}
+        self._cpu: Dict[Tuple[str, Optional[int]], LatencyHistogram] = {}
+
+    @staticmethod
+    def clock() -> Clock:
+        """Read the clocks, to pass to record_since.
+
+        Returns:
+            Clock: The wall and CPU clocks in nanoseconds.
+        """
+        return perf_counter_ns(), process_time_ns()
+
+    def record_since(self, phase: str, seat: Optional[int], start: Clock) -> Clock:
+        """Record the duration of a phase started at a clock reading.
+
+        Args:
+            phase (str): The phase.
+            seat (Optional[int]): The seat of the player, None for phases of the engine.
+            start (Clock): The clock reading at the start of the phase.
+
+        Returns:
+            Clock: The clock reading at the end of the phase, to start the next one.
+        """
+        now = perf_counter_ns(), process_time_ns()
+        self.record(phase, seat, now[0] - start[0], now[1] - start[1])
+        return now
+
+    def record(self, phase: str, seat: Optional[int], wall: int, cpu: int) -> None:
+        """Record the duration of a phase.
+
+        Args:
+            phase (str): The phase.
+            seat (Optional[int]): The seat of the player, None for phases of the engine.
+            wall (int): The wall time in nanoseconds.
+            cpu (int): The CPU time in nanoseconds.
+        """
+        key = (phase, seat)
+        histogram = self._wall.get(key)
+        if histogram is None:
+            histogram = self._wall[key] = LatencyHistogram(self.significant_bits)
+            self._cpu[key] = LatencyHistogram(self.significant_bits)
+        histogram.record(wall)
+        self._cpu[key].record(cpu)
+
+    def phases(self) -> List[str]:
+        """Return the phases recorded.
+
+        Returns:
+            List[str]: The phases, in the order they were first recorded.
+        """
+        return list(dict.fromkeys(phase for phase, _ in self._wall))
+
+    def histogram(
+        self,
+        phase: str,
+        seat: Optional[int] = None,
+        model: Optional[str] = None,
+        cpu: bool = False,
+    ) -> LatencyHistogram:
+        """Return the durations of a phase, of a seat, of the seats of a model or of every seat.
+
+        Args:
+            phase (str): The phase.
+            seat (Optional[int], optional): The seat. Defaults to every seat.
+            model (Optional[str], optional): The class name of the model of the seats. Defaults to every model.
+            cpu (bool, optional): Wether to return the CPU time instead of the wall time. Defaults to False.
+
+        Returns:
+            LatencyHistogram: The merged histogram.
+        """
+        histograms = self._cpu if cpu else self._wall
+        merged = LatencyHistogram(self.significant_bits)
+        for s, histogram in self._select(histograms, phase):
+            if seat is not None and s != seat:
+                continue
+            if model is not None and self.models.get(s) != model:
+                continue
+            merged.merge(histogram)
+        return merged
+
+    def _select(
+        self,
+        histograms: Dict[Tuple[str, Optional[int]], LatencyHistogram],
+        phase: str,
+    ) -> Iterator[Tuple[Optional[int], LatencyHistogram]]:
+        for (p, seat), histogram in histograms.items():
+            if p == phase:
+                yield seat, histogram
+
+    def summary(self, cpu: bool = False) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Return the summary (see LatencyHistogram.summary) of every phase, for every seat ("0" to "3", or
+        "engine") and for all of them together ("all").
+
+        Args:
+            cpu (bool, optional): Wether to summarize the CPU time instead of the wall time. Defaults to False.
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, float]]]: The summaries by phase and seat.
+        """
+        histograms = self._cpu if cpu else self._wall
+        summary = {}
+        for phase in self.phases():
+            by_seat = {
+                "engine" if seat is None else str(seat): h.summary()
+                for seat, h in sorted(
+                    self._select(histograms, phase),
+                    key=lambda x: -1 if x[0] is None else x[0],
+                )
+            }
+            by_seat["all"] = self.histogram(phase, cpu=cpu).summary()
+            summary[phase] = by_seat
+        return summary
+
+    def clear(self) -> None:
+        """Forget all the durations recorded."""
+        self.models.clear()
+        self._wall.clear()
+        self._cpu.clear()
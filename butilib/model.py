@@ -1,7 +1,8 @@
 from typing import List
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
+from .latency import LEGALITY, MODEL
 from .schema import (
     CantarInput,
     CantarOutput,
@@ -21,6 +22,8 @@ class Model(BaseModel):
         game_types (List[GameType]): The supported game types for this model. Defaults to [ butilib.LIBRE, butilib.OBLIGADA ]
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     game_variants: List[GameVariant] = [LIBRE, OBLIGADA]
 
     def cantar(self, input: CantarInput) -> CantarOutput:
@@ -103,72 +106,17 @@ class Model(BaseModel):
         if input.game_variant not in self.game_variants:
             raise ValueError(f"This model does not support {input.game_variant}.")
 
-        if len(input.card_set) == 1:
-            return PlayOutput(card=input.card_set.cards[0], forced=True)
-
-        if len(input.cards) > 0:
-            f_suit = input.cards[0].suit
-            desc = input.card_set.describe()
-
-            if desc[f_suit].number == 1:
-                card = input.card_set.get(suit=f_suit)[0]
-                return PlayOutput(card=card, forced=True)
-
-            initial_player = input.initial_player()
-            win_i = 0
-            win_card = input.cards[0]
-
-            if input.butifarra is True:
-                t1 = f_suit
-                t2 = None
-            else:
-                t1 = input.triumph
-                t2 = f_suit
-
-            for i in range(1, len(input.cards)):
-                if input.cards[i].compare(win_card, t1, t2):
-                    win_i = i
-                    win_card = input.cards[i]
-
-            if desc[f_suit].number > 1:
-                p_cards = input.card_set.get(suit=f_suit)
-                if (initial_player + win_i - input.player_number) % 2 != 0:
-                    w_cards = [c for c in p_cards if c.compare(win_card, t1, t2)]
-
-                    if len(w_cards) == 1:
-                        return PlayOutput(card=w_cards[0], forced=True)
-                    elif len(w_cards) == 0:
-                        if input.game_variant is OBLIGADA:
-                            lower = None
-                            for c in p_cards:
-                                if lower is None:
-                                    lower = c
-                                elif lower.compare(c, t1, t2):
-                                    lower = c
-
-                            return PlayOutput(card=lower, forced=True)
-                    elif len(w_cards) > 1:
-                        p_cards = w_cards
-
-            elif (initial_player + win_i - input.player_number) % 2 != 0:
-                if input.butifarra is False:
-                    if desc[input.triumph].number == 1:
-                        card = input.card_set.get(suit=input.triumph)[0]
-                        return PlayOutput(card=card, forced=True)
-                    elif desc[input.triumph].number > 1:
-                        p_cards = input.card_set.get(suit=input.triumph)
-                        w_cards = [c for c in p_cards if c.compare(win_card, t1, t2)]
-
-                        if len(w_cards) == 1:
-                            return PlayOutput(card=w_cards[0], forced=True)
-                        elif len(w_cards) > 1:
-                            p_cards = w_cards
-                else:
-                    p_cards = input.card_set.cards
-            else:
-                p_cards = input.card_set.cards
-        else:
-            p_cards = input.card_set.cards
+        recorder = input._recorder
+        if recorder is not None:
+            start = recorder.clock()
+
+        p_cards = input.playable_cards()
+
+        if recorder is not None:
+            start = recorder.record_since(LEGALITY, input.player_number, start)
+
+        if len(p_cards) == 1:
+            return PlayOutput(card=p_cards[0], forced=True)
 
         if input.game_variant == LIBRE:
             try:
@@ -181,6 +129,9 @@ class Model(BaseModel):
             except NotImplementedError:
                 output = self._play(input)
 
+        if recorder is not None:
+            recorder.record_since(MODEL, input.player_number, start)
+
         if output.card not in p_cards:
             raise ValueError(
                 f"Invalid card {output.card}, returned by the inner play implementation."
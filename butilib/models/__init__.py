@@ -0,0 +1,3 @@
+from .baseline import GreedyModel, RandomLegalModel, greedy_card
+from .heuristics import cantar_heuristic, hand_strength, heuristic_call
+from .ismcts import ISMCTSModel, SearchStats
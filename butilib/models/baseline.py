@@ -0,0 +1,131 @@
+import random
+from typing import List, Optional, Sequence, Tuple
+
+from pydantic import Field, PrivateAttr
+
+from butilib.model import Model
+from butilib.models.heuristics import cantar_heuristic
+from butilib.rules import POINTS, STRENGTH, SUITS, playable, suit_index, value, winner
+from butilib.schema import (
+    CantarInput,
+    CantarOutput,
+    ContrarInput,
+    ContrarOutput,
+    PlayInput,
+    PlayOutput,
+)
+from butilib.variants import OBLIGADA
+
+
+def _legal(input: PlayInput) -> Tuple[List[int], List[int], Optional[int]]:
+    # The legal cards as positions in the card set, with the card ids of the hand and the baza and the triumph.
+    hand = [c.to_id() for c in input.card_set.cards]
+    baza = [c.to_id() for c in input.cards]
+    triumph = None if input.butifarra else suit_index(input.triumph)
+    legal = playable(hand, baza, triumph, input.game_variant == OBLIGADA)
+    return [hand.index(c) for c in legal], baza, triumph
+
+
+def greedy_card(
+    legal: Sequence[int],
+    baza: Sequence[int],
+    triumph: Optional[int],
+    rng: random.Random,
+) -> int:
+    """Return the card GreedyModel plays among the legal ones, see GreedyModel.
+
+    Args:
+        legal (Sequence[int]): The legal card ids.
+        baza (Sequence[int]): The card ids already played in the baza.
+        triumph (Optional[int]): The triumph suit, None if butifarra.
+        rng (random.Random): The random generator that breaks ties.
+
+    Returns:
+        int: The card id to play.
+    """
+    if len(baza) == 0:
+        return max(legal, key=lambda c: (c // 12 != triumph, STRENGTH[c], rng.random()))
+
+    lead = baza[0] // 12
+    win_i = winner(baza, triumph)
+    win_v = value(baza[win_i], lead, triumph)
+    if (len(baza) - win_i) % 2 != 0:
+        winning = [c for c in legal if value(c, lead, triumph) > win_v]
+        if winning:
+            return min(winning, key=lambda c: (value(c, lead, triumph), rng.random()))
+
+    return min(
+        legal,
+        key=lambda c: (c // 12 == triumph, POINTS[c], STRENGTH[c], rng.random()),
+    )
+
+
+class RandomLegalModel(Model):
+    """A model that plays a random legal card, calls a random triumph (or delegates) and contrars at random. Legal
+    cards are computed on card ids (see butilib.rules) and the outputs are built without validation, so every
+    decision costs a few microseconds over the engine.
+
+    Attributes:
+        seed (Optional[int]): The seed of the random generator of the model. Defaults to None.
+        contrar_probability (float): The probability of contrar. Defaults to 0.0.
+    """
+
+    seed: Optional[int] = None
+    contrar_probability: float = Field(default=0.0, ge=0, le=1)
+
+    _rng: random.Random = PrivateAttr()
+
+    def model_post_init(self, __context) -> None:
+        self._rng = random.Random(self.seed)
+
+    def _cantar(self, input: CantarInput) -> CantarOutput:
+        choice = self._rng.randrange(5 if input.delegated else 6)
+        if choice < 4:
+            return CantarOutput(suit=SUITS[choice])
+        if choice == 4:
+            return CantarOutput(butifarra=True)
+        return CantarOutput(delegate=True)
+
+    def _contrar(self, input: ContrarInput) -> ContrarOutput:
+        return ContrarOutput.model_construct(
+            contrar=self._rng.random() < self.contrar_probability
+        )
+
+    def _play(self, input: PlayInput) -> PlayOutput:
+        legal, _, _ = _legal(input)
+        card = input.card_set.cards[legal[self._rng.randrange(len(legal))]]
+        return PlayOutput.model_construct(card=card, forced=False)
+
+
+class GreedyModel(Model):
+    """A model that only looks at the current baza: when the enemy is winning it wins with the cheapest card that
+    can, otherwise (or if it cannot win) it discards its lowest card, keeping triumphs and points. When leading it
+    plays its strongest card outside triumph. Calls triumph with cantar_heuristic and contrars holding 30 points or
+    more. Like RandomLegalModel, every decision costs a few microseconds over the engine.
+
+    Attributes:
+        seed (Optional[int]): The seed of the random generator that breaks ties. Defaults to None.
+    """
+
+    seed: Optional[int] = None
+
+    _rng: random.Random = PrivateAttr()
+
+    def model_post_init(self, __context) -> None:
+        self._rng = random.Random(self.seed)
+
+    def _cantar(self, input: CantarInput) -> CantarOutput:
+        return cantar_heuristic(input)
+
+    def _contrar(self, input: ContrarInput) -> ContrarOutput:
+        points = sum(c.points() for c in input.cards.cards)
+        return ContrarOutput.model_construct(contrar=points >= 30)
+
+    def _play(self, input: PlayInput) -> PlayOutput:
+        legal, baza, triumph = _legal(input)
+        cards = input.card_set.cards
+        ids = [cards[i].to_id() for i in legal]
+        card = greedy_card(ids, baza, triumph, self._rng)
+        return PlayOutput.model_construct(
+            card=cards[legal[ids.index(card)]], forced=False
+        )
@@ -0,0 +1,53 @@
+from typing import Optional, Sequence
+
+from butilib.rules import POINTS, SUITS
+from butilib.schema import CantarInput, CantarOutput
+
+
+def hand_strength(cards: Sequence[int], suit: int) -> int:
+    """Return the strength of a hand for a triumph suit: 3 per card of the suit plus the points of its cards.
+
+    Args:
+        cards (Sequence[int]): The card ids of the hand.
+        suit (int): The suit index.
+
+    Returns:
+        int: The strength of the hand.
+    """
+    return sum(3 + POINTS[c] for c in cards if c // 12 == suit)
+
+
+def heuristic_call(cards: Sequence[int]) -> Optional[int]:
+    """Return the call of cantar_heuristic without delegating: None (butifarra) with 24 points or more and three 9s,
+    else the index of the strongest suit (see hand_strength).
+
+    Args:
+        cards (Sequence[int]): The card ids of the hand.
+
+    Returns:
+        Optional[int]: The suit index, None for butifarra.
+    """
+    points = sum(POINTS[c] for c in cards)
+    nines = sum(1 for c in cards if c % 12 == 8)
+    if points >= 24 and nines >= 3:
+        return None
+    return max(range(4), key=lambda s: hand_strength(cards, s))
+
+
+def cantar_heuristic(input: CantarInput) -> CantarOutput:
+    """Call triumph from the cards held (see heuristic_call), delegating if the suit called is weak (under 20) and
+    the call was not delegated.
+
+    Args:
+        input (CantarInput): The input of the cantar function.
+
+    Returns:
+        CantarOutput: The call.
+    """
+    cards = [c.to_id() for c in input.cards.cards]
+    suit = heuristic_call(cards)
+    if suit is None:
+        return CantarOutput(butifarra=True)
+    if hand_strength(cards, suit) < 20 and not input.delegated:
+        return CantarOutput(delegate=True)
+    return CantarOutput(suit=SUITS[suit])
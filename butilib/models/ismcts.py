@@ -0,0 +1,261 @@
+import random
+import time
+from math import log, sqrt
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from pydantic import Field, PrivateAttr, model_validator
+
+from butilib.card import Card
+from butilib.model import Model
+from butilib.models.heuristics import cantar_heuristic
+from butilib.rules import POINTS, baza_points, playable, suit_index, winner
+from butilib.sampler import DealSampler
+from butilib.schema import (
+    CantarInput,
+    CantarOutput,
+    ContrarInput,
+    ContrarOutput,
+    PlayInput,
+    PlayOutput,
+)
+from butilib.variants import OBLIGADA
+
+
+class SearchStats(NamedTuple):
+    """The statistics of a search.
+
+    Attributes:
+        iterations (int): The number of simulations run.
+        elapsed (float): The time spent searching, in seconds.
+        reused_visits (int): The visits of the root inherited from the searches of previous decisions of the hand.
+    """
+
+    iterations: int
+    elapsed: float
+    reused_visits: int
+
+    @property
+    def iterations_per_second(self) -> float:
+        """float: The number of simulations run per second."""
+        return self.iterations / self.elapsed if self.elapsed > 0 else float("inf")
+
+
+class _Node:
+    __slots__ = ("player", "children", "visits", "reward", "avail")
+
+    def __init__(self, player: int):
+        self.player = player  # the player that played the card leading to this node
+        self.children: Dict[int, "_Node"] = {}
+        self.visits = 0
+        self.reward = 0.0
+        self.avail = 1
+
+
+class _State:
+    __slots__ = ("hands", "leader", "baza", "points", "triumph", "obligada")
+
+    def __init__(
+        self,
+        hands: List[List[int]],
+        leader: int,
+        baza: List[int],
+        triumph: Optional[int],
+        obligada: bool,
+    ):
+        self.hands = hands
+        self.leader = leader
+        self.baza = baza
+        self.points = 0
+        self.triumph = triumph
+        self.obligada = obligada
+
+    def player(self) -> int:
+        return (self.leader + len(self.baza)) % 4
+
+    def legal(self) -> List[int]:
+        hand = self.hands[(self.leader + len(self.baza)) % 4]
+        return playable(hand, self.baza, self.triumph, self.obligada)
+
+    def play(self, card: int) -> None:
+        self.hands[(self.leader + len(self.baza)) % 4].remove(card)
+        self.baza.append(card)
+        if len(self.baza) == 4:
+            win = (self.leader + winner(self.baza, self.triumph)) % 4
+            if win % 2 == 0:
+                self.points += baza_points(self.baza)
+            self.leader = win
+            self.baza = []
+
+    def done(self) -> bool:
+        return not self.baza and not self.hands[self.leader]
+
+
+class ISMCTSModel(Model):
+    """An Information Set Monte Carlo Tree Search model. Every decision runs simulations on deals of the hidden cards
+    sampled consistently with everything played (see butilib.sampler.DealSampler), sharing a single tree of the
+    cards played whose statistics are only compared between the cards available in the sampled deals. The tree is
+    kept between the decisions of the same hand, starting from the subtree of the cards played since. Calls triumph
+    with cantar_heuristic and never contrar.
+
+    Attributes:
+        iterations (Optional[int]): The maximum number of simulations per decision. Defaults to 1000.
+        time_limit (Optional[float]): The maximum time per decision, in seconds. Defaults to None (no limit).
+        exploration (float): The exploration constant of the UCB formula, rewards are fractions of the points left.
+            Defaults to 0.7.
+        seed (Optional[int]): The seed of the random generator. Defaults to None.
+
+    Validations:
+        check_a_budget_is_set: Check at least one of iterations and time_limit is set.
+    """
+
+    iterations: Optional[int] = Field(default=1000, ge=1)
+    time_limit: Optional[float] = Field(default=None, gt=0)
+    exploration: float = 0.7
+    seed: Optional[int] = None
+
+    _rng: random.Random = PrivateAttr()
+    _last_stats: Optional[SearchStats] = PrivateAttr(default=None)
+    _root: Optional[_Node] = PrivateAttr(default=None)
+    _root_key: Optional[Tuple] = PrivateAttr(default=None)
+    _root_played: Tuple[int, ...] = PrivateAttr(default=())
+
+    @model_validator(mode="after")
+    def check_a_budget_is_set(self):
+        if self.iterations is None and self.time_limit is None:
+            raise ValueError("Either iterations or time_limit must be set.")
+        return self
+
+    def model_post_init(self, __context) -> None:
+        self._rng = random.Random(self.seed)
+
+    @property
+    def last_stats(self) -> Optional[SearchStats]:
+        """Optional[SearchStats]: The statistics of the last search, None before the first one."""
+        return self._last_stats
+
+    def _cantar(self, input: CantarInput) -> CantarOutput:
+        return cantar_heuristic(input)
+
+    def _contrar(self, input: ContrarInput) -> ContrarOutput:
+        return ContrarOutput(contrar=False)
+
+    def _play(self, input: PlayInput) -> PlayOutput:
+        start = time.perf_counter()
+
+        triumph = None if input.butifarra else suit_index(input.triumph)
+        obligada = input.game_variant == OBLIGADA
+        leader = input.initial_player()
+        baza = [c.to_id() for c in input.cards]
+        legal = [c.to_id() for c in input.playable_cards()]
+
+        root = self._find_root(input, baza)
+        reused = root.visits
+        sampler = DealSampler.from_play_input(input)
+        rng = self._rng
+
+        n = 0
+        while True:
+            self._iterate(root, sampler.sample(rng), leader, baza, triumph, obligada)
+            n += 1
+            if self.iterations is not None and n >= self.iterations:
+                break
+            if (
+                self.time_limit is not None
+                and time.perf_counter() - start >= self.time_limit
+            ):
+                break
+
+        best = max(
+            legal,
+            key=lambda c: root.children[c].visits if c in root.children else -1,
+        )
+        self._last_stats = SearchStats(n, time.perf_counter() - start, reused)
+        return PlayOutput(card=Card.from_id(best))
+
+    def _find_root(self, input: PlayInput, baza: List[int]) -> _Node:
+        key = (
+            input.player_number,
+            input.player_c,
+            input.triumph,
+            input.butifarra,
+            input.game_variant,
+        )
+        played = tuple(c.to_id() for b in input.history for c in b.cards) + tuple(baza)
+
+        node = None
+        if (
+            self._root is not None
+            and key == self._root_key
+            and len(played) > len(self._root_played)
+            and played[: len(self._root_played)] == self._root_played
+        ):
+            node = self._root
+            for c in played[len(self._root_played) :]:
+                node = node.children.get(c)
+                if node is None:
+                    break
+
+        if node is None:
+            node = _Node((input.player_number - 1) % 4)
+        self._root = node
+        self._root_key = key
+        self._root_played = played
+        return node
+
+    def _iterate(
+        self,
+        root: _Node,
+        hands: List[List[int]],
+        leader: int,
+        baza: List[int],
+        triumph: Optional[int],
+        obligada: bool,
+    ) -> None:
+        state = _State(hands, leader, list(baza), triumph, obligada)
+        total = (sum(len(h) for h in hands) + len(baza)) // 4
+        total += sum(POINTS[c] for h in hands for c in h) + sum(POINTS[c] for c in baza)
+
+        rng = self._rng
+        c_explore = self.exploration
+        node = root
+        path = [root]
+        while not state.done():
+            legal = state.legal()
+            children = node.children
+            untried = []
+            for c in legal:
+                child = children.get(c)
+                if child is None:
+                    untried.append(c)
+                else:
+                    child.avail += 1
+
+            if untried:
+                c = rng.choice(untried)
+                child = _Node(state.player())
+                children[c] = child
+                state.play(c)
+                path.append(child)
+                break
+
+            best_c = legal[0]
+            best_v = -1.0
+            for c in legal:
+                child = children[c]
+                v = child.reward / child.visits + c_explore * sqrt(
+                    log(child.avail) / child.visits
+                )
+                if v > best_v:
+                    best_c, best_v = c, v
+            node = children[best_c]
+            state.play(best_c)
+            path.append(node)
+
+        while not state.done():
+            state.play(rng.choice(state.legal()))
+
+        r0 = state.points / total if total > 0 else 0.5
+        root.visits += 1
+        for node in path[1:]:
+            node.visits += 1
+            node.reward += r0 if node.player % 2 == 0 else 1 - r0
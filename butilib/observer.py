@@ -0,0 +1,91 @@
+from typing import Optional, Tuple
+
+from .contrada import Contrada
+from .suit import Suit
+
+
+class GameObserver:
+    """The hooks the engine calls as a game goes on, handed to play_baza, play_hand or the match runners in a list of
+    observers. Subclass it and override the events to follow: every event does nothing by default. The payloads are
+    compact (seats, card ids as in Card.to_id, scores as tuples) rather than pydantic objects, so that following a game
+    stays cheap, and the engine does not dispatch anything when no observers are given.
+
+    Seats are the player numbers, 0 to 3, and scores and points are given as (team of players 0 and 2, team of
+    players 1 and 3).
+    """
+
+    def on_hand_start(self, deal: int, replay: int, team: int) -> None:
+        """Called by the duplicate match runners (see butilib.evaluation.iter_duplicate_deals) before every hand they
+        play, which play_hand alone does not call.
+
+        Args:
+            deal (int): The index of the deal.
+            replay (int): The index of the hand among the replays of the deal, as in DuplicateDealResult.scores.
+            team (int): The team of the model under evaluation, 0 for players 0 and 2 and 1 for players 1 and 3.
+        """
+
+    def on_cantar(
+        self,
+        seat: int,
+        delegated: bool,
+        delegate: bool,
+        triumph: Optional[Suit],
+        butifarra: bool,
+    ) -> None:
+        """Called after every cantar call.
+
+        Args:
+            seat (int): The seat of the player that called.
+            delegated (bool): Wether the call had been delegated to the player by its partner.
+            delegate (bool): Wether the player delegated the call to its partner.
+            triumph (Optional[Suit]): The triumph called, None for butifarra or if delegated.
+            butifarra (bool): Wether butifarra was called.
+        """
+
+    def on_contrar(self, seat: int, contrada: Contrada, contrar: bool) -> None:
+        """Called after every contrar call.
+
+        Args:
+            seat (int): The seat of the player asked.
+            contrada (Contrada): The contrada level when the player was asked.
+            contrar (bool): Wether the player raised the contrada level.
+        """
+
+    def on_card_played(self, seat: int, card: int, position: int) -> None:
+        """Called after every card played.
+
+        Args:
+            seat (int): The seat of the player.
+            card (int): The id of the card.
+            position (int): The position of the card in its baza, 0 for the lead.
+        """
+
+    def on_baza_complete(
+        self, leader: int, cards: Tuple[int, ...], winner: int, points: int
+    ) -> None:
+        """Called after the fourth card of every baza.
+
+        Args:
+            leader (int): The seat of the player that led the baza.
+            cards (Tuple[int, ...]): The ids of the cards, in the order played.
+            winner (int): The seat of the player that won the baza.
+            points (int): The points of the baza, the one point of the baza included.
+        """
+
+    def on_hand_complete(
+        self,
+        triumph: Optional[Suit],
+        butifarra: bool,
+        contrada: Contrada,
+        points: Tuple[int, int],
+        score: Tuple[int, int],
+    ) -> None:
+        """Called after the twelfth baza of every hand.
+
+        Args:
+            triumph (Optional[Suit]): The triumph of the hand, None for butifarra.
+            butifarra (bool): Wether butifarra was called.
+            contrada (Contrada): The final contrada level.
+            points (Tuple[int, int]): The points won by each team in the bazas.
+            score (Tuple[int, int]): The match score after the hand.
+        """
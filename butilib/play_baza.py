@@ -1,13 +1,17 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 from .baza import Baza, History
 from .card import CardSet
 from .contrada import Contrada
+from .latency import INPUT, PLAY, LatencyRecorder
 from .model import Model
+from .observer import GameObserver
+from .rules import baza_points, suit_index, winner
 from .schema import PlayInput
 from .suit import Suit
+from .tracker import CardTracker
 from .variants import GameVariant
 
 
@@ -25,6 +29,8 @@ class PlayBazaInput(BaseModel):
     - contrada: Contrada
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     history: History
     players: List[Model] = Field(max_length=4, min_length=4)
     card_sets: List[CardSet] = Field(max_length=4, min_length=4)
@@ -127,15 +133,39 @@ class PlayBazaInput(BaseModel):
 
 
 class PlayBazaOutput(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     baza: Baza
 
 
-def play_baza(input: PlayBazaInput) -> PlayBazaOutput:
+def play_baza(
+    input: PlayBazaInput,
+    tracker: Optional[CardTracker] = None,
+    recorder: Optional[LatencyRecorder] = None,
+    observers: Sequence[GameObserver] = (),
+) -> PlayBazaOutput:
+    """Ask the four players for their cards of a baza, starting with the initial player.
+
+    Args:
+        input (PlayBazaInput): The input of the baza.
+        tracker (Optional[CardTracker], optional): The tracker of the hand, handed to the players and updated with
+            every card played. Defaults to None.
+        recorder (Optional[LatencyRecorder], optional): Records the time spent building the input of every player
+            and in their play calls, handed to the players so that Model.play records its phases. Defaults to None.
+        observers (Sequence[GameObserver], optional): Notified of every card played and of the baza once complete.
+            Defaults to none.
+
+    Returns:
+        PlayBazaOutput: The baza played.
+    """
     cards = []
 
     for i in range(0, 4):
         player_number = (input.initial_player + i) % 4
 
+        if recorder is not None:
+            start = recorder.clock()
+
         play_input = PlayInput(
             history=input.history,
             card_set=input.card_sets[player_number],
@@ -149,7 +179,31 @@ def play_baza(input: PlayBazaInput) -> PlayBazaOutput:
             contrada=input.contrada,
         )
 
-        output = input.players[player_number].play(play_input)
+        play_input.tracker = tracker
+
+        if recorder is None:
+            output = input.players[player_number].play(play_input)
+        else:
+            player = input.players[player_number]
+            recorder.models[player_number] = type(player).__name__
+            play_input.recorder = recorder
+            start = recorder.record_since(INPUT, player_number, start)
+            output = player.play(play_input)
+            recorder.record_since(PLAY, player_number, start)
         cards.append(output.card)
+        if tracker is not None:
+            tracker.play(output.card.to_id())
+        if observers:
+            card = output.card.to_id()
+            for observer in observers:
+                observer.on_card_played(player_number, card, i)
+
+    if observers:
+        ids = tuple(c.to_id() for c in cards)
+        win_i = winner(ids, suit_index(input.triumph))
+        leader = input.initial_player
+        points = baza_points(ids)
+        for observer in observers:
+            observer.on_baza_complete(leader, ids, (leader + win_i) % 4, points)
 
     return PlayBazaOutput(baza=Baza(cards=cards, initial_player=input.initial_player))
@@ -1,19 +1,31 @@
-from typing import List, Tuple
+from typing import List, Optional, Sequence, Tuple
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing_extensions import Annotated
 
+from butilib.baza import History
 from butilib.card import CardSet
+from butilib.contrada import CONTRADA, NORMAL, SANT_VICENTADA, Contrada
+from butilib.latency import BAZA_INPUT, CANTAR, CONTRAR, LatencyRecorder
 from butilib.model import Model
+from butilib.observer import GameObserver
+from butilib.play_baza import PlayBazaInput, play_baza
+from butilib.schema import CantarInput, ContrarInput
+from butilib.suit import Suit
+from butilib.tracker import CardTracker
+from butilib.variants import LIBRE, GameVariant
 
 
 class PlayHandInput(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     players: List[Model] = Field(min_length=4, max_length=4)
     card_sets: List[CardSet] = Field(min_length=4, max_length=4)
     score: Tuple[
         Annotated[int, Field(ge=0, le=101)], Annotated[int, Field(ge=0, le=101)]
     ]
     player_c: int = Field(ge=0, le=3)
+    game_variant: GameVariant = LIBRE
 
     @field_validator("card_sets")
     @classmethod
@@ -37,4 +49,189 @@ class PlayHandInput(BaseModel):
 
 
 class PlayHandOutput(BaseModel):
-    pass
+    """The output of a played hand. Scores and points are given as (team of players 0 and 2, team of players 1 and 3).
+
+    Attributes:
+        history (History): The 12 bazas of the hand.
+        triumph (Optional[Suit]): The triumph suit or None. Defaults to None.
+        butifarra (bool): Wether butifarra was called. Defaults to False.
+        player_c (int): The player that had to call triumph.
+        delegated (bool): Wether the call was delegated.
+        contrada (Contrada): The final contrada level.
+        game_variant (GameVariant): The game variant played.
+        points (Tuple[int, int]): The points won by each team in the bazas (they add up to 72).
+        score (Tuple[int, int]): The match score after the hand.
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+    history: History
+    triumph: Optional[Suit] = None
+    butifarra: bool = False
+    player_c: int = Field(ge=0, le=3)
+    delegated: bool
+    contrada: Contrada
+    game_variant: GameVariant
+    points: Tuple[int, int]
+    score: Tuple[int, int]
+
+
+def hand_score(
+    points: Tuple[int, int], contrada: Contrada, butifarra: bool
+) -> Tuple[int, int]:
+    """Compute the score awarded to each team for a hand: the team with more than 36 points scores the difference,
+    multiplied by 2 for every contrada level and by 2 again if butifarra was called.
+
+    Args:
+        points (Tuple[int, int]): The points won by each team in the bazas.
+        contrada (Contrada): The contrada level of the hand.
+        butifarra (bool): Wether butifarra was called.
+
+    Returns:
+        Tuple[int, int]: The score awarded to each team.
+    """
+    multiplier = 2**contrada.value * (2 if butifarra else 1)
+    diff = (points[0] - points[1]) // 2 * multiplier
+    if diff > 0:
+        return diff, 0
+    return 0, -diff
+
+
+def play_hand(
+    input: PlayHandInput,
+    recorder: Optional[LatencyRecorder] = None,
+    observers: Sequence[GameObserver] = (),
+) -> PlayHandOutput:
+    """Play a complete hand: the cantar call (delegating to the partner if asked), the contrar rounds and the 12 bazas.
+
+    Args:
+        input (PlayHandInput): The input of the hand.
+        recorder (Optional[LatencyRecorder], optional): Records the time spent in the cantar and contrar calls, in
+            building the input of every baza and in every baza (see play_baza). Defaults to None.
+        observers (Sequence[GameObserver], optional): Notified of the cantar and contrar calls, of every card and
+            baza (see play_baza) and of the hand once complete. Defaults to none.
+
+    Returns:
+        PlayHandOutput: The played hand and its score.
+    """
+    players = input.players
+    card_sets = [CardSet(cards=list(c.cards)) for c in input.card_sets]
+    if recorder is not None:
+        for seat, player in enumerate(players):
+            recorder.models[seat] = type(player).__name__
+
+    delegated = False
+    caller = input.player_c
+    if recorder is not None:
+        start = recorder.clock()
+    call = players[caller].cantar(
+        CantarInput(cards=card_sets[caller], delegated=False)
+    )
+    if recorder is not None:
+        recorder.record_since(CANTAR, caller, start)
+    for observer in observers:
+        observer.on_cantar(caller, False, call.delegate, call.suit, call.butifarra)
+    if call.delegate:
+        delegated = True
+        caller = (input.player_c + 2) % 4
+        if recorder is not None:
+            start = recorder.clock()
+        call = players[caller].cantar(
+            CantarInput(cards=card_sets[caller], delegated=True)
+        )
+        if recorder is not None:
+            recorder.record_since(CANTAR, caller, start)
+        for observer in observers:
+            observer.on_cantar(caller, True, call.delegate, call.suit, call.butifarra)
+
+    contrada = NORMAL
+    while contrada != SANT_VICENTADA:
+        offset = 2 if contrada == CONTRADA else 1
+        contrar = False
+        for seat in [(caller + offset) % 4, (caller + offset + 2) % 4]:
+            if recorder is not None:
+                start = recorder.clock()
+            output = players[seat].contrar(
+                ContrarInput(
+                    cards=card_sets[seat],
+                    player=(caller - seat) % 4,
+                    delegated=delegated,
+                    triumph=call.suit,
+                    butifarra=call.butifarra,
+                    score=(input.score[seat % 2], input.score[(seat + 1) % 2]),
+                    contrada=contrada,
+                )
+            )
+            if recorder is not None:
+                recorder.record_since(CONTRAR, seat, start)
+            for observer in observers:
+                observer.on_contrar(seat, contrada, output.contrar)
+            if output.contrar:
+                contrar = True
+                break
+
+        if not contrar:
+            break
+        contrada = Contrada(contrada.value + 1)
+
+    history = History(bazas=[])
+    initial_player = (caller + 1) % 4
+    tracker = CardTracker(call.suit, input.game_variant, initial_player)
+    points = [0, 0]
+    for _ in range(12):
+        if recorder is not None:
+            start = recorder.clock()
+        baza_input = PlayBazaInput(
+            history=history,
+            players=players,
+            card_sets=card_sets,
+            initial_player=initial_player,
+            butifarra=call.butifarra,
+            triumph=call.suit,
+            player_c=input.player_c,
+            delegated=delegated,
+            game_variant=input.game_variant,
+            contrada=contrada,
+        )
+        if recorder is not None:
+            recorder.record_since(BAZA_INPUT, None, start)
+        output = play_baza(baza_input, tracker, recorder, observers)
+        baza = output.baza
+
+        if call.butifarra:
+            t1 = baza.cards[0].suit
+            t2 = None
+        else:
+            t1 = call.suit
+            t2 = baza.cards[0].suit
+
+        win_i = 0
+        for i in range(1, 4):
+            if baza.cards[i].compare(baza.cards[win_i], t1, t2):
+                win_i = i
+
+        for i, card in enumerate(baza.cards):
+            card_sets[(baza.initial_player + i) % 4].remove(card)
+
+        history = History(bazas=history.bazas + [baza])
+        initial_player = (baza.initial_player + win_i) % 4
+        points[initial_player % 2] += 1 + sum(c.points() for c in baza.cards)
+
+    awarded = hand_score((points[0], points[1]), contrada, call.butifarra)
+    score = (input.score[0] + awarded[0], input.score[1] + awarded[1])
+    for observer in observers:
+        observer.on_hand_complete(
+            call.suit, call.butifarra, contrada, (points[0], points[1]), score
+        )
+
+    return PlayHandOutput(
+        history=history,
+        triumph=call.suit,
+        butifarra=call.butifarra,
+        player_c=input.player_c,
+        delegated=delegated,
+        contrada=contrada,
+        game_variant=input.game_variant,
+        points=(points[0], points[1]),
+        score=score,
+    )
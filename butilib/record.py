@@ -0,0 +1,104 @@
+from typing import NamedTuple, Optional, Tuple
+
+from .baza import Baza, History
+from .card import Card
+from .contrada import NORMAL, Contrada
+from .play_hand import PlayHandOutput
+from .suit import Suit
+from .variants import GameVariant
+
+
+class GameRecord(NamedTuple):
+    """A compact record of a played hand, using card ids (see Card.to_id) instead of pydantic objects.
+    Records are not validated when created, use butilib.replay.verify_games to check them.
+
+    Attributes:
+        cards (Tuple[int, ...]): The ids of the 48 cards in the order they were played.
+        leaders (Tuple[int, ...]): The initial player of each of the 12 bazas.
+        triumph (Optional[Suit]): The triumph suit, None if butifarra was called.
+        game_variant (GameVariant): The game variant played.
+        player_c (int): The player that had to call triumph. Defaults to 0.
+        delegated (bool): Wether the call was delegated. Defaults to False.
+        contrada (Contrada): The contrada level. Defaults to NORMAL.
+    """
+
+    cards: Tuple[int, ...]
+    leaders: Tuple[int, ...]
+    triumph: Optional[Suit]
+    game_variant: GameVariant
+    player_c: int = 0
+    delegated: bool = False
+    contrada: Contrada = NORMAL
+
+    @property
+    def butifarra(self) -> bool:
+        """Wether butifarra was called."""
+        return self.triumph is None
+
+    @classmethod
+    def from_history(
+        cls,
+        history: History,
+        triumph: Optional[Suit],
+        game_variant: GameVariant,
+        player_c: int = 0,
+        delegated: bool = False,
+        contrada: Contrada = NORMAL,
+    ) -> "GameRecord":
+        """Create a record from the history of a hand and its metadata.
+
+        Args:
+            history (History): The history of the hand.
+            triumph (Optional[Suit]): The triumph suit, None if butifarra was called.
+            game_variant (GameVariant): The game variant played.
+            player_c (int, optional): The player that had to call triumph. Defaults to 0.
+            delegated (bool, optional): Wether the call was delegated. Defaults to False.
+            contrada (Contrada, optional): The contrada level. Defaults to NORMAL.
+
+        Returns:
+            GameRecord: The record of the hand.
+        """
+        return cls(
+            cards=tuple(c.to_id() for b in history.bazas for c in b.cards),
+            leaders=tuple(b.initial_player for b in history.bazas),
+            triumph=triumph,
+            game_variant=game_variant,
+            player_c=player_c,
+            delegated=delegated,
+            contrada=contrada,
+        )
+
+    @classmethod
+    def from_hand(cls, output: PlayHandOutput) -> "GameRecord":
+        """Create a record from the output of play_hand.
+
+        Args:
+            output (PlayHandOutput): The played hand.
+
+        Returns:
+            GameRecord: The record of the hand.
+        """
+        return cls.from_history(
+            output.history,
+            triumph=None if output.butifarra else output.triumph,
+            game_variant=output.game_variant,
+            player_c=output.player_c,
+            delegated=output.delegated,
+            contrada=output.contrada,
+        )
+
+    def history(self) -> History:
+        """Build the (validated) History of the recorded hand.
+
+        Returns:
+            History: The history of the hand.
+        """
+        return History(
+            bazas=[
+                Baza(
+                    initial_player=leader,
+                    cards=[Card.from_id(c) for c in self.cards[4 * i : 4 * i + 4]],
+                )
+                for i, leader in enumerate(self.leaders)
+            ]
+        )
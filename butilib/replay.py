@@ -0,0 +1,132 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, List, NamedTuple, Optional, Sequence
+
+from .record import GameRecord
+from .rules import playable, suit_index, winner
+from .variants import OBLIGADA
+
+
+class ReplayError(NamedTuple):
+    """An error found when replaying a recorded hand.
+
+    Attributes:
+        game (int): The position of the hand in the verified records.
+        baza (int): The baza where the error was found, -1 if the record is malformed.
+        message (str): The description of the error.
+    """
+
+    game: int
+    baza: int
+    message: str
+
+
+def verify_game(record: GameRecord, game: int = 0) -> Optional[ReplayError]:
+    """Replay a recorded hand checking that every card played was legal and every baza was started by the winner of the
+    previous one. Replay stops at the first error.
+
+    Args:
+        record (GameRecord): The recorded hand.
+        game (int, optional): The position of the hand, to be reported in the error. Defaults to 0.
+
+    Returns:
+        Optional[ReplayError]: The first error found, None if the hand is correct.
+    """
+    cards = record.cards
+    leaders = record.leaders
+
+    if len(cards) != 48 or len(leaders) != 12:
+        return ReplayError(game, -1, "The record must contain 48 cards and 12 bazas.")
+    if len(set(cards)) != 48 or min(cards) < 0 or max(cards) > 47:
+        return ReplayError(game, -1, "The record contains invalid or repeated cards.")
+    if any(l < 0 or l > 3 for l in leaders):
+        return ReplayError(game, -1, "The record contains invalid initial players.")
+
+    called = record.player_c if not record.delegated else (record.player_c + 2) % 4
+    if leaders[0] != (called + 1) % 4:
+        return ReplayError(
+            game, 0, "The first baza was not started by the expected player."
+        )
+
+    hands = [[], [], [], []]
+    for i in range(12):
+        for j in range(4):
+            hands[(leaders[i] + j) % 4].append(cards[4 * i + j])
+    if any(len(h) != 12 for h in hands):
+        return ReplayError(game, -1, "Not all the players played 12 cards.")
+
+    triumph = suit_index(record.triumph)
+    obligada = record.game_variant == OBLIGADA
+
+    for i in range(12):
+        baza = cards[4 * i : 4 * i + 4]
+        leader = leaders[i]
+        for j in range(4):
+            hand = hands[(leader + j) % 4]
+            if baza[j] not in playable(hand, baza[:j], triumph, obligada):
+                return ReplayError(
+                    game,
+                    i,
+                    f"Illegal card {baza[j]} played by player {(leader + j) % 4}.",
+                )
+            hand.remove(baza[j])
+
+        if i < 11 and leaders[i + 1] != (leader + winner(baza, triumph)) % 4:
+            return ReplayError(
+                game,
+                i + 1,
+                "The baza was not started by the winner of the previous one.",
+            )
+
+    return None
+
+
+def _verify_chunk(start: int, records: Sequence[GameRecord]) -> List[ReplayError]:
+    errors = []
+    for i, record in enumerate(records):
+        error = verify_game(record, start + i)
+        if error is not None:
+            errors.append(error)
+    return errors
+
+
+def verify_games(
+    records: Iterable[GameRecord],
+    processes: int = 1,
+    chunk_size: int = 10000,
+) -> List[ReplayError]:
+    """Replay a stream of recorded hands and return the errors found, see verify_game.
+    Records are consumed lazily in chunks, which are verified in parallel when using more than one process.
+
+    Args:
+        records (Iterable[GameRecord]): The recorded hands.
+        processes (int, optional): The number of worker processes, 1 to verify in the current process. Defaults to 1.
+        chunk_size (int, optional): The number of records sent to a worker at once. Defaults to 10000.
+
+    Returns:
+        List[ReplayError]: The errors found, at most one per hand, in the order of the records.
+    """
+    it = iter(records)
+    errors = []
+    start = 0
+
+    if processes == 1:
+        while chunk := list(islice(it, chunk_size)):
+            errors.extend(_verify_chunk(start, chunk))
+            start += len(chunk)
+        return errors
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        pending = deque()
+        while True:
+            while len(pending) < 2 * processes and (
+                chunk := list(islice(it, chunk_size))
+            ):
+                pending.append(executor.submit(_verify_chunk, start, chunk))
+                start += len(chunk)
+            if not pending:
+                break
+            errors.extend(pending.popleft().result())
+
+    return errors
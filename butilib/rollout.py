@@ -0,0 +1,337 @@
+import os
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from math import sqrt
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from .models.baseline import greedy_card
+from .rules import baza_points, playable, suit_index, winner
+from .sampler import Constraints, DealSampler
+from .schema import PlayInput
+from .tracker import FULL_MASK, CardTracker
+from .variants import OBLIGADA
+
+# The root position in shared memory, as signed 64 bit integers: a generation number that changes with every root,
+# the player to move, the initial player of the baza, the triumph suit (-1 if butifarra), wether the variant is
+# OBLIGADA, the number of cards in the baza and in the hand of the player, the mask of cards played, the masks of cards
+# and the number of cards every player may hold, and the card ids of the baza and the hand.
+_GENERATION, _PLAYER, _LEADER, _TRIUMPH, _OBLIGADA, _N_BAZA, _N_OWN, _PLAYED = range(8)
+_ALLOWED = 8
+_COUNTS = 12
+_BAZA = 16
+_OWN = 19
+_SIZE = 31
+
+
+def mean_standard_error(n: int, total: float, total_sq: float) -> Tuple[float, float]:
+    """Return the mean of a sample and its standard error from its size, sum and sum of squares.
+
+    Args:
+        n (int): The size of the sample.
+        total (float): The sum of the sample.
+        total_sq (float): The sum of squares of the sample.
+
+    Returns:
+        Tuple[float, float]: The mean and its standard error (infinite with less than two values).
+    """
+    mean = total / n
+    if n < 2:
+        return mean, float("inf")
+    var = max(total_sq - n * mean * mean, 0.0) / (n - 1)
+    return mean, sqrt(var / n)
+
+
+def playout(
+    hands: List[List[int]],
+    leader: int,
+    baza: List[int],
+    triumph: Optional[int],
+    obligada: bool,
+    rng: random.Random,
+) -> Tuple[int, int]:
+    """Play the rest of a hand with every player following butilib.models.greedy_card and return the points each
+    team takes. The hands and the baza are consumed.
+
+    Args:
+        hands (List[List[int]]): The card ids of the four players.
+        leader (int): The initial player of the current baza.
+        baza (List[int]): The card ids already played in the current baza.
+        triumph (Optional[int]): The triumph suit, None if butifarra.
+        obligada (bool): Wether the game variant is OBLIGADA.
+        rng (random.Random): The random generator that breaks ties.
+
+    Returns:
+        Tuple[int, int]: The points of team 0 (players 0 and 2) and team 1 (players 1 and 3).
+    """
+    points = [0, 0]
+    while True:
+        for i in range(len(baza), 4):
+            hand = hands[(leader + i) % 4]
+            card = greedy_card(
+                playable(hand, baza, triumph, obligada), baza, triumph, rng
+            )
+            hand.remove(card)
+            baza.append(card)
+        leader = (leader + winner(baza, triumph)) % 4
+        points[leader % 2] += baza_points(baza)
+        if not hands[leader]:
+            return points[0], points[1]
+        baza = []
+
+
+class MoveStats(NamedTuple):
+    """The rollout statistics of a legal card: the points the team of the player takes in the rest of the hand
+    (the current baza included) over the simulated continuations.
+
+    Attributes:
+        card (int): The card id.
+        rollouts (int): The number of simulated continuations.
+        mean (float): The mean points.
+        standard_error (float): The standard error of the mean.
+    """
+
+    card: int
+    rollouts: int
+    mean: float
+    standard_error: float
+
+
+class _Root:
+    # The root position read back from shared memory, with the sampler of its hidden hands.
+
+    def __init__(self, block: Sequence[int]):
+        self.generation = block[_GENERATION]
+        self.player = block[_PLAYER]
+        self.leader = block[_LEADER]
+        self.triumph = None if block[_TRIUMPH] < 0 else block[_TRIUMPH]
+        self.obligada = bool(block[_OBLIGADA])
+        self.baza = list(block[_BAZA : _BAZA + block[_N_BAZA]])
+        own = tuple(block[_OWN : _OWN + block[_N_OWN]])
+
+        seen = block[_PLAYED]
+        for c in own:
+            seen |= 1 << c
+        self.sampler = DealSampler(
+            Constraints(
+                tuple(own if s == self.player else () for s in range(4)),
+                tuple(c for c in range(48) if not seen >> c & 1),
+                tuple(block[_ALLOWED : _ALLOWED + 4]),
+                tuple(block[_COUNTS : _COUNTS + 4]),
+            )
+        )
+
+    def rollouts(self, card: int, n: int, seed: int) -> Tuple[int, float, float]:
+        rng = random.Random(seed)
+        total = total_sq = 0.0
+        for _ in range(n):
+            hands = self.sampler.sample(rng)
+            hands[self.player].remove(card)
+            baza = self.baza + [card]
+            points = playout(hands, self.leader, baza, self.triumph, self.obligada, rng)
+            p = points[self.player % 2]
+            total += p
+            total_sq += p * p
+        return n, total, total_sq
+
+
+class _Worker:
+    # The state of a process running rollouts: the shared block and the root last read from it.
+
+    def __init__(self, shm: SharedMemory):
+        self.shm = shm
+        self.block = shm.buf.cast("q")
+        self.root: Optional[_Root] = None
+
+    def run(
+        self, generation: int, card: int, n: int, seed: int
+    ) -> Tuple[int, float, float]:
+        if self.root is None or self.root.generation != generation:
+            self.root = _Root(self.block)
+            if self.root.generation != generation:
+                raise RuntimeError("The root position changed while running rollouts.")
+        return self.root.rollouts(card, n, seed)
+
+    def close(self) -> None:
+        self.block.release()
+        self.shm.close()
+
+
+_worker: Optional[_Worker] = None
+
+
+def _init_worker(name: str) -> None:
+    global _worker
+    _worker = _Worker(SharedMemory(name=name))
+
+
+def _run(generation: int, card: int, n: int, seed: int) -> Tuple[int, float, float]:
+    assert _worker is not None
+    return _worker.run(generation, card, n, seed)
+
+
+class RolloutExecutor:
+    """Evaluate every legal card of a position by simulated continuations: the hidden hands are sampled consistent
+    with what the player knows (see butilib.sampler.DealSampler) and the rest of the hand is played with
+    butilib.models.greedy_card.
+
+    The root position is written once per decision to a shared memory block as card ids and masks, and a pool of
+    worker processes kept for the life of the executor reads it back when it changes, so tasks only carry a card,
+    a number of rollouts and a seed. Use it as a context manager, or call close, to stop the workers and free the
+    block.
+
+    Args:
+        processes (Optional[int], optional): The number of worker processes, 1 runs the rollouts in this process.
+            Defaults to the number of CPUs.
+        rollouts (int, optional): The number of rollouts per legal card. Defaults to 200.
+        batch_size (int, optional): The number of rollouts per task. Defaults to 50.
+        seed (Optional[int], optional): The seed of the rollouts. Defaults to None.
+
+    Raises:
+        ValueError: If a number of processes, rollouts or batch size is not positive.
+    """
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        rollouts: int = 200,
+        batch_size: int = 50,
+        seed: Optional[int] = None,
+    ):
+        processes = processes or os.cpu_count() or 1
+        if processes < 1 or rollouts < 1 or batch_size < 1:
+            raise ValueError(
+                "The number of processes, rollouts and batch size must be positive."
+            )
+        self.processes = processes
+        self.rollouts = rollouts
+        self.batch_size = batch_size
+        self._rng = random.Random(seed)
+        self._generation = 0
+
+        self._shm = SharedMemory(create=True, size=8 * _SIZE)
+        self._local: Optional[_Worker] = _Worker(self._shm)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        if processes > 1:
+            self._pool = ProcessPoolExecutor(
+                processes, initializer=_init_worker, initargs=(self._shm.name,)
+            )
+
+    def evaluate(
+        self, input: PlayInput, rollouts: Optional[int] = None
+    ) -> List[MoveStats]:
+        """Evaluate the legal cards of the player of a PlayInput, using the tracker of the input if it has one.
+
+        Args:
+            input (PlayInput): The input of the player.
+            rollouts (Optional[int], optional): The number of rollouts per legal card. Defaults to the one of the
+                executor.
+
+        Raises:
+            ValueError: If the number of rollouts is not positive.
+
+        Returns:
+            List[MoveStats]: The statistics of every legal card, best first.
+        """
+        tracker = input.tracker or CardTracker.from_play_input(input)
+        own = [c.to_id() for c in input.card_set.cards]
+        legal = playable(
+            own,
+            tracker.baza,
+            None if input.butifarra else suit_index(input.triumph),
+            input.game_variant == OBLIGADA,
+        )
+        return self.evaluate_tracker(tracker, input.player_number, own, legal, rollouts)
+
+    def evaluate_tracker(
+        self,
+        tracker: CardTracker,
+        player_number: int,
+        own: Sequence[int],
+        legal: Sequence[int],
+        rollouts: Optional[int] = None,
+    ) -> List[MoveStats]:
+        """Evaluate some cards of a player from the tracker of the hand, see evaluate.
+
+        Args:
+            tracker (CardTracker): The tracker of the hand, with the player to play next.
+            player_number (int): The player number.
+            own (Sequence[int]): The card ids of the player.
+            legal (Sequence[int]): The card ids to evaluate.
+            rollouts (Optional[int], optional): The number of rollouts per card. Defaults to the one of the
+                executor.
+
+        Raises:
+            ValueError: If the number of rollouts is not positive.
+
+        Returns:
+            List[MoveStats]: The statistics of every card, best first.
+        """
+        if rollouts is None:
+            rollouts = self.rollouts
+        elif rollouts < 1:
+            raise ValueError("The number of rollouts must be positive.")
+        self._write(tracker, player_number, own)
+
+        tasks = []
+        for card in legal:
+            left = rollouts
+            while left > 0:
+                n = min(left, self.batch_size)
+                tasks.append((self._generation, card, n, self._rng.getrandbits(64)))
+                left -= n
+
+        if self._pool is None:
+            assert self._local is not None
+            results = [self._local.run(*t) for t in tasks]
+        else:
+            results = list(self._pool.map(_run, *zip(*tasks)))
+
+        sums = {card: [0, 0.0, 0.0] for card in legal}
+        for (_, card, _, _), (n, total, total_sq) in zip(tasks, results):
+            s = sums[card]
+            s[0] += n
+            s[1] += total
+            s[2] += total_sq
+        stats = [
+            MoveStats(card, s[0], *mean_standard_error(*s)) for card, s in sums.items()
+        ]
+        stats.sort(key=lambda m: -m.mean)
+        return stats
+
+    def _write(
+        self, tracker: CardTracker, player_number: int, own: Sequence[int]
+    ) -> None:
+        constraints = Constraints.from_tracker(tracker, player_number, own)
+        self._generation += 1
+        assert self._local is not None
+        block = self._local.block
+        block[_GENERATION] = self._generation
+        block[_PLAYER] = player_number
+        block[_LEADER] = tracker.leader
+        block[_TRIUMPH] = -1 if tracker.triumph is None else tracker.triumph
+        block[_OBLIGADA] = tracker.obligada
+        block[_N_BAZA] = len(tracker.baza)
+        block[_N_OWN] = len(own)
+        block[_PLAYED] = tracker.played & FULL_MASK
+        block[_ALLOWED : _ALLOWED + 4] = array("q", constraints.allowed)
+        block[_COUNTS : _COUNTS + 4] = array("q", constraints.counts)
+        block[_BAZA : _BAZA + len(tracker.baza)] = array("q", tracker.baza)
+        block[_OWN : _OWN + len(own)] = array("q", own)
+
+    def close(self) -> None:
+        """Stop the worker processes and free the shared memory block."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._local is not None:
+            self._local.close()
+            self._local = None
+            self._shm.unlink()
+
+    def __enter__(self) -> "RolloutExecutor":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,127 @@
+"""The rules of butifarra on card ids (see Card.to_id), for tight loops where building pydantic objects is too slow.
+
+Suits are represented by their index in Suit (OROS, BASTOS, ESPADAS, COPAS) and the triumph is None when butifarra
+is called. These functions follow the same rules as Card.compare and PlayInput.playable_cards.
+"""
+
+from typing import List, Optional, Sequence
+
+from .suit import Suit
+
+SUITS = tuple(Suit)
+SUIT_INDEX = {s: i for i, s in enumerate(SUITS)}
+
+POINTS = tuple({9: 5, 1: 4, 12: 3, 11: 2, 10: 1}.get(i % 12 + 1, 0) for i in range(48))
+STRENGTH = tuple(i % 12 + 1 + POINTS[i] * 100 for i in range(48))
+
+
+def suit_index(triumph: Optional[Suit]) -> Optional[int]:
+    """Return the index of a suit, or None if there is no suit (butifarra).
+
+    Args:
+        triumph (Optional[Suit]): The suit.
+
+    Returns:
+        Optional[int]: The index of the suit.
+    """
+    return None if triumph is None else SUIT_INDEX[triumph]
+
+
+def value(card: int, lead: int, triumph: Optional[int]) -> int:
+    """Return the value of a card inside a baza, the card with the highest value wins the baza.
+    Cards that are neither of the lead suit nor triumph have a value of -1.
+
+    Args:
+        card (int): The card id.
+        lead (int): The suit of the first card of the baza.
+        triumph (Optional[int]): The triumph suit, None if butifarra.
+
+    Returns:
+        int: The value of the card.
+    """
+    suit = card // 12
+    if suit == triumph:
+        return STRENGTH[card] + 10000
+    if suit == lead:
+        return STRENGTH[card] + 1000
+    return -1
+
+
+def winner(cards: Sequence[int], triumph: Optional[int]) -> int:
+    """Return the position of the winning card in the played cards of a baza.
+
+    Args:
+        cards (Sequence[int]): The cards played, in order.
+        triumph (Optional[int]): The triumph suit, None if butifarra.
+
+    Returns:
+        int: The position of the winning card.
+    """
+    lead = cards[0] // 12
+    win_i = 0
+    win_v = value(cards[0], lead, triumph)
+    for i in range(1, len(cards)):
+        v = value(cards[i], lead, triumph)
+        if v > win_v:
+            win_i = i
+            win_v = v
+    return win_i
+
+
+def baza_points(cards: Sequence[int]) -> int:
+    """Return the points won with a baza: 1 plus the points of its cards.
+
+    Args:
+        cards (Sequence[int]): The cards of the baza.
+
+    Returns:
+        int: The points of the baza.
+    """
+    return 1 + sum(POINTS[c] for c in cards)
+
+
+def playable(
+    hand: Sequence[int],
+    cards: Sequence[int],
+    triumph: Optional[int],
+    obligada: bool,
+) -> List[int]:
+    """Return the cards of a hand that can be legally played, in the order of the hand.
+
+    Args:
+        hand (Sequence[int]): The cards of the player.
+        cards (Sequence[int]): The cards already played in the current baza.
+        triumph (Optional[int]): The triumph suit, None if butifarra.
+        obligada (bool): Wether the game variant is OBLIGADA.
+
+    Returns:
+        List[int]: The playable cards.
+    """
+    if len(hand) == 1 or len(cards) == 0:
+        return list(hand)
+
+    lead = cards[0] // 12
+    follow = [c for c in hand if c // 12 == lead]
+    if len(follow) == 1:
+        return follow
+
+    win_i = winner(cards, triumph)
+    win_v = value(cards[win_i], lead, triumph)
+    enemy_winning = (len(cards) - win_i) % 2 != 0
+
+    if len(follow) > 1:
+        if enemy_winning:
+            w_cards = [c for c in follow if value(c, lead, triumph) > win_v]
+            if len(w_cards) > 0:
+                return w_cards
+            if obligada:
+                return [min(follow, key=STRENGTH.__getitem__)]
+        return follow
+
+    if enemy_winning and triumph is not None:
+        t_cards = [c for c in hand if c // 12 == triumph]
+        if len(t_cards) > 0:
+            w_cards = [c for c in t_cards if value(c, lead, triumph) > win_v]
+            return w_cards if len(w_cards) > 0 else t_cards
+
+    return list(hand)
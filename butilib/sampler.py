@@ -0,0 +1,211 @@
+import random
+from bisect import bisect_right
+from itertools import accumulate
+from math import comb
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .schema import PlayInput
+from .tracker import FULL_MASK, CardTracker
+
+
+class Constraints(NamedTuple):
+    """What a player knows of the hidden hands: the cards they hold, the cards nobody has played yet and they do not
+    hold, the cards each player may hold and how many cards each player holds. Cards are given as ids and sets of
+    cards as masks (bit id set).
+
+    Attributes:
+        known (Tuple[Tuple[int, ...], ...]): The cards known for every player (the own hand, empty for the rest).
+        unknown (Tuple[int, ...]): The cards to deal among the other players.
+        allowed (Tuple[int, int, int, int]): The mask of cards every player may hold.
+        counts (Tuple[int, int, int, int]): The number of unknown cards every player holds.
+    """
+
+    known: Tuple[Tuple[int, ...], ...]
+    unknown: Tuple[int, ...]
+    allowed: Tuple[int, int, int, int]
+    counts: Tuple[int, int, int, int]
+
+    @classmethod
+    def from_tracker(
+        cls, tracker: CardTracker, player_number: int, own: Sequence[int]
+    ) -> "Constraints":
+        """Build the constraints of a player from the tracker of the hand and their cards.
+
+        Args:
+            tracker (CardTracker): The tracker of the hand.
+            player_number (int): The player number.
+            own (Sequence[int]): The cards of the player.
+
+        Returns:
+            Constraints: The constraints.
+        """
+        seen = tracker.played
+        for c in own:
+            seen |= 1 << c
+        free = FULL_MASK & ~seen
+
+        return cls(
+            tuple(tuple(own) if s == player_number else () for s in range(4)),
+            tuple(c for c in range(48) if not seen >> c & 1),
+            tuple(
+                0 if s == player_number else tracker.possible(s) & free
+                for s in range(4)
+            ),
+            tuple(0 if s == player_number else tracker.counts[s] for s in range(4)),
+        )
+
+    @classmethod
+    def from_play_input(cls, input: PlayInput) -> "Constraints":
+        """Build the constraints of the player of a PlayInput from their cards and the tracker of the hand, rebuilt
+        from the history and the current baza if the input has none.
+
+        Args:
+            input (PlayInput): The input of the player.
+
+        Returns:
+            Constraints: The constraints.
+        """
+        tracker = input.tracker or CardTracker.from_play_input(input)
+        own = [c.to_id() for c in input.card_set.cards]
+        return cls.from_tracker(tracker, input.player_number, own)
+
+
+class DealSampler:
+    """Sample deals of the unknown cards uniformly among the ones consistent with some constraints, without rejection:
+    the unknown cards are grouped by the set of players that may hold them, the number of consistent deals is counted
+    for every split of a group among its players and every sample draws the splits by their weights, so sampling
+    late in the hand, when few deals are left, costs the same as at its start.
+
+    Args:
+        constraints (Constraints): The constraints of the deals.
+
+    Raises:
+        ValueError: If no deal is consistent with the constraints.
+    """
+
+    def __init__(self, constraints: Constraints):
+        self.constraints = constraints
+
+        groups: Dict[Tuple[int, ...], List[int]] = {}
+        for c in constraints.unknown:
+            seats = tuple(s for s in range(4) if constraints.allowed[s] >> c & 1)
+            groups.setdefault(seats, []).append(c)
+        self._groups = list(groups.items())
+        self._splits: Dict[
+            Tuple[int, Tuple[int, ...]], Tuple[List[Tuple[int, ...]], List[int]]
+        ] = {}
+        self._ways: Dict[Tuple[int, Tuple[int, ...]], int] = {}
+
+        self.total = self._count(0, tuple(constraints.counts))
+        if self.total == 0:
+            raise ValueError("No deal is consistent with the constraints.")
+
+    @classmethod
+    def from_play_input(cls, input: PlayInput) -> "DealSampler":
+        """Build the sampler of the hidden hands of the player of a PlayInput, see Constraints.from_play_input.
+
+        Args:
+            input (PlayInput): The input of the player.
+
+        Returns:
+            DealSampler: The sampler.
+        """
+        return cls(Constraints.from_play_input(input))
+
+    def _count(self, k: int, counts: Tuple[int, ...]) -> int:
+        if k == len(self._groups):
+            return 1 if not any(counts) else 0
+        key = (k, counts)
+        ways = self._ways.get(key)
+        if ways is not None:
+            return ways
+
+        seats, cards = self._groups[k]
+        splits = []
+        weights = []
+        for split in _compositions(len(cards), [counts[s] for s in seats]):
+            rest = list(counts)
+            for s, n in zip(seats, split):
+                rest[s] -= n
+            w = self._count(k + 1, tuple(rest))
+            if w:
+                m, left = 1, len(cards)
+                for n in split:
+                    m *= comb(left, n)
+                    left -= n
+                splits.append(split)
+                weights.append(m * w)
+
+        self._splits[key] = (splits, list(accumulate(weights)))
+        ways = sum(weights)
+        self._ways[key] = ways
+        return ways
+
+    def sample(self, rng: Optional[random.Random] = None) -> List[List[int]]:
+        """Sample a deal: the cards of the four players, known cards first.
+
+        Args:
+            rng (Optional[random.Random], optional): The random generator. Defaults to the random module.
+
+        Returns:
+            List[List[int]]: The card ids of every player.
+        """
+        rng = rng or random
+        hands = [list(h) for h in self.constraints.known]
+        counts = tuple(self.constraints.counts)
+        for k, (seats, cards) in enumerate(self._groups):
+            splits, cum = self._splits[(k, counts)]
+            split = splits[bisect_right(cum, rng.randrange(cum[-1]))]
+            cards = rng.sample(cards, len(cards))
+            rest = list(counts)
+            i = 0
+            for s, n in zip(seats, split):
+                hands[s].extend(cards[i : i + n])
+                i += n
+                rest[s] -= n
+            counts = tuple(rest)
+        return hands
+
+    def sample_many(
+        self, k: int, rng: Optional[random.Random] = None
+    ) -> List[List[List[int]]]:
+        """Sample k deals, see sample.
+
+        Args:
+            k (int): The number of deals.
+            rng (Optional[random.Random], optional): The random generator. Defaults to the random module.
+
+        Returns:
+            List[List[List[int]]]: The deals.
+        """
+        return [self.sample(rng) for _ in range(k)]
+
+
+def _compositions(n: int, limits: Sequence[int]):
+    if len(limits) == 0:
+        if n == 0:
+            yield ()
+        return
+    if len(limits) == 1:
+        if n <= limits[0]:
+            yield (n,)
+        return
+    for a in range(min(n, limits[0]) + 1):
+        for rest in _compositions(n - a, limits[1:]):
+            yield (a,) + rest
+
+
+def sample_deals(
+    input: PlayInput, k: int, rng: Optional[random.Random] = None
+) -> List[List[List[int]]]:
+    """Sample k deals of the hidden hands consistent with what the player of a PlayInput knows, see DealSampler.
+
+    Args:
+        input (PlayInput): The input of the player.
+        k (int): The number of deals.
+        rng (Optional[random.Random], optional): The random generator. Defaults to the random module.
+
+    Returns:
+        List[List[List[int]]]: The card ids of the four players of every deal.
+    """
+    return DealSampler.from_play_input(input).sample_many(k, rng)
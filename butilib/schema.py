@@ -1,13 +1,23 @@
 from typing import List, Optional, Tuple
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    field_validator,
+    model_validator,
+)
 from typing_extensions import Annotated
 
 from .baza import History
 from .card import Card, CardSet
 from .contrada import CONTRADA, NORMAL, RECONTRADA, SANT_VICENTADA, Contrada
+from .latency import LatencyRecorder
+from .rules import playable, suit_index
 from .suit import Suit
-from .variants import GameVariant
+from .tracker import CardTracker
+from .variants import OBLIGADA, GameVariant
 
 
 class CantarInput(BaseModel):
@@ -21,6 +31,8 @@ class CantarInput(BaseModel):
         validate_cards_has_exactly_12_cards: check wether or not you have a complete card set.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     cards: CardSet
     delegated: bool
 
@@ -33,6 +45,8 @@ class CantarInput(BaseModel):
 
 
 class CantarOutput(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     suit: Optional[Suit] = None
     delegate: bool = False
     butifarra: bool = False
@@ -89,6 +103,8 @@ class ContrarInput(BaseModel):
         check_it_is_possible_to_be_in_that_situation: Check if the conrada level is possible or not.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     cards: CardSet
     player: int = Field(ge=0, le=3)
     delegated: bool
@@ -138,6 +154,8 @@ class ContrarOutput(BaseModel):
         contrar (bool): Wether you increment the contrada level or not.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     contrar: bool
 
 
@@ -163,6 +181,8 @@ class PlayInput(BaseModel):
         check_number_of_cards_in_card_set_is_consistent_with_the_number_of_bazas_in_history: Check that you have the correct number of cards.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     history: History
     card_set: CardSet
     triumph: Optional[Suit] = None
@@ -174,6 +194,31 @@ class PlayInput(BaseModel):
     delegated: bool
     game_variant: GameVariant
 
+    _tracker: Optional[CardTracker] = PrivateAttr(default=None)
+    _recorder: Optional[LatencyRecorder] = PrivateAttr(default=None)
+
+    @property
+    def tracker(self) -> Optional[CardTracker]:
+        """Optional[CardTracker]: The tracker of the hand kept by the engine, in the state before your card. It is
+        shared between all the players and must not be modified. None if the input was not built by the engine.
+        """
+        return self._tracker
+
+    @tracker.setter
+    def tracker(self, tracker: Optional[CardTracker]) -> None:
+        self._tracker = tracker
+
+    @property
+    def recorder(self) -> Optional[LatencyRecorder]:
+        """Optional[LatencyRecorder]: The latency recorder the engine was given, Model.play records its phases in
+        it. None if the engine was not given one.
+        """
+        return self._recorder
+
+    @recorder.setter
+    def recorder(self, recorder: Optional[LatencyRecorder]) -> None:
+        self._recorder = recorder
+
     @model_validator(mode="after")
     def check_not_both_butifarra_and_triumph_attributes_are_Set_to_not_none_or_false_values(
         self,
@@ -248,10 +293,11 @@ class PlayInput(BaseModel):
         Returns:
             int: The initial player of the baza.
         """
+        called = self.player_c if not self.delegated else (self.player_c + 2) % 4
         if len(self.history) == 0:
-            return (self.player_c + 1) % 4
+            return (called + 1) % 4
         else:
-            initial_player = (self.player_c + 1) % 4
+            initial_player = (called + 1) % 4
             for baza in self.history:
                 win_i = 0
                 win_c = baza.cards[0]
@@ -281,6 +327,26 @@ class PlayInput(BaseModel):
 
             return initial_player
 
+    def playable_cards(self) -> List[Card]:
+        """Return the cards of the card set that can be legally played in the current baza, following the forced suit,
+        forced triumph and (on OBLIGADA) forced lowest card rules.
+
+        Returns:
+            List[Card]: The playable cards, in the order of the card set.
+        """
+        cards = self.card_set.cards
+        if len(cards) == 1 or len(self.cards) == 0:
+            return list(cards)
+
+        hand = [c.to_id() for c in cards]
+        legal = playable(
+            hand,
+            [c.to_id() for c in self.cards],
+            None if self.butifarra else suit_index(self.triumph),
+            self.game_variant == OBLIGADA,
+        )
+        return [cards[hand.index(c)] for c in legal]
+
 
 class PlayOutput(BaseModel):
     """The output of the play function. This contains the played card and wether it was forced or not.
@@ -291,5 +357,7 @@ class PlayOutput(BaseModel):
         forced (bool): Wether the play was forced.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     card: Card
     forced: bool = False
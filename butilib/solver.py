@@ -0,0 +1,526 @@
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from .card import Card, CardSet
+from .rules import suit_index
+from .suit import Suit
+from .variants import OBLIGADA, GameVariant
+from .zobrist import TranspositionTable, ZobristHash
+
+if TYPE_CHECKING:
+    from .tablebase import Tablebase
+
+# The solver works on card positions: 12 * suit index + strength rank inside the suit, so that the cards of a suit
+# that beat a given card are the bits above it.
+_RANK = {2: 0, 3: 1, 4: 2, 5: 3, 6: 4, 7: 5, 8: 6, 10: 7, 11: 8, 12: 9, 1: 10, 9: 11}
+_NUMBER = {r: n for n, r in _RANK.items()}
+_RANK_POINTS = (0, 0, 0, 0, 0, 0, 0, 1, 2, 3, 4, 5)
+
+ID_TO_POS = tuple(i // 12 * 12 + _RANK[i % 12 + 1] for i in range(48))
+POS_TO_ID = tuple(p // 12 * 12 + _NUMBER[p % 12] - 1 for p in range(48))
+POS_POINTS = tuple(_RANK_POINTS[p % 12] for p in range(48))
+SUIT_MASK = tuple(0xFFF << (12 * s) for s in range(4))
+_SUIT_LOW_MASK = tuple(0x7F << (12 * s) for s in range(4))
+_LOW_MASK = sum(_SUIT_LOW_MASK)
+_SUIT_POINTS = tuple(
+    sum(_RANK_POINTS[r] for r in range(12) if m >> r & 1) for m in range(4096)
+)
+
+# The card positions of the same suit that beat a card position.
+_ABOVE = tuple(SUIT_MASK[p // 12] & ~((2 << p) - 1) for p in range(48))
+
+# Move ordering: lead high cards first, discard cards without points when the baza is lost and give points to
+# the partner when it is winning.
+_LEAD_ORDER = tuple(-(p % 12) for p in range(48))
+_SAVE_ORDER = tuple(POS_POINTS[p] * 16 + p % 12 for p in range(48))
+_DISCARD_ORDER = tuple(-POS_POINTS[p] * 16 + p % 12 for p in range(48))
+
+
+def mask_points(mask: int) -> int:
+    """Return the points of the cards in a mask of card positions.
+
+    Args:
+        mask (int): The mask of card positions.
+
+    Returns:
+        int: The points of the cards.
+    """
+    return (
+        _SUIT_POINTS[mask & 0xFFF]
+        + _SUIT_POINTS[mask >> 12 & 0xFFF]
+        + _SUIT_POINTS[mask >> 24 & 0xFFF]
+        + _SUIT_POINTS[mask >> 36 & 0xFFF]
+    )
+
+
+def _pack(mask: int, bits: int) -> int:
+    # The bits selected by a 7 bit mask, packed to the bottom.
+    out = 0
+    j = 0
+    for i in range(7):
+        if mask >> i & 1:
+            out |= (bits >> i & 1) << j
+            j += 1
+    return out
+
+
+def _lowest_equivalent(own: int, others: int) -> int:
+    # The lowest of every run of cards of a 7 bit mask with no card of others between them.
+    out = 0
+    prev = -1
+    for i in range(7):
+        if own >> i & 1:
+            if prev < 0 or others & ((1 << i) - (2 << prev)):
+                out |= 1 << i
+            prev = i
+    return out
+
+
+# Lookup tables over the cards without points of a suit, indexed by two 7 bit masks: the first one shifted by 7.
+_PACK = tuple(_pack(i >> 7, i & 0x7F) for i in range(1 << 14))
+_LOWEST_EQUIVALENT = tuple(_lowest_equivalent(i >> 7, i & 0x7F) for i in range(1 << 14))
+
+
+def _positions(mask: int) -> List[int]:
+    # The card positions of a mask, in increasing order.
+    positions = []
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+        positions.append(bit.bit_length() - 1)
+    return positions
+
+
+def compress(hands: Sequence[int], remaining: int) -> Tuple[int, int, int, int]:
+    """Renumber the cards without points from the bottom of their suit, keeping their order. Cards without points
+    only matter by their order among the remaining cards, so positions that only differ in them have the same value.
+
+    Args:
+        hands (Sequence[int]): The masks of card positions of the four players.
+        remaining (int): The mask of all the card positions in the hands.
+
+    Returns:
+        Tuple[int, int, int, int]: The masks of the renumbered card positions of the four players.
+    """
+    low = remaining & _LOW_MASK
+    if (low >> 1) & _LOW_MASK & ~low == 0:  # already at the bottom of their suits
+        return hands[0], hands[1], hands[2], hands[3]
+    h0, h1, h2, h3 = hands
+    k0 = h0 & ~_LOW_MASK
+    k1 = h1 & ~_LOW_MASK
+    k2 = h2 & ~_LOW_MASK
+    k3 = h3 & ~_LOW_MASK
+    for s in (0, 12, 24, 36):
+        r = (low >> s & 0x7F) << 7
+        if r:
+            k0 |= _PACK[r | h0 >> s & 0x7F] << s
+            k1 |= _PACK[r | h1 >> s & 0x7F] << s
+            k2 |= _PACK[r | h2 >> s & 0x7F] << s
+            k3 |= _PACK[r | h3 >> s & 0x7F] << s
+    return k0, k1, k2, k3
+
+
+def baza_winner(baza: Sequence[int], triumph: Optional[int]) -> int:
+    """Return the position in the baza of the winning card, the baza is given as card positions.
+
+    Args:
+        baza (Sequence[int]): The card positions played, in order.
+        triumph (Optional[int]): The triumph suit index, None if butifarra.
+
+    Returns:
+        int: The position in the baza of the winning card.
+    """
+    lead = baza[0] // 12
+    win_i = 0
+    win = baza[0]
+    for i in range(1, len(baza)):
+        p = baza[i]
+        s = p // 12
+        w = win // 12
+        if s == w:
+            if p > win:
+                win_i, win = i, p
+        elif s == triumph:
+            win_i, win = i, p
+    return win_i
+
+
+def legal_mask(
+    hand: int, baza: Sequence[int], triumph: Optional[int], obligada: bool
+) -> int:
+    """Return the mask of the playable card positions of a hand, following the rules of PlayInput.playable_cards.
+
+    Args:
+        hand (int): The mask of card positions of the player.
+        baza (Sequence[int]): The card positions already played in the current baza.
+        triumph (Optional[int]): The triumph suit index, None if butifarra.
+        obligada (bool): Wether the game variant is OBLIGADA.
+
+    Returns:
+        int: The mask of playable card positions.
+    """
+    if not baza or hand & (hand - 1) == 0:
+        return hand
+
+    lead = baza[0] // 12
+    follow = hand & SUIT_MASK[lead]
+    if follow and follow & (follow - 1) == 0:
+        return follow
+
+    win_i = baza_winner(baza, triumph)
+    win = baza[win_i]
+    enemy_winning = (len(baza) - win_i) % 2 != 0
+
+    if follow:
+        if not enemy_winning:
+            return follow
+        higher = follow & ~((2 << win) - 1) if win // 12 == lead else 0
+        if higher:
+            return higher
+        if obligada:
+            return follow & -follow
+        return follow
+
+    if enemy_winning and triumph is not None:
+        trumps = hand & SUIT_MASK[triumph]
+        if trumps:
+            higher = trumps & ~((2 << win) - 1) if win // 12 == triumph else trumps
+            return higher or trumps
+
+    return hand
+
+
+class Solver:
+    """A double dummy (perfect information) solver. It runs null window alpha-beta searches (MTD(f)) over the cards
+    played, with a transposition table of the positions at the start of every baza, equivalent card pruning (cards
+    without points of the same hand and suit with no other remaining card between them), cheap winning cards tried
+    first and the bazas the highest trumps surely win as bounds. The transposition table is kept between calls with
+    the same triumph and game variant.
+
+    The search time grows about sevenfold per baza: endgames of up to 7 cards per player are solved in under a
+    second, while full deals can take minutes.
+
+    Args:
+        triumph (Optional[Suit]): The triumph suit, None if butifarra.
+        game_variant (GameVariant): The game variant.
+        table (Optional[TranspositionTable], optional): A fixed size table to bound the memory of long runs, keyed
+            by the Zobrist hash of the positions (see ZobristHash, updated as the search plays and takes back every
+            card) and replaced by depth (cards remaining). Defaults to an unbounded dict keyed by the positions.
+        tablebase (Optional[Tablebase], optional): An endgame table (see butilib.tablebase) looked up at the start
+            of the bazas with its number of cards per player left, instead of searching them. Defaults to None.
+
+    Raises:
+        ValueError: If the tablebase was built for another game variant.
+    """
+
+    def __init__(
+        self,
+        triumph: Optional[Suit],
+        game_variant: GameVariant,
+        table: Optional[TranspositionTable] = None,
+        tablebase: Optional["Tablebase"] = None,
+    ):
+        self.triumph = suit_index(triumph)
+        self.obligada = game_variant == OBLIGADA
+        if tablebase is not None and tablebase.obligada != self.obligada:
+            raise ValueError("The tablebase was built for another game variant.")
+        self.table: Dict[Tuple[int, int, int, int, int], Tuple[int, int]] = {}
+        self.fixed_table = table
+        self.tablebase = tablebase
+        self._zobrist: Optional[ZobristHash] = None
+        self._tablebase_cards = -1 if tablebase is None else 4 * tablebase.k
+        self.nodes = 0
+        trumps = 0 if self.triumph is None else SUIT_MASK[self.triumph]
+        self._trumps = trumps
+        self._beats = tuple(
+            _ABOVE[w] | (0 if w // 12 == self.triumph else trumps) for w in range(48)
+        )
+
+    def solve_positions(
+        self,
+        hands: Sequence[int],
+        leader: int,
+        baza: Sequence[int] = (),
+    ) -> int:
+        """Return the points team 0 (players 0 and 2) takes in the rest of the hand under optimal play.
+
+        Args:
+            hands (Sequence[int]): The masks of card positions of the four players.
+            leader (int): The initial player of the current baza.
+            baza (Sequence[int], optional): The card positions already played in the current baza. Defaults to ().
+
+        Returns:
+            int: The points of team 0.
+        """
+        remaining = 0
+        for h in hands:
+            remaining |= h
+        total = mask_points(remaining) + sum(POS_POINTS[p] for p in baza)
+        total += (remaining.bit_count() + len(baza)) // 4
+
+        if self.fixed_table is not None:
+            # The ZobristHash keys are indexed by card, positions are used as card numbers. The values of the
+            # search do not depend on the points taken so far, so they are left out of the hash.
+            self._zobrist = ZobristHash(
+                [[p for p in range(48) if h >> p & 1] for h in hands], leader, baza
+            )
+
+        lower, upper = 0, total
+        guess = total // 2
+        while lower < upper:
+            beta = guess + 1 if guess == lower else guess
+            hs = list(hands)
+            if baza:
+                win_i = baza_winner(baza, self.triumph)
+                played = 0
+                for p in baza:
+                    played |= 1 << p
+                guess = self._play(
+                    hs,
+                    leader,
+                    len(baza),
+                    played,
+                    sum(POS_POINTS[p] for p in baza),
+                    baza[0] // 12,
+                    win_i,
+                    baza[win_i],
+                    beta - 1,
+                    beta,
+                )
+            else:
+                guess = self._search(hs, leader, beta - 1, beta)
+            if guess < beta:
+                upper = guess
+            else:
+                lower = guess
+        return lower
+
+    def _search(self, hands: List[int], leader: int, alpha: int, beta: int) -> int:
+        h0, h1, h2, h3 = hands
+        if h0 & (h0 - 1) == 0:
+            if h0 == 0:
+                return 0
+            last = [hands[(leader + i) % 4].bit_length() - 1 for i in range(4)]
+            winner = (leader + baza_winner(last, self.triumph)) % 4
+            return 1 + sum(POS_POINTS[c] for c in last) if winner % 2 == 0 else 0
+
+        remaining = h0 | h1 | h2 | h3
+        if remaining.bit_count() == self._tablebase_cards:
+            value = self.tablebase.lookup_positions(hands, leader, self.triumph)
+            if value is not None:
+                return value
+
+        total = mask_points(remaining) + remaining.bit_count() // 4
+        if total <= alpha:
+            return total
+        if beta <= 0:
+            return 0
+        # The team with the highest remaining trumps wins every baza where it plays one of them (up to two per
+        # baza), with their points.
+        if self.triumph is not None:
+            shift = 12 * self.triumph
+            ours = (h0 | h2) >> shift & 0xFFF
+            theirs = (h1 | h3) >> shift & 0xFFF
+            if ours > theirs:
+                top = ours & ~((1 << theirs.bit_length()) - 1)
+                sure = _SUIT_POINTS[top] + (top.bit_count() + 1) // 2
+                if sure >= beta:
+                    return sure
+            elif theirs:
+                top = theirs & ~((1 << ours.bit_length()) - 1)
+                sure = total - _SUIT_POINTS[top] - (top.bit_count() + 1) // 2
+                if sure <= alpha:
+                    return sure
+
+        if self.fixed_table is None:
+            key = self._key(hands, leader, remaining)
+            entry = self.table.get(key)
+        else:
+            key = self._zobrist.value
+            entry = self.fixed_table.get(key)
+        if entry is not None:
+            lower, upper = entry
+            if lower >= beta or lower == upper:
+                return lower
+            if upper <= alpha:
+                return upper
+        else:
+            lower, upper = 0, total
+
+        value = self._play(hands, leader, 0, 0, 0, 0, 0, -1, alpha, beta)
+
+        if value <= alpha:
+            upper = min(upper, value)
+        elif value >= beta:
+            lower = max(lower, value)
+        else:
+            lower = upper = value
+        if self.fixed_table is None:
+            self.table[key] = (lower, upper)
+        else:
+            self.fixed_table.store(key, (lower, upper), remaining.bit_count())
+        return value
+
+    def _key(
+        self, hands: List[int], leader: int, remaining: int
+    ) -> Tuple[int, int, int, int, int]:
+        h0, h1, h2, h3 = compress(hands, remaining)
+        return h0, h1, h2, h3, leader
+
+    def _play(
+        self,
+        hands: List[int],
+        leader: int,
+        n: int,
+        played: int,
+        bpoints: int,
+        lead: int,
+        win_i: int,
+        win: int,
+        alpha: int,
+        beta: int,
+    ) -> int:
+        self.nodes += 1
+        player = (leader + n) % 4
+        hand = hands[player]
+        triumph = self.triumph
+
+        # The rules of legal_mask, with the winning card of the baza kept by the caller.
+        if n == 0:
+            legal = hand
+        else:
+            enemy_winning = (n - win_i) % 2 != 0
+            follow = hand & SUIT_MASK[lead]
+            if follow:
+                if not enemy_winning:
+                    legal = follow
+                else:
+                    higher = follow & _ABOVE[win] if win // 12 == lead else 0
+                    if higher:
+                        legal = higher
+                    elif self.obligada:
+                        legal = follow & -follow
+                    else:
+                        legal = follow
+            elif enemy_winning and hand & self._trumps:
+                trumps = hand & self._trumps
+                higher = trumps & _ABOVE[win] if win // 12 == triumph else trumps
+                legal = higher or trumps
+            else:
+                legal = hand
+
+        # Equivalent cards: cards without points of the same suit with no card of another player (or of the
+        # current baza) between them give the same result, only the lowest one is searched.
+        if legal & _LOW_MASK:
+            others = (hands[0] | hands[1] | hands[2] | hands[3]) ^ hand | played
+            for s in (0, 12, 24, 36):
+                own = legal >> s & 0x7F
+                if own & (own - 1):
+                    legal ^= (
+                        own ^ _LOWEST_EQUIVALENT[own << 7 | others >> s & 0x7F]
+                    ) << s
+
+        beats = self._beats
+        if n == 0:
+            moves = _positions(legal)
+            moves.sort(key=_LEAD_ORDER.__getitem__)
+        else:
+            winning = legal & beats[win]
+            moves = _positions(legal ^ winning)
+            if enemy_winning:
+                moves.sort(key=_SAVE_ORDER.__getitem__)
+                moves = _positions(winning) + moves
+            else:
+                moves.sort(key=_DISCARD_ORDER.__getitem__)
+                moves += _positions(winning)
+
+        zobrist = self._zobrist
+        maximizing = player % 2 == 0
+        best = -1 if maximizing else 1001
+        for p in moves:
+            bit = 1 << p
+            hands[player] = hand ^ bit
+            if zobrist is not None:
+                zobrist.play(p)
+
+            if n == 0:
+                p_win_i, p_win = 0, p
+            elif bit & beats[win]:
+                p_win_i, p_win = n, p
+            else:
+                p_win_i, p_win = win_i, win
+
+            if n == 3:
+                winner = (leader + p_win_i) % 4
+                points = 1 + bpoints + POS_POINTS[p]
+                if zobrist is not None:
+                    zobrist.collect(winner, 0)
+                if winner % 2 == 0:
+                    value = points + self._search(
+                        hands, winner, alpha - points, beta - points
+                    )
+                else:
+                    value = self._search(hands, winner, alpha, beta)
+                if zobrist is not None:
+                    zobrist.undo()
+            else:
+                value = self._play(
+                    hands,
+                    leader,
+                    n + 1,
+                    played | bit,
+                    bpoints + POS_POINTS[p],
+                    p // 12 if n == 0 else lead,
+                    p_win_i,
+                    p_win,
+                    alpha,
+                    beta,
+                )
+
+            hands[player] = hand
+            if zobrist is not None:
+                zobrist.undo()
+
+            if maximizing:
+                if value > best:
+                    best = value
+                    if best > alpha:
+                        alpha = best
+            elif value < best:
+                best = value
+                if best < beta:
+                    beta = best
+            if alpha >= beta:
+                break
+
+        return best
+
+
+def solve(
+    card_sets: Sequence[CardSet],
+    triumph: Optional[Suit],
+    game_variant: GameVariant,
+    leader: int,
+    cards: Sequence[Card] = (),
+) -> Tuple[int, int]:
+    """Solve a hand with all the cards known: return the points each team takes in the rest of the hand under optimal
+    play by everyone, see Solver for the search time.
+
+    Args:
+        card_sets (Sequence[CardSet]): The remaining cards of the four players.
+        triumph (Optional[Suit]): The triumph suit, None if butifarra.
+        game_variant (GameVariant): The game variant.
+        leader (int): The initial player of the current baza.
+        cards (Sequence[Card], optional): The cards already played in the current baza. Defaults to ().
+
+    Returns:
+        Tuple[int, int]: The points of team 0 (players 0 and 2) and team 1 (players 1 and 3).
+    """
+    hands = [sum(1 << ID_TO_POS[c.to_id()] for c in cs.cards) for cs in card_sets]
+    baza = [ID_TO_POS[c.to_id()] for c in cards]
+
+    total = (sum(len(cs) for cs in card_sets) + len(baza)) // 4
+    total += sum(c.points() for cs in card_sets for c in cs.cards)
+    total += sum(c.points() for c in cards)
+
+    value = Solver(triumph, game_variant).solve_positions(hands, leader, baza)
+    return value, total - value
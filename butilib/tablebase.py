@@ -0,0 +1,316 @@
+import mmap
+import os
+import random
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .record import GameRecord
+from .rules import SUITS, suit_index
+from .solver import ID_TO_POS, Solver, compress, mask_points
+from .variants import OBLIGADA, GameVariant
+
+MAGIC = b"BUTT"
+VERSION = 2
+HEADER = struct.Struct("<4sBBBxQQ")
+
+# A position: the card ids of every player, the initial player of the baza and the triumph suit (None if butifarra).
+Position = Tuple[Sequence[Sequence[int]], int, Optional[int]]
+
+_MIX = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+# The bit of the first mask of a canonical position set if the position has a triumph suit, above the 48 card
+# positions.
+TRIUMPH = 1 << 48
+
+
+def canonical_position(
+    hands: Sequence[int], leader: int, triumph: Optional[int]
+) -> Tuple[int, int, int, int]:
+    """Return the canonical form of a position at the start of a baza, given as masks of solver card positions (see
+    butilib.solver), which is the same for every position with the same value for the team of the initial player:
+    the cards without points are renumbered (see butilib.solver.compress), the triumph suit is relabelled to 0 and
+    the other suits are sorted, and the players are rotated so that the initial player is player 0. The positions
+    with a triumph suit set the TRIUMPH bit of the first mask.
+
+    Args:
+        hands (Sequence[int]): The masks of card positions of the four players.
+        leader (int): The initial player of the baza.
+        triumph (Optional[int]): The triumph suit index, None if butifarra.
+
+    Returns:
+        Tuple[int, int, int, int]: The masks of card positions of the four players in the canonical position.
+    """
+    remaining = hands[0] | hands[1] | hands[2] | hands[3]
+    hs = compress([hands[(leader + i) % 4] for i in range(4)], remaining)
+    suits = sorted(
+        range(4),
+        key=lambda s: (s == triumph,) + tuple(h >> (12 * s) & 0xFFF for h in hs),
+        reverse=True,
+    )
+    masks = [0, 0, 0, 0]
+    for t, s in enumerate(suits):
+        for i, h in enumerate(hs):
+            masks[i] |= (h >> (12 * s) & 0xFFF) << (12 * t)
+    if triumph is not None:
+        masks[0] |= TRIUMPH
+    return masks[0], masks[1], masks[2], masks[3]
+
+
+def position_key(hands: Sequence[int], leader: int, triumph: Optional[int]) -> int:
+    """Return the 64 bit key of a position at the start of a baza, given as masks of solver card positions (see
+    butilib.solver): a hash of its canonical position (see canonical_position). Different canonical positions may
+    share a key.
+
+    Args:
+        hands (Sequence[int]): The masks of card positions of the four players.
+        leader (int): The initial player of the baza.
+        triumph (Optional[int]): The triumph suit index, None if butifarra.
+
+    Returns:
+        int: The key of the position, never 0.
+    """
+    return _key(canonical_position(hands, leader, triumph))
+
+
+def _key(canonical: Tuple[int, int, int, int]) -> int:
+    key = 1
+    for m in canonical:
+        for shift in (0, 32):
+            key = ((key ^ (m >> shift & 0xFFFFFFFF)) * _MIX) & _MASK64
+            key ^= key >> 29
+    return key or 1
+
+
+def endgame_positions(records: Iterable[GameRecord], k: int) -> Iterator[Position]:
+    """Yield the positions of recorded hands at the start of the baza with k cards left per player.
+
+    Args:
+        records (Iterable[GameRecord]): The recorded hands.
+        k (int): The number of cards per player.
+
+    Yields:
+        Position: The cards of every player, the initial player and the triumph suit index.
+    """
+    b = 12 - k
+    for record in records:
+        hands: List[List[int]] = [[], [], [], []]
+        for i in range(b, 12):
+            for j in range(4):
+                hands[(record.leaders[i] + j) % 4].append(record.cards[i * 4 + j])
+        yield hands, record.leaders[b], suit_index(record.triumph)
+
+
+def random_endgames(
+    k: int, n: int, rng: Optional[random.Random] = None
+) -> Iterator[Position]:
+    """Yield random positions with k cards per player, half of them with a triumph suit and half butifarra.
+
+    Args:
+        k (int): The number of cards per player.
+        n (int): The number of positions.
+        rng (Optional[random.Random], optional): The random generator. Defaults to the random module.
+
+    Yields:
+        Position: The cards of every player, the initial player and the triumph suit index.
+    """
+    rng = rng or random
+    for i in range(n):
+        ids = rng.sample(range(48), 4 * k)
+        hands = [ids[j * k : (j + 1) * k] for j in range(4)]
+        yield hands, rng.randrange(4), None if i % 2 else rng.randrange(4)
+
+
+def build_tablebase(
+    file: Union[str, os.PathLike],
+    positions: Iterable[Position],
+    k: int,
+    game_variant: GameVariant,
+    load_factor: float = 0.5,
+) -> int:
+    """Solve endgame positions with k cards per player and write their values in an open addressing hash table
+    keyed by position_key, so positions with the same canonical position (see canonical_position) are solved once.
+
+    The file starts with a 24 byte header (magic, version, k, game variant, number of slots, number of positions),
+    followed by the 8 byte keys of every slot (0 if empty), the four 8 byte masks of the canonical position of every
+    slot, which lookups compare so that positions that only share the key are not mistaken for each other, and the
+    1 byte value of every slot: the points the team of the initial player takes.
+
+    Args:
+        file (Union[str, os.PathLike]): The path of the table.
+        positions (Iterable[Position]): The positions to solve, every player holding k cards.
+        k (int): The number of cards per player.
+        game_variant (GameVariant): The game variant.
+        load_factor (float, optional): The maximum fraction of used slots. Defaults to 0.5.
+
+    Raises:
+        ValueError: If a position does not have k cards per player.
+
+    Returns:
+        int: The number of positions in the table.
+    """
+    solvers = {
+        t: Solver(None if t is None else SUITS[t], game_variant) for t in (None, 0)
+    }
+    values: Dict[Tuple[int, int, int, int], int] = {}
+    for hands, leader, triumph in positions:
+        if any(len(h) != k for h in hands):
+            raise ValueError(f"Every player must hold {k} cards.")
+        masks = [sum(1 << ID_TO_POS[c] for c in h) for h in hands]
+        canonical = canonical_position(masks, leader, triumph)
+        if canonical in values:
+            continue
+        t = None if triumph is None else 0
+        hs = [canonical[0] & ~TRIUMPH, canonical[1], canonical[2], canonical[3]]
+        values[canonical] = solvers[t].solve_positions(hs, 0)
+
+    size = 1
+    while size * load_factor < len(values):
+        size *= 2
+    keys = array("Q", bytes(8 * size))
+    slots = array("Q", bytes(32 * size))
+    table = bytearray(size)
+    for canonical, value in values.items():
+        key = _key(canonical)
+        i = key & (size - 1)
+        while keys[i]:
+            i = (i + 1) & (size - 1)
+        keys[i] = key
+        slots[4 * i : 4 * i + 4] = array("Q", canonical)
+        table[i] = value
+    if sys.byteorder != "little":
+        keys.byteswap()
+        slots.byteswap()
+
+    with open(file, "wb") as f:
+        f.write(
+            HEADER.pack(MAGIC, VERSION, k, game_variant == OBLIGADA, size, len(values))
+        )
+        f.write(keys.tobytes())
+        f.write(slots.tobytes())
+        f.write(table)
+    return len(values)
+
+
+class Tablebase:
+    """An endgame table written by build_tablebase, memory mapped: lookups read a few slots of the file and the
+    operating system shares its pages between processes.
+
+    Args:
+        file (Union[str, os.PathLike]): The path of the table.
+
+    Raises:
+        ValueError: If the file is not a butilib tablebase or it is truncated.
+
+    Attributes:
+        k (int): The number of cards per player of the positions.
+        obligada (bool): Wether the positions were solved for OBLIGADA.
+        hits (int): The number of lookups found.
+        misses (int): The number of lookups not found.
+    """
+
+    def __init__(self, file: Union[str, os.PathLike]):
+        with open(file, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < HEADER.size:
+            raise ValueError("The file is not a butilib tablebase.")
+        magic, version, self.k, obligada, self.size, self.count = HEADER.unpack_from(
+            self._mmap
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("The file is not a butilib tablebase.")
+        if len(self._mmap) != HEADER.size + 41 * self.size:
+            raise ValueError("The tablebase is truncated.")
+        self.obligada = bool(obligada)
+
+        self._view = memoryview(self._mmap)
+        self._keys_view = self._view[HEADER.size : HEADER.size + 8 * self.size]
+        self._slots_view = self._view[
+            HEADER.size + 8 * self.size : HEADER.size + 40 * self.size
+        ]
+        if sys.byteorder == "little":
+            self._keys: Sequence[int] = self._keys_view.cast("Q")
+            self._slots: Sequence[int] = self._slots_view.cast("Q")
+        else:
+            self._keys = array("Q", self._keys_view)
+            self._keys.byteswap()
+            self._slots = array("Q", self._slots_view)
+            self._slots.byteswap()
+        self._values = self._view[HEADER.size + 40 * self.size :]
+        self._mask = self.size - 1
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def lookup_positions(
+        self, hands: Sequence[int], leader: int, triumph: Optional[int]
+    ) -> Optional[int]:
+        """Return the points team 0 (players 0 and 2) takes under optimal play from a position at the start of a
+        baza, given as masks of solver card positions, or None if the position is not in the table.
+
+        Args:
+            hands (Sequence[int]): The masks of card positions of the four players.
+            leader (int): The initial player of the baza.
+            triumph (Optional[int]): The triumph suit index, None if butifarra.
+
+        Returns:
+            Optional[int]: The points of team 0.
+        """
+        canonical = canonical_position(hands, leader, triumph)
+        key = _key(canonical)
+        keys = self._keys
+        slots = self._slots
+        i = key & self._mask
+        while True:
+            k = keys[i]
+            if k == key and tuple(slots[4 * i : 4 * i + 4]) == canonical:
+                break
+            if k == 0:
+                self.misses += 1
+                return None
+            i = (i + 1) & self._mask
+        self.hits += 1
+
+        value = self._values[i]
+        if leader % 2 == 0:
+            return value
+        remaining = hands[0] | hands[1] | hands[2] | hands[3]
+        return mask_points(remaining) + remaining.bit_count() // 4 - value
+
+    def lookup(
+        self, hands: Sequence[Sequence[int]], leader: int, triumph: Optional[int]
+    ) -> Optional[int]:
+        """Return the points team 0 (players 0 and 2) takes under optimal play from a position at the start of a
+        baza, given as card ids, or None if the position is not in the table.
+
+        Args:
+            hands (Sequence[Sequence[int]]): The card ids of the four players.
+            leader (int): The initial player of the baza.
+            triumph (Optional[int]): The triumph suit index, None if butifarra.
+
+        Returns:
+            Optional[int]: The points of team 0.
+        """
+        masks = [sum(1 << ID_TO_POS[c] for c in h) for h in hands]
+        return self.lookup_positions(masks, leader, triumph)
+
+    def close(self) -> None:
+        """Release the memory map."""
+        for view in (self._keys, self._slots):
+            if isinstance(view, memoryview):
+                view.release()
+        self._keys = self._slots = ()
+        for view in (self._values, self._keys_view, self._slots_view, self._view):
+            view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "Tablebase":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,188 @@
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+from .rules import STRENGTH, baza_points, suit_index, value, winner
+from .suit import Suit
+from .variants import OBLIGADA, GameVariant
+
+if TYPE_CHECKING:
+    from .schema import PlayInput
+
+SUIT_MASK = tuple(0xFFF << (12 * s) for s in range(4))
+FULL_MASK = (1 << 48) - 1
+
+
+def excluded_cards(
+    cards: Sequence[int], card: int, triumph: Optional[int], obligada: bool
+) -> int:
+    """Return the mask of card ids the player that played a card cannot hold after it, as revealed by the rules:
+    failing to follow the lead suit, failing to trump (or to beat with a triumph) when the enemy wins the baza,
+    failing to beat the winning card with the lead suit and, on OBLIGADA, not playing the lowest card of the lead
+    suit when it cannot win.
+
+    Args:
+        cards (Sequence[int]): The cards played in the baza before the card.
+        card (int): The card played.
+        triumph (Optional[int]): The triumph suit, None if butifarra.
+        obligada (bool): Wether the game variant is OBLIGADA.
+
+    Returns:
+        int: The mask of excluded card ids.
+    """
+    if len(cards) == 0:
+        return 0
+
+    lead = cards[0] // 12
+    win_i = winner(cards, triumph)
+    win_v = value(cards[win_i], lead, triumph)
+    enemy_winning = (len(cards) - win_i) % 2 != 0
+    suit = card // 12
+
+    excluded = 0
+    if suit != lead:
+        excluded |= SUIT_MASK[lead]
+        if enemy_winning and triumph is not None:
+            if suit != triumph:
+                excluded |= SUIT_MASK[triumph]
+            elif value(card, lead, triumph) <= win_v:
+                excluded |= _beating(triumph, lead, triumph, win_v)
+    elif enemy_winning and value(card, lead, triumph) <= win_v:
+        excluded |= _beating(lead, lead, triumph, win_v)
+        if obligada:
+            for c in range(lead * 12, lead * 12 + 12):
+                if STRENGTH[c] < STRENGTH[card]:
+                    excluded |= 1 << c
+    return excluded & ~(1 << card)
+
+
+def _beating(suit: int, lead: int, triumph: Optional[int], win_v: int) -> int:
+    mask = 0
+    for c in range(suit * 12, suit * 12 + 12):
+        if value(c, lead, triumph) > win_v:
+            mask |= 1 << c
+    return mask
+
+
+class CardTracker:
+    """The public knowledge of a hand, updated once per card played: the cards played, the cards every player may
+    still hold (see excluded_cards) and the number of cards they hold. Cards are given as ids (see Card.to_id) and
+    sets of cards as masks (bit id set). The engine keeps one per hand and hands it to the models with every
+    PlayInput (see PlayInput.tracker).
+
+    Args:
+        triumph (Optional[Suit]): The triumph suit, None if butifarra.
+        game_variant (GameVariant): The game variant.
+        leader (int): The initial player of the first baza.
+    """
+
+    def __init__(self, triumph: Optional[Suit], game_variant: GameVariant, leader: int):
+        self.triumph = suit_index(triumph)
+        self.obligada = game_variant == OBLIGADA
+        self.leader = leader
+        self.baza: List[int] = []
+        self.played = 0
+        self.points = [0, 0]
+        self.counts = [12, 12, 12, 12]
+        self._possible = [FULL_MASK, FULL_MASK, FULL_MASK, FULL_MASK]
+
+    @classmethod
+    def from_play_input(cls, input: "PlayInput") -> "CardTracker":
+        """Build the tracker of the hand of a PlayInput by replaying its history and current baza.
+
+        Args:
+            input (PlayInput): The input of a player.
+
+        Returns:
+            CardTracker: The tracker.
+        """
+        called = input.player_c if not input.delegated else (input.player_c + 2) % 4
+        tracker = cls(
+            None if input.butifarra else input.triumph,
+            input.game_variant,
+            (called + 1) % 4,
+        )
+        for b in input.history:
+            for c in b.cards:
+                tracker.play(c.to_id())
+        for c in input.cards:
+            tracker.play(c.to_id())
+        return tracker
+
+    @property
+    def player(self) -> int:
+        """int: The player to play next."""
+        return (self.leader + len(self.baza)) % 4
+
+    def play(self, card: int) -> None:
+        """Update the tracker with the next card played.
+
+        Args:
+            card (int): The card played.
+        """
+        seat = (self.leader + len(self.baza)) % 4
+        bit = 1 << card
+        excluded = excluded_cards(self.baza, card, self.triumph, self.obligada)
+        possible = self._possible
+        possible[seat] &= ~excluded
+        for s in range(4):
+            possible[s] &= ~bit
+        self.played |= bit
+        self.counts[seat] -= 1
+
+        self.baza.append(card)
+        if len(self.baza) == 4:
+            win = (self.leader + winner(self.baza, self.triumph)) % 4
+            self.points[win % 2] += baza_points(self.baza)
+            self.leader = win
+            self.baza = []
+
+    def possible(self, seat: int) -> int:
+        """Return the mask of cards a player may hold.
+
+        Args:
+            seat (int): The player number.
+
+        Returns:
+            int: The mask of card ids.
+        """
+        return self._possible[seat]
+
+    def void(self, seat: int, suit: int) -> bool:
+        """Return wether a player cannot hold any card of a suit.
+
+        Args:
+            seat (int): The player number.
+            suit (int): The suit index.
+
+        Returns:
+            bool: Wether the player is void in the suit.
+        """
+        return self._possible[seat] & SUIT_MASK[suit] == 0
+
+    def voids(self, seat: int) -> int:
+        """Return the suits a player is void in, as a mask of suit indices.
+
+        Args:
+            seat (int): The player number.
+
+        Returns:
+            int: The mask of suit indices.
+        """
+        possible = self._possible[seat]
+        return sum(1 << s for s in range(4) if possible & SUIT_MASK[s] == 0)
+
+    def copy(self) -> "CardTracker":
+        """Return an independent copy of the tracker.
+
+        Returns:
+            CardTracker: The copy.
+        """
+        other = object.__new__(CardTracker)
+        other.triumph = self.triumph
+        other.obligada = self.obligada
+        other.leader = self.leader
+        other.baza = list(self.baza)
+        other.played = self.played
+        other.points = list(self.points)
+        other.counts = list(self.counts)
+        other._possible = list(self._possible)
+        return other
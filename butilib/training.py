@@ -0,0 +1,141 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from .archive import archive_length, read_archive
+from .record import GameRecord
+from .rules import playable, suit_index
+from .variants import OBLIGADA
+
+
+def _unpack(bits: List[int]) -> np.ndarray:
+    array = np.array(bits, dtype="<u8").view(np.uint8).reshape(-1, 8)
+    return np.unpackbits(array, axis=1, bitorder="little")[:, :48].astype(bool)
+
+
+def decision_arrays(records: Iterable[GameRecord]) -> Dict[str, np.ndarray]:
+    """Convert recorded hands to fixed shape arrays with a row per decision (48 per hand):
+        hand          ->   (n, 48) bool, the cards of the player
+        played        ->   (n, 48) bool, the cards played in the previous bazas
+        baza          ->   (n, 3) int8, the cards already played in the current baza, -1 padded
+        trump         ->   (n,) int8, the triumph suit index, -1 if butifarra
+        contrada      ->   (n,) uint8, the contrada level
+        seat          ->   (n,) uint8, the player number
+        game_variant  ->   (n,) uint8, 1 if OBLIGADA
+        legal         ->   (n, 48) bool, the playable cards
+        action        ->   (n,) uint8, the card played
+
+    Args:
+        records (Iterable[GameRecord]): The recorded hands.
+
+    Raises:
+        ValueError: If a recorded card was not playable, see butilib.replay.verify_games to find those hands.
+
+    Returns:
+        Dict[str, np.ndarray]: The arrays, by name.
+    """
+    hand_bits, played_bits, legal_bits = [], [], []
+    baza, trump, contrada, seat, variant, action = [], [], [], [], [], []
+
+    for record in records:
+        t = suit_index(record.triumph)
+        obligada = record.game_variant == OBLIGADA
+        cards = record.cards
+        leaders = record.leaders
+
+        hands = [[], [], [], []]
+        for i in range(48):
+            hands[(leaders[i // 4] + i % 4) % 4].append(cards[i])
+        masks = [sum(1 << c for c in h) for h in hands]
+
+        played = 0
+        for i in range(12):
+            current = cards[4 * i : 4 * i + 4]
+            for j in range(4):
+                s = (leaders[i] + j) % 4
+                card = current[j]
+                legal = playable(hands[s], current[:j], t, obligada)
+                if card not in legal:
+                    raise ValueError(f"Illegal card {card} in a recorded hand.")
+
+                hand_bits.append(masks[s])
+                played_bits.append(played)
+                legal_bits.append(sum(1 << c for c in legal))
+                baza.append(current[:j] + (-1,) * (3 - j))
+                seat.append(s)
+                action.append(card)
+
+                hands[s].remove(card)
+                masks[s] ^= 1 << card
+            played |= sum(1 << c for c in current)
+
+        trump += [-1 if t is None else t] * 48
+        contrada += [record.contrada.value] * 48
+        variant += [obligada] * 48
+
+    return {
+        "hand": _unpack(hand_bits),
+        "played": _unpack(played_bits),
+        "baza": np.array(baza, dtype=np.int8).reshape(-1, 3),
+        "trump": np.array(trump, dtype=np.int8),
+        "contrada": np.array(contrada, dtype=np.uint8),
+        "seat": np.array(seat, dtype=np.uint8),
+        "game_variant": np.array(variant, dtype=np.uint8),
+        "legal": _unpack(legal_bits),
+        "action": np.array(action, dtype=np.uint8),
+    }
+
+
+def _build_shard(source: str, start: int, stop: int, path: str) -> str:
+    np.savez(path, **decision_arrays(read_archive(source, start=start, stop=stop)))
+    return path
+
+
+def _shards(
+    sources: Sequence[str], out_dir: str, hands_per_shard: int
+) -> List[Tuple[str, int, int, str]]:
+    # The source, record range and path of every shard. Paths are prefixed with the index of the source, so that
+    # archives with the same name in different directories do not overwrite each other's shards.
+    shards = []
+    for i, source in enumerate(sources):
+        name = os.path.splitext(os.path.basename(source))[0]
+        length = archive_length(source)
+        for k, start in enumerate(range(0, length, hands_per_shard)):
+            path = os.path.join(out_dir, f"{i:04d}-{name}-{k:05d}.npz")
+            shards.append((source, start, min(start + hands_per_shard, length), path))
+    return shards
+
+
+def build_training_shards(
+    sources: Sequence[str],
+    out_dir: str,
+    hands_per_shard: int = 10000,
+    processes: int = 1,
+) -> List[str]:
+    """Build sharded .npz training files from archives of recorded hands (see butilib.archive), with the arrays of
+    decision_arrays. Every archive is split in ranges of hands_per_shard records, a shard per range named after the
+    index and the name of the archive (e.g. 0001-games-00002.npz). Shards are built in parallel when using more than
+    one process, so a single large archive is spread over all of them.
+
+    Args:
+        sources (Sequence[str]): The paths of the archives.
+        out_dir (str): The directory where the shards are written, it is created if needed.
+        hands_per_shard (int, optional): The number of hands in each shard (48 rows per hand). Defaults to 10000.
+        processes (int, optional): The number of worker processes, 1 to build in the current process. Defaults to 1.
+
+    Raises:
+        ValueError: If a source is not a butilib archive or it is truncated.
+
+    Returns:
+        List[str]: The paths of the shards, in the order of the sources.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    shards = _shards(sources, out_dir, hands_per_shard)
+
+    if processes == 1 or not shards:
+        return [_build_shard(*shard) for shard in shards]
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(_build_shard, *zip(*shards)))
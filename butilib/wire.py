@@ -0,0 +1,220 @@
+from typing import List, Union
+
+from pydantic import Field, TypeAdapter
+from typing_extensions import Annotated, TypedDict
+
+from .baza import Baza, History
+from .card import Card, CardSet
+from .contrada import Contrada
+from .rules import SUITS, suit_index
+from .schema import PlayInput, PlayOutput
+from .variants import LIBRE, OBLIGADA
+
+CardId = Annotated[int, Field(ge=0, le=47)]
+Seat = Annotated[int, Field(ge=0, le=3)]
+
+
+class PlayInputWire(TypedDict):
+    """The compact wire schema of a PlayInput, cards are sent as ids (see Card.to_id).
+
+    Attributes:
+        h (List[int]): The history as a flat list, 5 ints per baza: initial player and the 4 card ids. Every int is
+            between 0 and 47, the initial players are checked by the PlayInput validators.
+        s (List[int]): The card set.
+        t (int): The triumph suit index, -1 if butifarra.
+        p (int): The player number.
+        c (List[int]): The cards played in the current baza.
+        k (int): The contrada level.
+        pc (int): The player that called triumph.
+        d (bool): Wether the call was delegated.
+        v (int): The game variant, 0 for LIBRE and 1 for OBLIGADA.
+    """
+
+    h: List[CardId]
+    s: List[CardId]
+    t: Annotated[int, Field(ge=-1, le=3)]
+    p: Seat
+    c: List[CardId]
+    k: Annotated[int, Field(ge=0, le=3)]
+    pc: Seat
+    d: bool
+    v: Annotated[int, Field(ge=0, le=1)]
+
+
+class PlayOutputWire(TypedDict):
+    """The compact wire schema of a PlayOutput.
+
+    Attributes:
+        c (int): The id of the card played.
+        f (bool): Wether the play was forced.
+    """
+
+    c: CardId
+    f: bool
+
+
+PLAY_INPUT_ADAPTER = TypeAdapter(PlayInputWire)
+PLAY_OUTPUT_ADAPTER = TypeAdapter(PlayOutputWire)
+
+
+_CARD_DICTS = tuple({"number": i % 12 + 1, "suit": SUITS[i // 12]} for i in range(48))
+_CARDS = tuple(
+    Card.model_construct(number=i % 12 + 1, suit=SUITS[i // 12]) for i in range(48)
+)
+
+
+def play_input_to_wire(input: PlayInput) -> PlayInputWire:
+    """Convert a PlayInput to its compact wire schema.
+
+    Args:
+        input (PlayInput): The input of the play function.
+
+    Returns:
+        PlayInputWire: The compact representation of the input.
+    """
+    h = []
+    for b in input.history.bazas:
+        h.append(b.initial_player)
+        h.extend(c.to_id() for c in b.cards)
+
+    return PlayInputWire(
+        h=h,
+        s=[c.to_id() for c in input.card_set.cards],
+        t=-1 if input.butifarra else suit_index(input.triumph),
+        p=input.player_number,
+        c=[c.to_id() for c in input.cards],
+        k=input.contrada.value,
+        pc=input.player_c,
+        d=input.delegated,
+        v=int(input.game_variant == OBLIGADA),
+    )
+
+
+def play_input_from_wire(wire: PlayInputWire, validate: bool = True) -> PlayInput:
+    """Convert the compact wire schema back to a PlayInput.
+
+    Args:
+        wire (PlayInputWire): The compact representation of the input.
+        validate (bool, optional): Wether to check the wire schema and run the PlayInput validators. Skip them only
+            for trusted peers, the cards of a non validated input are shared between inputs and must not be
+            modified. Defaults to True.
+
+    Raises:
+        pydantic.ValidationError: If validating and the input is not valid.
+
+    Returns:
+        PlayInput: The input of the play function.
+    """
+    if validate:
+        # Out of range ids would index the card tables from the end or past it.
+        wire = PLAY_INPUT_ADAPTER.validate_python(wire)
+    return _play_input(wire, validate)
+
+
+def _play_input(wire: PlayInputWire, validate: bool) -> PlayInput:
+    h = wire["h"]
+    triumph = None if wire["t"] == -1 else SUITS[wire["t"]]
+    game_variant = OBLIGADA if wire["v"] else LIBRE
+
+    if validate:
+        return PlayInput.model_validate(
+            {
+                "history": {
+                    "bazas": [
+                        {
+                            "initial_player": h[i],
+                            "cards": [_CARD_DICTS[c] for c in h[i + 1 : i + 5]],
+                        }
+                        for i in range(0, len(h), 5)
+                    ]
+                },
+                "card_set": {"cards": [_CARD_DICTS[c] for c in wire["s"]]},
+                "triumph": triumph,
+                "butifarra": triumph is None,
+                "player_number": wire["p"],
+                "cards": [_CARD_DICTS[c] for c in wire["c"]],
+                "contrada": Contrada(wire["k"]),
+                "player_c": wire["pc"],
+                "delegated": wire["d"],
+                "game_variant": game_variant,
+            }
+        )
+
+    return PlayInput.model_construct(
+        history=History.model_construct(
+            bazas=[
+                Baza.model_construct(
+                    initial_player=h[i], cards=[_CARDS[c] for c in h[i + 1 : i + 5]]
+                )
+                for i in range(0, len(h), 5)
+            ]
+        ),
+        card_set=CardSet.model_construct(cards=[_CARDS[c] for c in wire["s"]]),
+        triumph=triumph,
+        butifarra=triumph is None,
+        player_number=wire["p"],
+        cards=[_CARDS[c] for c in wire["c"]],
+        contrada=Contrada(wire["k"]),
+        player_c=wire["pc"],
+        delegated=wire["d"],
+        game_variant=game_variant,
+    )
+
+
+def dump_play_input(input: PlayInput) -> bytes:
+    """Serialize a PlayInput to compact JSON, see PlayInputWire.
+
+    Args:
+        input (PlayInput): The input of the play function.
+
+    Returns:
+        bytes: The JSON payload.
+    """
+    return PLAY_INPUT_ADAPTER.dump_json(play_input_to_wire(input))
+
+
+def load_play_input(data: Union[str, bytes], validate: bool = True) -> PlayInput:
+    """Parse a PlayInput serialized with dump_play_input.
+
+    Args:
+        data (Union[str, bytes]): The JSON payload.
+        validate (bool, optional): Wether to run the PlayInput validators, see play_input_from_wire.
+            Defaults to True.
+
+    Returns:
+        PlayInput: The input of the play function.
+    """
+    return _play_input(PLAY_INPUT_ADAPTER.validate_json(data), validate)
+
+
+def dump_play_output(output: PlayOutput) -> bytes:
+    """Serialize a PlayOutput to compact JSON, see PlayOutputWire.
+
+    Args:
+        output (PlayOutput): The output of the play function.
+
+    Returns:
+        bytes: The JSON payload.
+    """
+    return PLAY_OUTPUT_ADAPTER.dump_json(
+        PlayOutputWire(c=output.card.to_id(), f=output.forced)
+    )
+
+
+def load_play_output(data: Union[str, bytes], validate: bool = True) -> PlayOutput:
+    """Parse a PlayOutput serialized with dump_play_output.
+
+    Args:
+        data (Union[str, bytes]): The JSON payload.
+        validate (bool, optional): Wether to run the PlayOutput validators, the card of a non validated output is
+            shared between outputs and must not be modified. Defaults to True.
+
+    Returns:
+        PlayOutput: The output of the play function.
+    """
+    wire = PLAY_OUTPUT_ADAPTER.validate_json(data)
+    if validate:
+        return PlayOutput.model_validate(
+            {"card": _CARD_DICTS[wire["c"]], "forced": wire["f"]}
+        )
+    return PlayOutput.model_construct(card=_CARDS[wire["c"]], forced=wire["f"])
@@ -0,0 +1,194 @@
+import random
+from typing import Any, Iterable, List, Literal, Optional, Sequence, Tuple
+
+
+class ZobristKeys:
+    """The random 64 bit keys of a Zobrist hashing scheme for butifarra positions: a key per player and card in
+    their hand, per position in the baza and card played, per initial player of the baza and per points of team 0.
+
+    Args:
+        seed (int, optional): The seed of the random keys. Defaults to 0.
+    """
+
+    def __init__(self, seed: int = 0):
+        rng = random.Random(seed)
+        self.hand = [[rng.getrandbits(64) for _ in range(48)] for _ in range(4)]
+        self.baza = [[rng.getrandbits(64) for _ in range(48)] for _ in range(4)]
+        self.leader = [rng.getrandbits(64) for _ in range(4)]
+        self.points = [rng.getrandbits(64) for _ in range(73)]
+
+
+KEYS = ZobristKeys()
+
+
+class ZobristHash:
+    """The Zobrist hash of a position, updated with a few XORs for every card played: the cards remaining to every
+    player, the cards of the current baza, its initial player and the points of team 0 (players 0 and 2) so far.
+    Every update can be undone, so a search can follow its moves up and down the tree. Cards are given as ids (see
+    Card.to_id).
+
+    Args:
+        hands (Sequence[Iterable[int]]): The cards of the four players.
+        leader (int): The initial player of the current baza.
+        baza (Sequence[int], optional): The cards already played in the current baza. Defaults to ().
+        points (int, optional): The points of team 0 so far. Defaults to 0.
+        keys (Optional[ZobristKeys], optional): The keys to use. Defaults to the module keys.
+    """
+
+    def __init__(
+        self,
+        hands: Sequence[Iterable[int]],
+        leader: int,
+        baza: Sequence[int] = (),
+        points: int = 0,
+        keys: Optional[ZobristKeys] = None,
+    ):
+        self.keys = keys or KEYS
+        self.leader = leader
+        self.baza: List[int] = list(baza)
+        self.points = points
+        self._undo: List[Tuple[int, int, List[int]]] = []
+
+        value = self.keys.leader[leader] ^ self.keys.points[points]
+        for seat, hand in enumerate(hands):
+            for c in hand:
+                value ^= self.keys.hand[seat][c]
+        for i, c in enumerate(self.baza):
+            value ^= self.keys.baza[i][c]
+        self.value = value
+
+    def play(self, card: int) -> None:
+        """Move a card from the hand of the player to play to the current baza.
+
+        Args:
+            card (int): The card played.
+        """
+        i = len(self.baza)
+        seat = (self.leader + i) % 4
+        self.value ^= self.keys.hand[seat][card] ^ self.keys.baza[i][card]
+        self.baza.append(card)
+        self._undo.append((-1, 0, []))
+
+    def collect(self, winner: int, points: int) -> None:
+        """Close the current baza: the winner starts the next one and team 0 adds the points if it won.
+
+        Args:
+            winner (int): The player that won the baza.
+            points (int): The points of the baza.
+        """
+        keys = self.keys
+        new_points = self.points + points if winner % 2 == 0 else self.points
+        value = self.value ^ keys.leader[self.leader] ^ keys.leader[winner]
+        value ^= keys.points[self.points] ^ keys.points[new_points]
+        for i, c in enumerate(self.baza):
+            value ^= keys.baza[i][c]
+
+        self._undo.append((self.leader, self.points, self.baza))
+        self.value = value
+        self.leader = winner
+        self.points = new_points
+        self.baza = []
+
+    def undo(self) -> None:
+        """Undo the last play or collect.
+
+        Raises:
+            IndexError: If there is nothing to undo.
+        """
+        leader, points, baza = self._undo.pop()
+        keys = self.keys
+        if leader < 0:
+            card = self.baza.pop()
+            i = len(self.baza)
+            self.value ^= keys.hand[(self.leader + i) % 4][card] ^ keys.baza[i][card]
+            return
+
+        value = self.value ^ keys.leader[self.leader] ^ keys.leader[leader]
+        value ^= keys.points[self.points] ^ keys.points[points]
+        for i, c in enumerate(baza):
+            value ^= keys.baza[i][c]
+        self.value = value
+        self.leader = leader
+        self.points = points
+        self.baza = baza
+
+
+class TranspositionTable:
+    """A fixed size hash table of search results keyed by 64 bit position hashes, such as ZobristHash.value. Every
+    key maps to a single slot, so a new entry replaces the stored one either always or only when it comes from a
+    search at least as deep ("depth"), the stored key telling apart the positions that share a slot.
+
+    Args:
+        size (int): The number of slots, rounded up to a power of two.
+        replacement (Literal["depth", "always"], optional): The replacement policy. Defaults to "depth".
+    """
+
+    def __init__(self, size: int, replacement: Literal["depth", "always"] = "depth"):
+        if size < 1:
+            raise ValueError("size must be positive")
+        if replacement not in ("depth", "always"):
+            raise ValueError(f"unknown replacement policy {replacement!r}")
+        self.size = 1 << (size - 1).bit_length()
+        self.replacement = replacement
+        self._mask = self.size - 1
+        self._keys: List[Optional[int]] = [None] * self.size
+        self._depths = [0] * self.size
+        self._values: List[Any] = [None] * self.size
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: int, default: Any = None) -> Any:
+        """Return the value stored for a key.
+
+        Args:
+            key (int): The position hash.
+            default (Any, optional): The value to return if the key is not stored. Defaults to None.
+
+        Returns:
+            Any: The value stored, or default.
+        """
+        i = key & self._mask
+        if self._keys[i] == key:
+            self.hits += 1
+            return self._values[i]
+        self.misses += 1
+        return default
+
+    def store(self, key: int, value: Any, depth: int = 0) -> bool:
+        """Store the value of a key, following the replacement policy if its slot holds another key.
+
+        Args:
+            key (int): The position hash.
+            value (Any): The value to store.
+            depth (int, optional): The depth of the search that produced the value. Defaults to 0.
+
+        Returns:
+            bool: Wether the value was stored.
+        """
+        i = key & self._mask
+        stored = self._keys[i]
+        if (
+            stored is not None
+            and stored != key
+            and self.replacement == "depth"
+            and depth < self._depths[i]
+        ):
+            return False
+        self._keys[i] = key
+        self._depths[i] = depth
+        self._values[i] = value
+        return True
+
+    def clear(self) -> None:
+        """Remove all the entries."""
+        self._keys = [None] * self.size
+        self._depths = [0] * self.size
+        self._values = [None] * self.size
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return self.size - self._keys.count(None)
+
+    def __contains__(self, key: int) -> bool:
+        return self._keys[key & self._mask] == key
@@ -0,0 +1,53 @@
+import random
+from typing import List, Optional, Sequence
+
+import butilib
+from butilib.models import RandomLegalModel
+from butilib.record import GameRecord
+
+
+def deal(rng: random.Random) -> List[butilib.CardSet]:
+    """Deal a deck shuffled with a random generator."""
+    cards = list(butilib.Deck.new().cards)
+    rng.shuffle(cards)
+    return list(butilib.Deck(cards=cards).deal())
+
+
+def play_hand(
+    player_c: int = 0,
+    game_variant: butilib.GameVariant = butilib.LIBRE,
+    seed: Optional[int] = None,
+    contrar_probability: float = 0.0,
+    players: Optional[Sequence[butilib.Model]] = None,
+) -> butilib.PlayHandOutput:
+    """Play a hand on a random deal, by RandomLegalModel players unless other players are given. The deal and the
+    players are reproducible with a seed."""
+    rng = random.Random(seed)
+    if players is None:
+        players = [
+            RandomLegalModel(
+                seed=rng.randrange(2**32), contrar_probability=contrar_probability
+            )
+            for _ in range(4)
+        ]
+    return butilib.play_hand(
+        butilib.PlayHandInput(
+            players=list(players),
+            card_sets=deal(rng),
+            score=(0, 0),
+            player_c=player_c,
+            game_variant=game_variant,
+        )
+    )
+
+
+def play_record(
+    player_c: int = 0,
+    game_variant: butilib.GameVariant = butilib.LIBRE,
+    seed: Optional[int] = None,
+    contrar_probability: float = 0.0,
+) -> GameRecord:
+    """Play a hand as play_hand does and return its record."""
+    return GameRecord.from_hand(
+        play_hand(player_c, game_variant, seed, contrar_probability)
+    )
@@ -0,0 +1,55 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import butilib
+from butilib import analytics
+from butilib.record import GameRecord
+
+from .helpers import play_hand
+
+
+def test_to_array_creates_a_row_per_baza_with_winners_and_points():
+    outputs = [play_hand(i % 4, contrar_probability=0.5) for i in range(4)]
+    records = [GameRecord.from_hand(o) for o in outputs]
+
+    array = analytics.to_array(records)
+
+    assert array.dtype == analytics.BAZA_DTYPE
+    assert len(array) == 48
+    assert array["hand"][12] == 1
+    assert array["baza"][13] == 1
+    assert array["card_2"][0] == records[0].cards[2]
+    assert array["player_c"][30] == 2
+
+    for h, output in enumerate(outputs):
+        rows = array[array["hand"] == h]
+        assert rows["initial_player"][1:].tolist() == rows["winner"][:-1].tolist()
+        for team in range(2):
+            assert (
+                rows["points"][rows["winner"] % 2 == team].sum() == output.points[team]
+            )
+
+
+def test_from_array_restores_the_records():
+    records = [
+        GameRecord.from_hand(play_hand(i % 4, contrar_probability=0.5))
+        for i in range(3)
+    ]
+
+    assert analytics.from_array(analytics.to_array(records)) == records
+    pytest.raises(ValueError, analytics.from_array, analytics.to_array(records)[1:])
+
+
+def test_save_and_load_use_npy_files(tmp_path):
+    records = [
+        GameRecord.from_hand(play_hand(i % 4, contrar_probability=0.5))
+        for i in range(2)
+    ]
+    path = str(tmp_path / "bazas.npy")
+
+    analytics.save(path, records)
+
+    for mmap in [False, True]:
+        array = analytics.load(path, mmap=mmap)
+        assert (array == analytics.to_array(records)).all()
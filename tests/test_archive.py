@@ -0,0 +1,97 @@
+import io
+
+import pytest
+
+import butilib
+from butilib.archive import (
+    RECORD_SIZE,
+    ArchiveWriter,
+    archive_length,
+    decode_record,
+    encode_record,
+    read_archive,
+    read_histories,
+)
+
+from .helpers import play_record
+
+VARIANTS = [butilib.LIBRE, butilib.OBLIGADA]
+
+
+def test_encode_record_packs_a_hand_in_40_bytes_and_decode_record_restores_it():
+    for i in range(8):
+        record = play_record(i % 4, VARIANTS[i % 2], contrar_probability=0.5)
+        data = encode_record(record)
+
+        assert len(data) == RECORD_SIZE
+        assert decode_record(data) == record
+
+
+def test_encode_record_rejects_hands_with_an_unexpected_first_player():
+    record = play_record(0)
+
+    pytest.raises(ValueError, encode_record, record._replace(leaders=(0,) * 12))
+    pytest.raises(ValueError, encode_record, record._replace(cards=record.cards[:4]))
+
+
+def test_encode_record_rejects_cards_and_players_out_of_range():
+    record = play_record(0)
+
+    cards = list(record.cards)
+    cards[5] = 60
+    pytest.raises(ValueError, encode_record, record._replace(cards=tuple(cards)))
+    cards[5] = cards[6]
+    pytest.raises(ValueError, encode_record, record._replace(cards=tuple(cards)))
+
+    leaders = list(record.leaders)
+    leaders[1] = 5
+    pytest.raises(ValueError, encode_record, record._replace(leaders=tuple(leaders)))
+    pytest.raises(ValueError, encode_record, record._replace(player_c=4))
+
+
+def test_archive_writer_and_readers_stream_records_and_histories():
+    records = [
+        play_record(i % 4, VARIANTS[i % 2], contrar_probability=0.5) for i in range(5)
+    ]
+    buffer = io.BytesIO()
+
+    with ArchiveWriter(buffer) as writer:
+        writer.write(records[0])
+        writer.write_many(records[1:])
+
+    assert len(buffer.getvalue()) == 8 + 5 * RECORD_SIZE
+
+    buffer.seek(0)
+    assert list(read_archive(buffer, chunk_size=2)) == records
+
+    buffer.seek(0)
+    assert list(read_histories(buffer)) == [r.history() for r in records]
+
+
+def test_read_archive_rejects_files_that_are_not_archives(tmp_path):
+    path = tmp_path / "games.buti"
+    with ArchiveWriter(str(path)) as writer:
+        writer.write(play_record(1))
+
+    assert len(list(read_archive(str(path)))) == 1
+
+    path.write_bytes(path.read_bytes()[:-1])
+    pytest.raises(ValueError, list, read_archive(str(path)))
+
+    pytest.raises(ValueError, list, read_archive(io.BytesIO(b"not an archive")))
+
+
+def test_read_archive_reads_a_range_of_records(tmp_path):
+    records = [play_record(i % 4) for i in range(5)]
+    path = str(tmp_path / "games.buti")
+    with ArchiveWriter(path) as writer:
+        writer.write_many(records)
+
+    assert archive_length(path) == 5
+    assert list(read_archive(path, chunk_size=2, start=1, stop=4)) == records[1:4]
+    assert list(read_archive(path, start=3)) == records[3:]
+    assert list(read_archive(path, start=4, stop=4)) == []
+
+    with open(path, "ab") as f:
+        f.write(b"x")
+    pytest.raises(ValueError, archive_length, path)
@@ -0,0 +1,139 @@
+import io
+import json
+
+import pytest
+
+from butilib.bench import (
+    BENCHMARKS,
+    IMPROVED,
+    MISSING,
+    NEW,
+    REGRESSED,
+    UNCHANGED,
+    Benchmark,
+    BenchmarkResult,
+    compare,
+    compare_result,
+    dump,
+    load,
+    mann_whitney,
+    run,
+    run_benchmark,
+    select,
+)
+from butilib.bench.cli import main
+
+
+def test_every_benchmark_sets_up_and_runs():
+    names = [b.name for b in BENCHMARKS]
+    assert len(set(names)) == len(names)
+    for benchmark in BENCHMARKS:
+        assert benchmark.group in ("micro", "macro", "startup")
+        benchmark.setup()()
+
+
+def test_run_benchmark_calibrates_the_number_of_calls():
+    calls = []
+    benchmark = Benchmark("append", "micro", lambda: lambda: calls.append(1))
+    result = run_benchmark(benchmark, trials=3, min_time=0.001)
+    assert result.name == "append" and result.group == "micro"
+    assert len(result.times) == 3 and result.number > 1
+    assert len(calls) >= 3 * result.number
+    assert result.best <= result.median <= max(result.times)
+    assert result.stdev >= 0
+
+    with pytest.raises(ValueError):
+        run_benchmark(benchmark, trials=0)
+
+
+def test_results_are_dumped_and_loaded_as_json():
+    results = run(select(BENCHMARKS, r"^card\."), trials=2, min_time=0.001)
+    assert [r.name for r in results] == ["card.compare", "card.hash"]
+
+    f = io.StringIO()
+    dump(results, f)
+    data = json.loads(f.getvalue())
+    assert data["environment"]["python"]
+    assert data["benchmarks"][0]["median"] == results[0].median
+
+    f.seek(0)
+    assert load(f) == results
+    with pytest.raises(ValueError):
+        load(io.StringIO('{"benchmarks": []}'))
+
+
+def test_command_line_writes_the_results(tmp_path, capsys):
+    assert main(["--list", "-k", "deck"]) == 0
+    assert capsys.readouterr().out.split()[::2] == [
+        "deck.new",
+        "deck.shuffle",
+        "deck.deal",
+    ]
+
+    path = tmp_path / "results.json"
+    assert main(["-k", "card.hash", "-n", "2", "-t", "0.001", "-o", str(path)]) == 0
+    with open(path) as f:
+        assert [r.name for r in load(f)] == ["card.hash"]
+    assert "card.hash" in capsys.readouterr().err
+
+
+def result(name, times):
+    return BenchmarkResult(name, "micro", 100, times)
+
+
+def test_mann_whitney_is_exact_for_small_samples():
+    # 5 values all above 5 others: 1 of the 252 orderings.
+    assert mann_whitney([6, 7, 8, 9, 10], [1, 2, 3, 4, 5]) == pytest.approx(1 / 252)
+    assert mann_whitney([1, 2, 3, 4, 5], [6, 7, 8, 9, 10]) == 1.0
+    # Half of the orderings have U >= 2 for samples of 2 and 2 (U takes 0 to 4 as 1, 1, 2, 1, 1).
+    assert mann_whitney([1, 4], [2, 3]) == pytest.approx(4 / 6)
+    # The normal approximation agrees with the exact test on large samples.
+    a = [i + 0.3 for i in range(30)]
+    b = list(range(30))
+    assert mann_whitney(a, b) == pytest.approx(0.45, abs=0.05)
+
+
+def test_compare_tells_regressions_from_noise():
+    base = result("a", [1.0, 1.02, 0.98, 1.01, 0.99])
+    slower = result("a", [1.3, 1.31, 1.29, 1.32, 1.3])
+    faster = result("a", [0.7, 0.71, 0.69, 0.7, 0.72])
+    same = result("a", [1.03, 1.0, 1.01, 0.99, 1.02])
+    assert compare_result(base, slower).status == REGRESSED
+    assert compare_result(base, faster).status == IMPROVED
+    assert compare_result(base, same).status == UNCHANGED
+    # A slower median that overlaps with the baseline trials is noise.
+    noisy = result("a", [0.9, 1.5, 1.0, 1.6, 1.2])
+    assert compare_result(base, noisy).status == UNCHANGED
+
+    comparisons = compare(
+        [base, result("b", [1.0])], [result("a", [1.0] * 5), result("c", [1.0])]
+    )
+    assert [(c.name, c.status) for c in comparisons] == [
+        ("a", UNCHANGED),
+        ("c", NEW),
+        ("b", MISSING),
+    ]
+
+
+def test_command_line_fails_on_a_regression(tmp_path, capsys):
+    path = tmp_path / "baseline.json"
+    args = ["-k", "^card", "-n", "5", "-t", "0.001"]
+    assert main(args + ["-o", str(path)]) == 0
+
+    # A baseline 10 times faster than this run.
+    with open(path) as f:
+        baseline = load(f)
+    with open(path, "w") as f:
+        dump([r._replace(times=[t / 10 for t in r.times]) for r in baseline], f)
+    capsys.readouterr()
+
+    assert main(args + ["--compare", str(path)]) == 1
+    out = capsys.readouterr().out
+    assert "card.compare" in out and REGRESSED in out
+    assert main(args + ["--compare", str(path), "--gate", "play_baza"]) == 0
+
+    # A baseline 10 times slower.
+    with open(path, "w") as f:
+        dump([r._replace(times=[t * 10 for t in r.times]) for r in baseline], f)
+    assert main(args + ["--compare", str(path)]) == 0
+    assert IMPROVED in capsys.readouterr().out
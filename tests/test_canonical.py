@@ -0,0 +1,100 @@
+import itertools
+import random
+
+import butilib
+from butilib.canonical import (
+    IDENTITY,
+    canonical_card_set,
+    canonical_deal,
+    canonical_hand,
+    canonical_position,
+    invert,
+    permute_card_set,
+    permute_cards,
+    permute_suit,
+)
+from butilib.rules import SUITS
+from butilib.solver import ID_TO_POS, Solver
+
+PERMUTATIONS = list(itertools.permutations(range(4)))
+
+
+def test_invert_returns_the_inverse_permutation():
+    for perm in PERMUTATIONS:
+        assert invert(invert(perm)) == perm
+        assert permute_cards(permute_cards(range(48), perm), invert(perm)) == list(
+            range(48)
+        )
+    assert invert(IDENTITY) == IDENTITY
+    assert permute_suit(None, (1, 0, 2, 3)) is None
+    assert permute_suit(0, (1, 0, 2, 3)) == 1
+
+
+def test_canonical_hand_is_the_same_for_every_relabelling_of_the_suits():
+    random.seed(0)
+    for _ in range(20):
+        cards = random.sample(range(48), 12)
+        canonical, perm = canonical_hand(cards)
+        assert canonical == tuple(sorted(permute_cards(cards, perm)))
+        assert sorted(permute_cards(canonical, invert(perm))) == sorted(cards)
+        for p in PERMUTATIONS:
+            assert canonical_hand(permute_cards(cards, p))[0] == canonical
+
+
+def test_canonical_card_set_maps_card_sets_and_back():
+    random.seed(1)
+    deck = butilib.Deck.new()
+    deck.shuffle()
+    card_set = deck.deal()[0]
+
+    canonical, perm = canonical_card_set(card_set)
+    assert len(canonical) == 12
+    assert set(permute_card_set(canonical, invert(perm)).cards) == set(card_set.cards)
+    assert canonical_card_set(permute_card_set(card_set, (3, 2, 1, 0)))[0] == canonical
+
+
+def test_canonical_deal_is_the_same_for_every_relabelling_of_the_suits():
+    random.seed(2)
+    ids = list(range(48))
+    random.shuffle(ids)
+    hands = [ids[i * 12 : (i + 1) * 12] for i in range(4)]
+
+    canonical, perm = canonical_deal(hands)
+    assert [sorted(permute_cards(h, invert(perm))) for h in canonical] == [
+        sorted(h) for h in hands
+    ]
+    for p in PERMUTATIONS:
+        assert canonical_deal([permute_cards(h, p) for h in hands])[0] == canonical
+
+    # Swapping two hands is not a relabelling of suits.
+    assert canonical_deal([hands[1], hands[0]] + hands[2:])[0] != canonical
+
+
+def test_canonical_position_fixes_the_triumph_and_keeps_the_value_of_the_position():
+    random.seed(3)
+    for _ in range(10):
+        ids = random.sample(range(48), 12)
+        hands = [ids[i * 3 : (i + 1) * 3] for i in range(4)]
+        triumph = random.choice([None, 0, 1, 2, 3])
+        baza = [hands[0].pop()]
+
+        canonical, c_baza, c_triumph, perm = canonical_position(hands, triumph, baza)
+        assert c_triumph == (None if triumph is None else 0)
+        assert list(c_baza) == permute_cards(baza, perm)
+        for p in PERMUTATIONS:
+            other = canonical_position(
+                [permute_cards(h, p) for h in hands],
+                permute_suit(triumph, p),
+                permute_cards(baza, p),
+            )
+            assert other[:3] == (canonical, c_baza, c_triumph)
+
+        def value(hands, triumph, baza):
+            solver = Solver(None if triumph is None else SUITS[triumph], butilib.LIBRE)
+            return solver.solve_positions(
+                [sum(1 << ID_TO_POS[c] for c in h) for h in hands],
+                0,
+                [ID_TO_POS[c] for c in baza],
+            )
+
+        assert value(hands, triumph, baza) == value(canonical, c_triumph, c_baza)
@@ -0,0 +1,136 @@
+import butilib
+from butilib.cantar import CantarEstimate, CantarEvaluator
+
+
+def hand(numbers_by_suit):
+    return butilib.CardSet(
+        cards=[
+            butilib.Card(number=n, suit=s)
+            for s, numbers in numbers_by_suit.items()
+            for n in numbers
+        ]
+    )
+
+
+HAND = {
+    butilib.OROS: [9, 1, 12, 2, 3],
+    butilib.BASTOS: [9, 4],
+    butilib.ESPADAS: [5, 6, 7],
+    butilib.COPAS: [10, 11],
+}
+
+
+def test_cantar_evaluator_estimates_every_call_best_first():
+    evaluator = CantarEvaluator(max_rollouts=40, min_rollouts=40, batch_size=20, seed=0)
+
+    estimates = evaluator.evaluate(
+        butilib.CantarInput(cards=hand(HAND), delegated=False)
+    )
+    assert len(estimates) == 6
+    assert all(isinstance(e, CantarEstimate) for e in estimates)
+    assert [e.mean for e in estimates] == sorted(
+        (e.mean for e in estimates), reverse=True
+    )
+    assert {e.output.suit for e in estimates} == set(butilib.Suit) | {None}
+    assert sum(e.output.butifarra for e in estimates) == 1
+    assert all(e.rollouts == 40 for e in estimates)
+
+    estimates = evaluator.evaluate(
+        butilib.CantarInput(cards=hand(HAND), delegated=True)
+    )
+    assert len(estimates) == 5
+    assert not any(e.output.delegate for e in estimates)
+
+
+def test_cantar_evaluator_shares_the_cache_between_hands_with_relabelled_suits():
+    evaluator = CantarEvaluator(max_rollouts=40, batch_size=20, seed=0)
+    estimates = evaluator.evaluate(
+        butilib.CantarInput(cards=hand(HAND), delegated=False)
+    )
+    assert evaluator.cache_info() == (0, 1, 1)
+
+    swap = {
+        butilib.OROS: butilib.COPAS,
+        butilib.COPAS: butilib.OROS,
+        butilib.BASTOS: butilib.ESPADAS,
+        butilib.ESPADAS: butilib.BASTOS,
+    }
+    swapped = evaluator.evaluate(
+        butilib.CantarInput(
+            cards=hand({swap[s]: n for s, n in HAND.items()}), delegated=False
+        )
+    )
+    assert evaluator.cache_info() == (1, 1, 1)
+
+    by_call = {
+        (e.output.suit, e.output.butifarra, e.output.delegate): e.mean
+        for e in estimates
+    }
+    for e in swapped:
+        suit = None if e.output.suit is None else swap[e.output.suit]
+        assert by_call[(suit, e.output.butifarra, e.output.delegate)] == e.mean
+
+    evaluator.cache_clear()
+    assert evaluator.cache_info() == (0, 0, 0)
+
+
+def test_cantar_evaluator_cache_evicts_the_least_recently_used_hand():
+    evaluator = CantarEvaluator(max_rollouts=20, batch_size=20, cache_size=1, seed=0)
+    evaluator.evaluate(butilib.CantarInput(cards=hand(HAND), delegated=False))
+    evaluator.evaluate(butilib.CantarInput(cards=hand(HAND), delegated=True))
+    evaluator.evaluate(butilib.CantarInput(cards=hand(HAND), delegated=False))
+    assert evaluator.cache_info() == (0, 3, 1)
+
+
+def test_cantar_evaluator_stops_early_when_a_call_dominates():
+    strong = {
+        butilib.OROS: [9, 1, 12],
+        butilib.BASTOS: [9, 1, 12],
+        butilib.ESPADAS: [9, 1, 12],
+        butilib.COPAS: [9, 1, 12],
+    }
+    evaluator = CantarEvaluator(
+        max_rollouts=2000, min_rollouts=40, batch_size=40, cutoff_z=2.0, seed=0
+    )
+    estimates = evaluator.evaluate(
+        butilib.CantarInput(cards=hand(strong), delegated=True)
+    )
+    assert estimates[0].output.butifarra
+    assert estimates[0].rollouts < 2000
+    assert evaluator.cantar(
+        butilib.CantarInput(cards=hand(strong), delegated=True)
+    ).butifarra
+
+
+def test_cantar_evaluator_gives_the_same_estimates_in_parallel():
+    input = butilib.CantarInput(cards=hand(HAND), delegated=False)
+    estimates = []
+    for processes in [1, 2]:
+        with CantarEvaluator(
+            max_rollouts=40, batch_size=20, processes=processes, seed=3
+        ) as evaluator:
+            estimates.append(evaluator.evaluate(input))
+    assert estimates[0] == estimates[1]
+
+
+def test_cantar_evaluator_starts_its_processes_once_on_first_use():
+    with CantarEvaluator(
+        max_rollouts=20, batch_size=20, processes=2, seed=3
+    ) as evaluator:
+        assert evaluator._executor is None
+        evaluator.evaluate(butilib.CantarInput(cards=hand(HAND), delegated=False))
+        executor = evaluator._executor
+        assert executor is not None
+        evaluator.evaluate(butilib.CantarInput(cards=hand(HAND), delegated=True))
+        assert evaluator.cache_info()[1] == 2
+        assert evaluator._executor is executor
+    assert evaluator._executor is None
+
+
+def test_cantar_evaluator_returns_new_outputs():
+    evaluator = CantarEvaluator(max_rollouts=20, batch_size=20, seed=3)
+    input = butilib.CantarInput(cards=hand(HAND), delegated=False)
+    output = evaluator.cantar(input)
+    expected = output.model_copy()
+    output.suit, output.butifarra = None, not output.butifarra
+    assert evaluator.cantar(input) == expected
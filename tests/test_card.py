@@ -292,3 +292,11 @@ def test_card_set_pop_method_removes_one_random_card_from_the_set():
 
     assert card == butilib.Card(number=1, suit=butilib.OROS)
     assert card_set == butilib.CardSet(cards=[])
+
+
+def test_card_has_to_id_and_from_id_methods_that_use_the_position_in_a_new_deck():
+    deck = butilib.Deck.new()
+
+    for i, card in enumerate(deck.cards):
+        assert card.to_id() == i
+        assert butilib.Card.from_id(i) == card
@@ -0,0 +1,55 @@
+import pickle
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import butilib
+from butilib.dataset import GameDataset, write_dataset
+
+from .helpers import play_record
+
+
+def test_game_dataset_gives_random_access_to_the_written_records(tmp_path):
+    records = [
+        play_record(i % 4, butilib.OBLIGADA, contrar_probability=0.5) for i in range(6)
+    ]
+    path = str(tmp_path / "games.butd")
+
+    assert write_dataset(path, iter(records), chunk_size=4) == 6
+
+    dataset = GameDataset(path)
+
+    assert len(dataset) == 6
+    assert dataset.cards.shape == (6, 48)
+    assert dataset.cards[3].tolist() == list(records[3].cards)
+    assert dataset[2]["player_c"] == 2
+    assert len(dataset[1:4]) == 3
+    assert [dataset.record(i) for i in range(6)] == records
+    assert dataset.history(5) == records[5].history()
+
+
+def test_game_dataset_views_do_not_copy_and_it_pickles_by_path(tmp_path):
+    path = str(tmp_path / "games.butd")
+    write_dataset(path, [play_record(0), play_record(1)])
+
+    dataset = GameDataset(path)
+
+    assert dataset.cards[1].base is not None
+    assert not dataset.cards.flags.writeable
+
+    copy = pickle.loads(pickle.dumps(dataset))
+    assert copy.path == path
+    assert len(copy) == 2
+
+
+def test_game_dataset_rejects_files_that_are_not_datasets(tmp_path):
+    path = tmp_path / "games.butd"
+    write_dataset(str(path), [])
+    assert len(GameDataset(str(path))) == 0
+
+    path.write_bytes(path.read_bytes() + b"\0")
+    pytest.raises(ValueError, GameDataset, str(path))
+
+    path.write_bytes(b"not a dataset")
+    pytest.raises(ValueError, GameDataset, str(path))
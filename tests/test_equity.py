@@ -0,0 +1,137 @@
+import io
+
+import pytest
+
+import butilib
+from butilib.equity import MatchEquity, SwingDistribution
+
+
+def distribution(suit, butifarra=None, rate=0.0):
+    def diffs(probabilities):
+        return tuple(probabilities.get(d, 0.0) for d in range(-36, 37))
+
+    return SwingDistribution(rate, diffs(suit), diffs(butifarra or {0: 1.0}))
+
+
+DISTRIBUTION = distribution(
+    {3: 0.35, -2: 0.3, 0: 0.2, 9: 0.15}, {12: 0.5, -10: 0.3, 0: 0.2}, 0.1
+)
+
+
+def value_iteration(dist, target, iterations=400):
+    # The equities of the team calling next, iterating the equations until they converge.
+    swings = {}
+    for butifarra, weight in ((False, 1 - dist.butifarra), (True, dist.butifarra)):
+        diffs = dist.butifarra_diffs if butifarra else dist.suit_diffs
+        for i, p in enumerate(diffs):
+            swing = (i - 36) * (2 if butifarra else 1)
+            swings[swing] = swings.get(swing, 0.0) + weight * p
+
+    e = [[0.5] * target for _ in range(target)]
+    for _ in range(iterations):
+        new = [[0.0] * target for _ in range(target)]
+        for a in range(target):
+            for b in range(target):
+                for swing, p in swings.items():
+                    if swing > 0 and a + swing >= target:
+                        v = 1.0
+                    elif swing < 0 and b - swing >= target:
+                        v = 0.0
+                    elif swing >= 0:
+                        v = 1.0 - e[b][a + swing]
+                    else:
+                        v = 1.0 - e[b - swing][a]
+                    new[a][b] += p * v
+        e = new
+    return e
+
+
+def contrar_input(player, score, contrada=butilib.NORMAL, butifarra=False):
+    deck = butilib.Deck.new()
+    return butilib.ContrarInput(
+        cards=butilib.CardSet(cards=deck.cards[:12]),
+        player=player,
+        delegated=False,
+        triumph=None if butifarra else butilib.OROS,
+        butifarra=butifarra,
+        score=score,
+        contrada=contrada,
+    )
+
+
+def test_match_equity_matches_value_iteration():
+    equity = MatchEquity.build(DISTRIBUTION, target=15)
+    expected = value_iteration(DISTRIBUTION, 15)
+    for a in range(15):
+        for b in range(15):
+            assert equity.equity((a, b)) == pytest.approx(expected[a][b], abs=1e-9)
+
+    assert equity.equity((15, 3)) == 1.0
+    assert equity.equity((3, 15)) == 0.0
+    assert equity.equity((14, 0)) > equity.equity((0, 0)) > equity.equity((0, 14))
+
+
+def test_hand_equity_averages_the_equity_after_the_hand():
+    equity = MatchEquity.build(DISTRIBUTION, target=15)
+    # A suit called at contrada: 6 with 0.35, -4 with 0.3, 0 with 0.2 and 18 with 0.15.
+    expected = (
+        0.35 * (1 - equity.equity((2, 11)))
+        + 0.3 * (1 - equity.equity((6, 5)))
+        + 0.2 * (1 - equity.equity((2, 5)))
+        + 0.15
+    )
+    assert equity.hand_equity((5, 2), False, 1) == pytest.approx(expected)
+
+    # Before the call, the equity averages the hands at normal contrada.
+    expected = 0.9 * equity.hand_equity((5, 2), False, 0)
+    expected += 0.1 * equity.hand_equity((5, 2), True, 0)
+    assert equity.equity((5, 2)) == pytest.approx(expected)
+
+
+def test_match_equity_lookup_takes_the_side_of_the_player():
+    equity = MatchEquity.build(DISTRIBUTION, target=101)
+
+    # The other team called: contrar takes the team to the CONTRADA level.
+    current, raised = equity.lookup(contrar_input(1, (20, 80)))
+    assert current == pytest.approx(1 - equity.hand_equity((80, 20), False, 0))
+    assert raised == pytest.approx(1 - equity.hand_equity((80, 20), False, 1))
+
+    # The team called and the other one contrared: recontrar.
+    current, raised = equity.lookup(
+        contrar_input(2, (30, 40), butilib.CONTRADA, butifarra=True)
+    )
+    assert current == pytest.approx(equity.hand_equity((30, 40), True, 1))
+    assert raised == pytest.approx(equity.hand_equity((30, 40), True, 2))
+
+    for player, score in [(1, (0, 95)), (3, (95, 0))]:
+        input = contrar_input(player, score)
+        current, raised = equity.lookup(input)
+        assert equity.contrar(input).contrar == (raised > current)
+    # Far ahead, raising the stakes only helps the other team catch up.
+    assert not equity.contrar(contrar_input(1, (97, 0))).contrar
+
+
+def test_match_equity_is_saved_and_loaded(tmp_path):
+    equity = MatchEquity.build(DISTRIBUTION, target=21)
+    path = str(tmp_path / "equity.bin")
+    equity.save(path)
+    loaded = MatchEquity.load(path)
+    assert loaded.target == 21
+    for key in [(None, 0), (False, 2), (True, 3)]:
+        assert loaded._tables[key] == equity._tables[key]
+
+    f = io.BytesIO()
+    equity.save(f)
+    with pytest.raises(ValueError):
+        MatchEquity.load(io.BytesIO(f.getvalue()[:-8]))
+    with pytest.raises(ValueError):
+        MatchEquity.load(io.BytesIO(b"BUTT" + f.getvalue()[4:]))
+
+
+def test_swing_distribution_is_simulated():
+    dist = SwingDistribution.simulate(50, seed=0)
+    assert dist == SwingDistribution.simulate(50, seed=0)
+    assert 0 <= dist.butifarra <= 1
+    assert len(dist.suit_diffs) == len(dist.butifarra_diffs) == 73
+    assert sum(dist.suit_diffs) == pytest.approx(1)
+    assert sum(dist.butifarra_diffs) == pytest.approx(1)
@@ -0,0 +1,92 @@
+import butilib
+
+
+class FirstPlayableModel(butilib.Model):
+    def _cantar(self, input):
+        return butilib.CantarOutput(suit=input.cards.cards[0].suit)
+
+    def _contrar(self, input):
+        return butilib.ContrarOutput(contrar=False)
+
+    def _play(self, input):
+        return butilib.PlayOutput(card=input.playable_cards()[0])
+
+
+def test_duplicate_match_replays_every_deal_with_the_teams_swapped():
+    model = FirstPlayableModel()
+
+    result = butilib.duplicate_match(model, model, n_deals=3)
+
+    assert isinstance(result, butilib.DuplicateResult)
+    assert [d.deal for d in result.deals] == [0, 1, 2]
+    for d in result.deals:
+        assert len(d.scores) == 2
+        assert d.net() == 0
+
+    assert result.mean() == 0
+
+
+def test_duplicate_match_can_rotate_the_card_sets_around_the_table():
+    model = FirstPlayableModel()
+
+    result = butilib.duplicate_match(model, model, n_deals=1, rotate=True)
+
+    assert len(result.deals[0].scores) == 8
+
+
+def test_duplicate_result_computes_the_mean_and_standard_error_of_the_net_scores():
+    result = butilib.DuplicateResult(
+        deals=[
+            butilib.DuplicateDealResult(deal=0, scores=[4, -2]),
+            butilib.DuplicateDealResult(deal=1, scores=[0, 4]),
+        ]
+    )
+
+    assert result.mean() == 3
+    assert result.standard_error() == 1
+
+
+def test_sequential_test_stops_as_soon_as_a_difference_is_resolved():
+    test = butilib.SequentialTest(delta=1.0)
+
+    decision = test.run([3, 5, 4, 6, 2, 5, 3, 4, 6, 5] * 100)
+
+    assert decision == butilib.SequentialDecision.A_BETTER
+    assert test.n < 100
+
+    test = butilib.SequentialTest(delta=1.0)
+
+    decision = test.run([-3, -5, -4, -6, -2, -5, -3, -4, -6, -5] * 100)
+
+    assert decision == butilib.SequentialDecision.B_BETTER
+
+
+def test_sequential_test_declares_negligible_differences():
+    test = butilib.SequentialTest(delta=2.0)
+
+    decision = test.run([1, -1, 0, 2, -2, 1, -1, 0, 1, -1] * 100)
+
+    assert decision == butilib.SequentialDecision.NEGLIGIBLE
+    assert test.n < 1000
+
+
+def test_sequential_test_stays_undecided_until_max_samples():
+    test = butilib.SequentialTest(delta=0.01, max_samples=20)
+
+    decision = test.run([10, -10] * 100)
+
+    assert decision == butilib.SequentialDecision.UNDECIDED
+    assert test.n == 20
+
+
+def test_sequential_match_plays_duplicate_deals_until_the_test_is_done():
+    model = FirstPlayableModel()
+
+    result = butilib.sequential_match(
+        model, model, butilib.SequentialTest(delta=1.0, max_samples=12)
+    )
+
+    assert isinstance(result, butilib.SequentialResult)
+    assert result.decision == butilib.SequentialDecision.NEGLIGIBLE
+    assert result.n_deals == 10
+    assert result.mean == 0
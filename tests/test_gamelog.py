@@ -0,0 +1,86 @@
+import pytest
+
+import butilib
+from butilib.gamelog import GameLogWriter, read_game_log
+from butilib.record import GameRecord
+
+from .helpers import play_hand
+
+
+def test_game_log_writer_appends_hands_in_batches_from_a_background_thread(tmp_path):
+    outputs = [play_hand(i % 4) for i in range(7)]
+    records = [GameRecord.from_hand(o) for o in outputs]
+    path = str(tmp_path / "games.log")
+
+    with GameLogWriter(path, batch_size=3, queue_size=2, fsync=True) as log:
+        for output in outputs[:5]:
+            log.write(output)
+
+    with GameLogWriter(path, flush_interval=0.01) as log:
+        log.write(records[5])
+        log.write(records[6])
+
+    assert list(read_game_log(path)) == records
+
+
+def test_read_game_log_stops_at_a_torn_frame(tmp_path):
+    records = [GameRecord.from_hand(play_hand(i)) for i in range(3)]
+    path = tmp_path / "games.log"
+
+    with GameLogWriter(str(path)) as log:
+        for record in records:
+            log.write(record)
+
+    data = path.read_bytes()
+    path.write_bytes(data[:-10])
+    assert list(read_game_log(str(path))) == records[:2]
+
+    path.write_bytes(data[:-30] + b"\xff" + data[-29:])
+    assert list(read_game_log(str(path))) == records[:2]
+
+    path.write_bytes(b"not a log")
+    pytest.raises(ValueError, list, read_game_log(str(path)))
+
+
+def test_game_log_writer_truncates_a_torn_tail_before_appending(tmp_path):
+    records = [GameRecord.from_hand(play_hand(i % 4)) for i in range(5)]
+    path = tmp_path / "games.log"
+
+    with GameLogWriter(str(path)) as log:
+        for record in records[:3]:
+            log.write(record)
+
+    data = path.read_bytes()
+    path.write_bytes(data[:-10])
+    with GameLogWriter(str(path)) as log:
+        log.write(records[3])
+    assert list(read_game_log(str(path))) == records[:2] + [records[3]]
+
+    path.write_bytes(path.read_bytes() + b"\x12\x34\x56")
+    with GameLogWriter(str(path)) as log:
+        log.write(records[4])
+    assert list(read_game_log(str(path))) == records[:2] + records[3:]
+
+    path.write_bytes(b"BUT")
+    with GameLogWriter(str(path)) as log:
+        log.write(records[0])
+    assert list(read_game_log(str(path))) == records[:1]
+
+    path.write_bytes(b"not a log")
+    pytest.raises(ValueError, GameLogWriter, str(path))
+    assert path.read_bytes() == b"not a log"
+
+
+def test_game_log_writer_reports_write_errors_and_refuses_writes_once_closed(tmp_path):
+    log = GameLogWriter(str(tmp_path / "games.log"))
+    log.write(GameRecord.from_hand(play_hand(0))._replace(cards=(0,)))
+
+    pytest.raises(RuntimeError, log.close)
+    pytest.raises(ValueError, log.write, GameRecord.from_hand(play_hand(0)))
+
+
+def test_game_log_writer_leaves_a_short_file_that_is_not_a_log_untouched(tmp_path):
+    path = tmp_path / "hello.txt"
+    path.write_bytes(b"hello")
+    pytest.raises(ValueError, GameLogWriter, str(path))
+    assert path.read_bytes() == b"hello"
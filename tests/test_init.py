@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import butilib
+
+
+def test_importing_butilib_does_not_import_its_submodules():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(butilib.__file__)))
+    code = (
+        "import sys, butilib\n"
+        "print(sorted(m for m in sys.modules if m.startswith(('butilib.', 'pydantic'))))\n"
+        "butilib.Card\n"
+        "print('butilib.card' in sys.modules, 'butilib.play_hand' in sys.modules)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        env=dict(os.environ, PYTHONPATH=root),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.splitlines()
+    assert output == ["[]", "True False"]
+
+
+def test_every_public_name_is_loaded():
+    for name in butilib.__all__:
+        assert getattr(butilib, name) is not None
+        assert name in dir(butilib)
+    assert butilib.Card is butilib.card.Card
+
+    from butilib import PlayInput
+
+    assert PlayInput is butilib.schema.PlayInput
+
+    with pytest.raises(AttributeError):
+        butilib.NotAName
+
+
+def test_functions_are_not_hidden_by_their_submodules():
+    import butilib.play_baza
+    import butilib.play_hand
+
+    assert callable(butilib.play_baza) and callable(butilib.play_hand)
+    assert butilib.play_hand.__module__ == "butilib.play_hand"
+    assert sys.modules["butilib.play_baza"].play_baza is butilib.play_baza
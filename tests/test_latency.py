@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+import butilib
+from butilib.latency import (
+    BAZA_INPUT,
+    CANTAR,
+    INPUT,
+    LEGALITY,
+    MODEL,
+    PLAY,
+    LatencyHistogram,
+    LatencyRecorder,
+)
+from butilib.models import GreedyModel, RandomLegalModel
+
+
+def test_latency_histogram_percentiles_are_within_its_precision():
+    rng = random.Random(0)
+    values = [int(rng.lognormvariate(10, 1)) for _ in range(5000)]
+    histogram = LatencyHistogram(significant_bits=7)
+    for v in values:
+        histogram.record(v)
+
+    values.sort()
+    assert histogram.count == 5000
+    assert histogram.min == values[0] and histogram.max == values[-1]
+    assert histogram.mean == pytest.approx(sum(values) / 5000)
+    for p in (50, 90, 99):
+        exact = values[-(-5000 * p // 100) - 1]
+        assert exact <= histogram.percentile(p) <= exact * (1 + 2**-6)
+    assert histogram.percentile(100) == values[-1]
+    assert len(histogram.counts) < 1000
+
+    small = LatencyHistogram()
+    for v in [3, 1, 2]:
+        small.record(v)
+    assert [small.percentile(p) for p in (1, 50, 100)] == [1, 2, 3]
+    assert LatencyHistogram().summary()["p99"] == 0
+
+
+def test_latency_histograms_merge():
+    a, b, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for v in range(0, 100000, 7):
+        (a if v % 2 else b).record(v)
+        both.record(v)
+    a.merge(b)
+    assert a.summary() == both.summary()
+    with pytest.raises(ValueError):
+        a.merge(LatencyHistogram(significant_bits=5))
+
+
+def test_play_hand_records_the_phases_per_seat_and_model():
+    random.seed(0)
+    deck = butilib.Deck.new()
+    deck.shuffle()
+    recorder = LatencyRecorder()
+    butilib.play_hand(
+        butilib.PlayHandInput(
+            players=[GreedyModel(seed=0), RandomLegalModel(seed=1)] * 2,
+            card_sets=list(deck.deal()),
+            score=(0, 0),
+            player_c=0,
+        ),
+        recorder=recorder,
+    )
+
+    assert recorder.models == {
+        0: "GreedyModel",
+        1: "RandomLegalModel",
+        2: "GreedyModel",
+        3: "RandomLegalModel",
+    }
+    assert {CANTAR, BAZA_INPUT, INPUT, LEGALITY, MODEL, PLAY} <= set(recorder.phases())
+    assert recorder.histogram(BAZA_INPUT).count == 12
+    for phase in (INPUT, LEGALITY, PLAY):
+        assert recorder.histogram(phase).count == 48
+        assert recorder.histogram(phase, seat=1).count == 12
+        assert recorder.histogram(phase, model="GreedyModel").count == 24
+    # Forced plays do not call the model.
+    assert 0 < recorder.histogram(MODEL).count < 48
+    assert recorder.histogram(PLAY).total >= recorder.histogram(MODEL).total
+    assert recorder.histogram(PLAY, cpu=True).count == 48
+
+    summary = recorder.summary()
+    assert set(summary[PLAY]) == {"0", "1", "2", "3", "all"}
+    assert set(summary[BAZA_INPUT]) == {"engine", "all"}
+    assert summary[PLAY]["all"]["count"] == 48
+    assert summary[PLAY]["all"]["p50"] <= summary[PLAY]["all"]["p99"]
+
+    recorder.clear()
+    assert recorder.phases() == [] and recorder.models == {}
+
+
+def test_play_baza_leaves_the_inputs_without_recorder_by_default():
+    inputs = []
+
+    class Recorder(GreedyModel):
+        def _play(self, input):
+            inputs.append(input.recorder)
+            return super()._play(input)
+
+    random.seed(1)
+    deck = butilib.Deck.new()
+    deck.shuffle()
+    butilib.play_hand(
+        butilib.PlayHandInput(
+            players=[Recorder(seed=i) for i in range(4)],
+            card_sets=list(deck.deal()),
+            score=(0, 0),
+            player_c=0,
+        )
+    )
+    assert inputs and all(r is None for r in inputs)
@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+import butilib
+from butilib.models import GreedyModel, RandomLegalModel
+
+
+def play(players, seed, game_variant=butilib.LIBRE):
+    random.seed(seed)
+    deck = butilib.Deck.new()
+    deck.shuffle()
+    return butilib.play_hand(
+        butilib.PlayHandInput(
+            players=players,
+            card_sets=list(deck.deal()),
+            score=(0, 0),
+            player_c=seed % 4,
+            game_variant=game_variant,
+        )
+    )
+
+
+def play_input(hand, cards, triumph=butilib.OROS):
+    return butilib.PlayInput(
+        history=butilib.History(bazas=[]),
+        card_set=butilib.CardSet(cards=[butilib.Card.from_id(c) for c in hand]),
+        triumph=triumph,
+        player_number=len(cards),
+        cards=[butilib.Card.from_id(c) for c in cards],
+        contrada=butilib.NORMAL,
+        player_c=3,
+        delegated=False,
+        game_variant=butilib.LIBRE,
+    )
+
+
+def test_butilib_allows_to_import_the_baseline_models_from_the_models_endpoint():
+    assert issubclass(RandomLegalModel, butilib.Model)
+    assert issubclass(GreedyModel, butilib.Model)
+
+
+@pytest.mark.parametrize("game_variant", [butilib.LIBRE, butilib.OBLIGADA])
+def test_baseline_models_play_whole_hands_with_legal_cards(game_variant):
+    for seed in range(8):
+        a = RandomLegalModel(seed=seed, contrar_probability=0.5)
+        b = GreedyModel(seed=seed)
+        output = play([a, b, a, b], seed, game_variant)
+        assert sum(output.points) == 72
+
+
+def test_baseline_models_with_a_seed_are_deterministic():
+    histories = []
+    for _ in range(2):
+        a = RandomLegalModel(seed=1)
+        b = GreedyModel(seed=2)
+        histories.append(play([a, b, a, b], 3).history)
+    assert histories[0] == histories[1]
+
+
+def test_random_legal_model_plays_every_legal_card():
+    model = RandomLegalModel(seed=0)
+    # Lead 5 of OROS, holding the 2, 9 of OROS and 4 of COPAS: must follow with any card that wins.
+    input = play_input([1, 8, 39] + list(range(12, 21)), [4])
+    played = {model.play(input).card for _ in range(50)}
+    assert played == {butilib.Card.from_id(8)}
+
+    input = play_input(list(range(12, 24)), [])
+    played = {model.play(input).card for _ in range(200)}
+    assert len(played) == 12
+
+
+def test_greedy_model_wins_with_the_cheapest_card_and_discards_the_lowest():
+    model = GreedyModel(seed=0)
+    hand = [0, 8, 12, 13, 14, 16, 20, 24, 25, 26, 27, 36]
+
+    # The enemy leads the 4 of BASTOS: the 5 of BASTOS is the cheapest card that wins.
+    assert model.play(play_input(hand, [15])).card == butilib.Card.from_id(16)
+    # The partner is winning with the 8 of BASTOS: discard the 2 of BASTOS.
+    assert model.play(play_input(hand, [19, 15])).card == butilib.Card.from_id(13)
+    # The enemy is winning with the 9 of COPAS and no COPAS left to follow: trump with the 1 of OROS.
+    hand_without_copas = hand[:-1] + [28]
+    assert model.play(play_input(hand_without_copas, [44])).card == (
+        butilib.Card.from_id(0)
+    )
+    # Leading: the strongest card outside triumph.
+    assert model.play(play_input(hand, [])).card == butilib.Card.from_id(20)
+
+
+def test_baseline_models_cantar_and_contrar_return_valid_outputs():
+    random.seed(4)
+    for seed in range(20):
+        deck = butilib.Deck.new()
+        deck.shuffle()
+        cards = deck.deal()[0]
+        for model in [RandomLegalModel(seed=seed), GreedyModel()]:
+            assert not model.cantar(
+                butilib.CantarInput(cards=cards, delegated=True)
+            ).delegate
+            output = model.contrar(
+                butilib.ContrarInput(
+                    cards=cards,
+                    player=1,
+                    delegated=False,
+                    triumph=butilib.OROS,
+                    score=(0, 0),
+                    contrada=butilib.NORMAL,
+                )
+            )
+            assert isinstance(output.contrar, bool)
@@ -0,0 +1,110 @@
+import random
+
+import pydantic
+import pytest
+
+import butilib
+from butilib.models import ISMCTSModel, RandomLegalModel, SearchStats
+
+from .helpers import play_hand
+
+
+def test_butilib_allows_to_import_the_ismcts_model_from_the_models_endpoint():
+    assert issubclass(ISMCTSModel, butilib.Model)
+
+
+def test_ismcts_model_needs_a_budget():
+    with pytest.raises(pydantic.ValidationError):
+        ISMCTSModel(iterations=None, time_limit=None)
+    ISMCTSModel(iterations=None, time_limit=0.1)
+
+
+@pytest.mark.parametrize("game_variant", [butilib.LIBRE, butilib.OBLIGADA])
+def test_ismcts_model_plays_whole_hands_with_legal_cards(game_variant):
+    model = ISMCTSModel(iterations=20, seed=0)
+    other = RandomLegalModel(seed=1)
+
+    output = play_hand(1, game_variant, 0, players=[model, other, model, other])
+
+    assert len(output.history) == 12
+    assert sum(output.points) == 72
+    assert isinstance(model.last_stats, SearchStats)
+    assert model.last_stats.iterations == 20
+    assert model.last_stats.iterations_per_second > 0
+
+
+def test_ismcts_model_reuses_the_tree_between_decisions_of_the_same_hand():
+    model = ISMCTSModel(iterations=50, seed=0)
+    reused = []
+
+    class Recording(ISMCTSModel):
+        def _play(self, input):
+            output = super()._play(input)
+            reused.append(self.last_stats.reused_visits)
+            return output
+
+    recording = Recording(iterations=50, seed=0)
+    play_hand(
+        1, seed=1, players=[recording] + [RandomLegalModel(seed=i) for i in range(3)]
+    )
+
+    assert reused[0] == 0
+    assert any(r > 0 for r in reused[1:])
+    assert model.last_stats is None
+
+
+def test_ismcts_model_stops_at_the_time_limit():
+    model = ISMCTSModel(iterations=None, time_limit=0.02, seed=0)
+    deck = butilib.Deck.new()
+    random.seed(2)
+    deck.shuffle()
+    c1, c2, c3, c4 = deck.deal()
+
+    output = model.play(
+        butilib.PlayInput(
+            history=butilib.History(bazas=[]),
+            card_set=c2,
+            triumph=butilib.OROS,
+            player_number=1,
+            cards=[],
+            contrada=butilib.NORMAL,
+            player_c=0,
+            delegated=False,
+            game_variant=butilib.LIBRE,
+        )
+    )
+
+    assert output.card in c2.cards
+    assert model.last_stats.iterations >= 1
+    assert model.last_stats.elapsed < 0.5
+
+
+def test_ismcts_model_with_a_seed_is_deterministic():
+    outputs = []
+    for _ in range(2):
+        model = ISMCTSModel(iterations=30, seed=4)
+        outputs.append(
+            play_hand(1, seed=3, players=[model, RandomLegalModel(seed=1)] * 2).history
+        )
+    assert outputs[0] == outputs[1]
+
+
+def test_ismcts_model_cantar_returns_a_valid_call():
+    model = ISMCTSModel()
+    random.seed(5)
+    for _ in range(20):
+        deck = butilib.Deck.new()
+        deck.shuffle()
+        cards = deck.deal()[0]
+        output = model.cantar(butilib.CantarInput(cards=cards, delegated=True))
+        assert output.delegate is False
+        assert model.contrar(
+            butilib.ContrarInput(
+                cards=cards,
+                player=1,
+                delegated=False,
+                triumph=butilib.OROS,
+                score=(0, 0),
+                contrada=butilib.NORMAL,
+            )
+        ) == butilib.ContrarOutput(contrar=False)
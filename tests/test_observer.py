@@ -0,0 +1,167 @@
+import random
+
+import butilib
+from butilib.models import GreedyModel, RandomLegalModel
+
+
+class Collector(butilib.GameObserver):
+    def __init__(self):
+        self.events = []
+
+    def on_hand_start(self, deal, replay, team):
+        self.events.append(("start", deal, replay, team))
+
+    def on_cantar(self, seat, delegated, delegate, triumph, butifarra):
+        self.events.append(("cantar", seat, delegated, delegate, triumph, butifarra))
+
+    def on_contrar(self, seat, contrada, contrar):
+        self.events.append(("contrar", seat, contrada, contrar))
+
+    def on_card_played(self, seat, card, position):
+        self.events.append(("card", seat, card, position))
+
+    def on_baza_complete(self, leader, cards, winner, points):
+        self.events.append(("baza", leader, cards, winner, points))
+
+    def on_hand_complete(self, triumph, butifarra, contrada, points, score):
+        self.events.append(("hand", triumph, butifarra, contrada, points, score))
+
+    def of(self, kind):
+        return [e[1:] for e in self.events if e[0] == kind]
+
+
+def _hand_input(seed, players):
+    random.seed(seed)
+    deck = butilib.Deck.new()
+    deck.shuffle()
+    return butilib.PlayHandInput(
+        players=players, card_sets=list(deck.deal()), score=(10, 20), player_c=seed % 4
+    )
+
+
+def test_game_observer_events_do_nothing_by_default():
+    observer = butilib.GameObserver()
+    observer.on_card_played(0, 0, 0)
+    output = butilib.play_hand(
+        _hand_input(0, [RandomLegalModel(seed=i) for i in range(4)]),
+        observers=[observer],
+    )
+    assert len(output.history) == 12
+
+
+def test_play_hand_notifies_the_observers_of_the_whole_hand():
+    for seed in range(5):
+        collectors = [Collector(), Collector()]
+        output = butilib.play_hand(
+            _hand_input(seed, [GreedyModel(seed=i) for i in range(4)]),
+            observers=collectors,
+        )
+        events = collectors[0].events
+        assert collectors[1].events == events
+
+        kinds = [e[0] for e in events]
+        assert kinds[0] == "cantar" and kinds[-1] == "hand"
+        assert kinds.count("card") == 48 and kinds.count("baza") == 12
+        first_card = kinds.index("card")
+        assert set(kinds[:first_card]) <= {"cantar", "contrar"}
+
+        cantar = collectors[0].of("cantar")
+        assert cantar[0][:2] == (seed % 4, False)
+        assert cantar[-1][3:] == (output.triumph, output.butifarra)
+        assert len(cantar) == (2 if output.delegated else 1)
+        contrar = collectors[0].of("contrar")
+        assert sum(c[2] for c in contrar) == output.contrada.value
+
+        bazas = collectors[0].of("baza")
+        cards = collectors[0].of("card")
+        for i, (baza, (leader, ids, winner, points)) in enumerate(
+            zip(output.history.bazas, bazas)
+        ):
+            assert leader == baza.initial_player
+            assert ids == tuple(c.to_id() for c in baza.cards)
+            assert cards[4 * i : 4 * i + 4] == [
+                ((leader + p) % 4, ids[p], p) for p in range(4)
+            ]
+            if i < 11:
+                assert winner == output.history.bazas[i + 1].initial_player
+        team_points = [0, 0]
+        for _, _, winner, points in bazas:
+            team_points[winner % 2] += points
+        assert tuple(team_points) == output.points
+
+        assert collectors[0].of("hand") == [
+            (
+                output.triumph,
+                output.butifarra,
+                output.contrada,
+                output.points,
+                output.score,
+            )
+        ]
+
+
+def test_play_baza_notifies_the_observers_of_its_cards():
+    random.seed(1)
+    deck = butilib.Deck.new()
+    deck.shuffle()
+    collector = Collector()
+    output = butilib.play_baza(
+        butilib.PlayBazaInput(
+            history=butilib.History(bazas=[]),
+            players=[RandomLegalModel(seed=i) for i in range(4)],
+            card_sets=list(deck.deal()),
+            initial_player=2,
+            triumph=butilib.OROS,
+            player_c=1,
+            delegated=False,
+            game_variant=butilib.LIBRE,
+            contrada=butilib.NORMAL,
+        ),
+        observers=[collector],
+    )
+    ids = tuple(c.to_id() for c in output.baza.cards)
+    assert collector.of("card") == [((2 + p) % 4, ids[p], p) for p in range(4)]
+    ((leader, cards, winner, points),) = collector.of("baza")
+    assert (leader, cards) == (2, ids)
+    assert points == 1 + sum(c.points() for c in output.baza.cards)
+    winning = output.baza.cards[(winner - 2) % 4]
+    assert all(
+        c == winning or not c.compare(winning, butilib.OROS, output.baza.cards[0].suit)
+        for c in output.baza.cards
+    )
+
+
+def test_duplicate_match_notifies_the_observers_of_every_hand():
+    collector = Collector()
+    butilib.duplicate_match(
+        RandomLegalModel(seed=0),
+        RandomLegalModel(seed=1),
+        n_deals=2,
+        observers=[collector],
+    )
+    assert len(collector.of("hand")) == 4
+    assert len(collector.of("card")) == 4 * 48
+
+
+def test_duplicate_match_tells_the_observers_the_replay_and_team_of_every_hand():
+    collector = Collector()
+    result = butilib.duplicate_match(
+        RandomLegalModel(seed=0),
+        RandomLegalModel(seed=1),
+        n_deals=2,
+        rotate=True,
+        observers=[collector],
+    )
+    assert collector.of("start") == [(d, r, r % 2) for d in range(2) for r in range(8)]
+    assert all(len(d.scores) == 8 for d in result.deals)
+
+    # Every hand starts after the previous one completes.
+    kinds = [e[0] for e in collector.events if e[0] in ("start", "hand")]
+    assert kinds == ["start", "hand"] * 16
+
+    # A hand played by play_hand alone has no start event.
+    hand = Collector()
+    butilib.play_hand(
+        _hand_input(0, [RandomLegalModel(seed=i) for i in range(4)]), observers=[hand]
+    )
+    assert hand.of("start") == []
@@ -220,5 +220,85 @@ def test_play_hand_output_is_a_pydantic_base_model():
     assert issubclass(butilib.PlayHandOutput, pydantic.BaseModel)
 
 
-def test_play_hand_output_has_all_expected_attributes():  # TODO
-    pass
+def test_play_hand_output_has_all_expected_attributes():
+    """PlayHandOutput:
+    - history: History
+    - triumph: Optional[Suit] = None
+    - butifarra: bool = False
+    - player_c: int (0 <= n <= 3)
+    - delegated: bool
+    - contrada: Contrada
+    - game_variant: GameVariant
+    - points: Tuple[int, int]
+    - score: Tuple[int, int]
+    """
+    play_hand_output = butilib.PlayHandOutput(
+        history=butilib.History(bazas=[]),
+        triumph=butilib.OROS,
+        player_c=2,
+        delegated=True,
+        contrada=butilib.CONTRADA,
+        game_variant=butilib.LIBRE,
+        points=(40, 32),
+        score=(8, 0),
+    )
+
+    assert play_hand_output.history == butilib.History(bazas=[])
+    assert play_hand_output.triumph == butilib.OROS
+    assert play_hand_output.butifarra is False
+    assert play_hand_output.player_c == 2
+    assert play_hand_output.delegated is True
+    assert play_hand_output.contrada == butilib.CONTRADA
+    assert play_hand_output.game_variant == butilib.LIBRE
+    assert play_hand_output.points == (40, 32)
+    assert play_hand_output.score == (8, 0)
+
+
+def test_hand_score_awards_the_points_over_36_multiplied_by_contrada_and_butifarra():
+    assert butilib.hand_score((40, 32), butilib.NORMAL, False) == (4, 0)
+    assert butilib.hand_score((30, 42), butilib.CONTRADA, False) == (0, 12)
+    assert butilib.hand_score((40, 32), butilib.RECONTRADA, True) == (32, 0)
+    assert butilib.hand_score((36, 36), butilib.SANT_VICENTADA, True) == (0, 0)
+
+
+class FirstPlayableModel(butilib.Model):
+    def _cantar(self, input):
+        if input.delegated:
+            return butilib.CantarOutput(butifarra=True)
+        return butilib.CantarOutput(delegate=True)
+
+    def _contrar(self, input):
+        return butilib.ContrarOutput(contrar=input.contrada == butilib.NORMAL)
+
+    def _play(self, input):
+        return butilib.PlayOutput(card=input.playable_cards()[0])
+
+
+def test_play_hand_function_plays_the_whole_hand_and_returns_a_play_hand_output():
+    model = FirstPlayableModel()
+
+    deck = butilib.Deck.new()
+    deck.shuffle()
+    card_sets = list(deck.deal())
+
+    output = butilib.play_hand(
+        butilib.PlayHandInput(
+            players=[model, model, model, model],
+            card_sets=card_sets,
+            score=(12, 3),
+            player_c=1,
+        )
+    )
+
+    assert isinstance(output, butilib.PlayHandOutput)
+    assert len(output.history) == 12
+    assert output.history.bazas[0].initial_player == 0
+    assert output.butifarra is True
+    assert output.delegated is True
+    assert output.contrada == butilib.CONTRADA
+    assert sum(output.points) == 72
+    assert output.score == (
+        12 + butilib.hand_score(output.points, butilib.CONTRADA, True)[0],
+        3 + butilib.hand_score(output.points, butilib.CONTRADA, True)[1],
+    )
+    assert all(len(c) == 12 for c in card_sets)
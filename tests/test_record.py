@@ -0,0 +1,40 @@
+import butilib
+from butilib.record import GameRecord
+
+
+class FirstPlayableModel(butilib.Model):
+    def _cantar(self, input):
+        return butilib.CantarOutput(suit=butilib.ESPADAS)
+
+    def _contrar(self, input):
+        return butilib.ContrarOutput(contrar=False)
+
+    def _play(self, input):
+        return butilib.PlayOutput(card=input.playable_cards()[0])
+
+
+def test_game_record_can_be_created_from_a_played_hand_and_rebuilds_its_history():
+    model = FirstPlayableModel()
+    deck = butilib.Deck.new()
+    deck.shuffle()
+
+    output = butilib.play_hand(
+        butilib.PlayHandInput(
+            players=[model] * 4,
+            card_sets=list(deck.deal()),
+            score=(0, 0),
+            player_c=2,
+            game_variant=butilib.OBLIGADA,
+        )
+    )
+    record = GameRecord.from_hand(output)
+
+    assert len(record.cards) == 48
+    assert record.leaders[0] == 3
+    assert record.triumph == butilib.ESPADAS
+    assert record.butifarra is False
+    assert record.game_variant == butilib.OBLIGADA
+    assert record.player_c == 2
+    assert record.delegated is False
+    assert record.contrada == butilib.NORMAL
+    assert record.history() == output.history
@@ -0,0 +1,38 @@
+import butilib
+from butilib.replay import ReplayError, verify_game, verify_games
+
+from .helpers import play_record
+
+
+def test_verify_game_accepts_played_hands():
+    for variant in [butilib.LIBRE, butilib.OBLIGADA]:
+        assert verify_game(play_record(game_variant=variant)) is None
+
+
+def test_verify_game_reports_inconsistent_leaders_and_illegal_cards():
+    record = play_record(seed=3)
+
+    leaders = list(record.leaders)
+    leaders[5] = (leaders[5] + 1) % 4
+    error = verify_game(record._replace(leaders=tuple(leaders)), game=7)
+    assert error == ReplayError(
+        7, 5, "The baza was not started by the winner of the previous one."
+    )
+
+    cards = list(record.cards)
+    cards[0], cards[1] = cards[1], cards[0]
+    cards[4:8] = [cards[4 + (i + 1) % 4] for i in range(4)]
+    assert verify_game(record._replace(cards=tuple(cards))) is not None
+
+    error = verify_game(record._replace(cards=record.cards[:44]))
+    assert error.baza == -1
+
+
+def test_verify_games_reports_errors_by_position_using_several_processes():
+    records = [play_record() for _ in range(6)]
+    records[4] = records[4]._replace(leaders=(2,) * 12)
+
+    assert verify_games(records, chunk_size=4) == [
+        ReplayError(4, 0, "The first baza was not started by the expected player.")
+    ]
+    assert verify_games(records, processes=2, chunk_size=4) == verify_games(records)
@@ -0,0 +1,113 @@
+import random
+import warnings
+
+import pytest
+
+import butilib
+from butilib import rules
+from butilib.models import GreedyModel
+from butilib.rollout import MoveStats, RolloutExecutor, playout
+from butilib.tracker import CardTracker
+
+
+def position(seed, cards_played):
+    rng = random.Random(seed)
+    ids = list(range(48))
+    rng.shuffle(ids)
+    hands = [ids[i * 12 : (i + 1) * 12] for i in range(4)]
+    tracker = CardTracker(butilib.OROS, butilib.LIBRE, 1)
+    for _ in range(cards_played):
+        hand = hands[tracker.player]
+        c = rng.choice(rules.playable(hand, tracker.baza, 0, False))
+        hand.remove(c)
+        tracker.play(c)
+    return hands, tracker
+
+
+def test_playout_plays_the_rest_of_the_hand():
+    hands, tracker = position(0, 6)
+    total = sum(rules.POINTS[c] for h in hands for c in h) + sum(
+        rules.POINTS[c] for c in tracker.baza
+    )
+    points = playout(
+        hands, tracker.leader, list(tracker.baza), 0, False, random.Random(0)
+    )
+    assert sum(points) == total + 11
+    assert all(len(h) == 0 for h in hands)
+
+
+def test_rollout_executor_evaluates_every_legal_card():
+    hands, tracker = position(1, 5)
+    player = tracker.player
+    legal = rules.playable(hands[player], tracker.baza, 0, False)
+
+    with RolloutExecutor(processes=1, rollouts=30, batch_size=7, seed=0) as ex:
+        stats = ex.evaluate_tracker(tracker, player, hands[player], legal)
+        again = ex.evaluate_tracker(tracker, player, hands[player], legal, 10)
+
+    assert all(isinstance(m, MoveStats) for m in stats)
+    assert sorted(m.card for m in stats) == sorted(legal)
+    assert all(m.rollouts == 30 for m in stats)
+    assert [m.mean for m in stats] == sorted((m.mean for m in stats), reverse=True)
+    assert all(0 <= m.mean <= 72 and m.standard_error >= 0 for m in stats)
+    assert all(m.rollouts == 10 for m in again)
+
+
+def test_rollout_executor_rejects_a_number_of_rollouts_below_one():
+    hands, tracker = position(1, 5)
+    player = tracker.player
+    legal = rules.playable(hands[player], tracker.baza, 0, False)
+
+    with RolloutExecutor(processes=1, rollouts=30, seed=0) as ex:
+        for rollouts in (0, -1):
+            with pytest.raises(ValueError):
+                ex.evaluate_tracker(tracker, player, hands[player], legal, rollouts)
+
+
+def test_rollout_executor_workers_match_the_local_rollouts():
+    hands, tracker = position(2, 9)
+    player = tracker.player
+    legal = rules.playable(hands[player], tracker.baza, 0, False)
+
+    results = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", ResourceWarning)
+        for processes in (1, 2):
+            with RolloutExecutor(processes, rollouts=20, batch_size=5, seed=3) as ex:
+                results.append(
+                    [
+                        ex.evaluate_tracker(tracker, player, hands[player], legal)
+                        for _ in range(2)
+                    ]
+                )
+    assert results[0] == results[1]
+
+
+def test_rollout_executor_evaluates_a_play_input():
+    inputs = []
+
+    class Recorder(GreedyModel):
+        def _play(self, input):
+            if len(inputs) < 6:
+                inputs.append(input.model_copy(deep=True))
+            return super()._play(input)
+
+    random.seed(0)
+    deck = butilib.Deck.new()
+    deck.shuffle()
+    butilib.play_hand(
+        butilib.PlayHandInput(
+            players=[Recorder(seed=0)] + [GreedyModel(seed=i) for i in range(3)],
+            card_sets=list(deck.deal()),
+            player_c=3,
+            score=(0, 0),
+            game_variant=butilib.LIBRE,
+        )
+    )
+
+    with RolloutExecutor(processes=1, rollouts=5, seed=0) as ex:
+        for input in inputs:
+            stats = ex.evaluate(input)
+            assert sorted(m.card for m in stats) == sorted(
+                c.to_id() for c in input.playable_cards()
+            )
@@ -0,0 +1,117 @@
+import random
+
+import butilib
+from butilib import rules
+from butilib.models import RandomLegalModel
+
+
+def test_winner_returns_the_position_of_the_card_that_wins_the_baza():
+    cards = [butilib.Card(number=n, suit=butilib.OROS).to_id() for n in [2, 9, 1, 3]]
+    assert rules.winner(cards, None) == 1
+
+    cards[3] = butilib.Card(number=2, suit=butilib.COPAS).to_id()
+    assert rules.winner(cards, rules.SUIT_INDEX[butilib.COPAS]) == 3
+    assert rules.winner(cards, rules.SUIT_INDEX[butilib.ESPADAS]) == 1
+
+
+def test_baza_points_counts_one_point_plus_the_points_of_the_cards():
+    cards = [butilib.Card(number=n, suit=butilib.OROS).to_id() for n in [2, 9, 1, 3]]
+    assert rules.baza_points(cards) == 10
+
+
+def compare_playable(play_input):
+    """The playable cards computed with Card.compare, independently of butilib.rules."""
+    card_set = play_input.card_set
+    cards = play_input.cards
+    if len(card_set) == 1 or len(cards) == 0:
+        return list(card_set.cards)
+
+    f_suit = cards[0].suit
+    desc = card_set.describe()
+    if desc[f_suit].number == 1:
+        return card_set.get(suit=f_suit)
+
+    if play_input.butifarra:
+        t1, t2 = f_suit, None
+    else:
+        t1, t2 = play_input.triumph, f_suit
+
+    win_i = 0
+    for i in range(1, len(cards)):
+        if cards[i].compare(cards[win_i], t1, t2):
+            win_i = i
+    win_card = cards[win_i]
+    enemy_winning = (len(cards) - win_i) % 2 != 0
+
+    if desc[f_suit].number > 1:
+        p_cards = card_set.get(suit=f_suit)
+        if enemy_winning:
+            w_cards = [c for c in p_cards if c.compare(win_card, t1, t2)]
+            if len(w_cards) > 0:
+                return w_cards
+            if play_input.game_variant is butilib.OBLIGADA:
+                lower = p_cards[0]
+                for c in p_cards[1:]:
+                    if lower.compare(c, t1, t2):
+                        lower = c
+                return [lower]
+        return p_cards
+
+    if enemy_winning and not play_input.butifarra:
+        p_cards = card_set.get(suit=play_input.triumph)
+        if len(p_cards) > 0:
+            w_cards = [c for c in p_cards if c.compare(win_card, t1, t2)]
+            return w_cards if len(w_cards) > 0 else p_cards
+
+    return list(card_set.cards)
+
+
+def test_playable_returns_the_same_cards_as_play_input_playable_cards():
+    random.seed(0)
+    model = RandomLegalModel(seed=0)
+
+    for triumph in [None, butilib.OROS, butilib.COPAS]:
+        for variant in [butilib.LIBRE, butilib.OBLIGADA]:
+            deck = butilib.Deck.new()
+            deck.shuffle()
+            card_sets = [butilib.CardSet(cards=list(c.cards)) for c in deck.deal()]
+            history = butilib.History(bazas=[])
+            leader = 1
+
+            for _ in range(12):
+                cards = []
+                for i in range(4):
+                    player = (leader + i) % 4
+                    play_input = butilib.PlayInput(
+                        history=history,
+                        card_set=card_sets[player],
+                        triumph=triumph,
+                        butifarra=triumph is None,
+                        player_number=player,
+                        cards=cards,
+                        contrada=butilib.NORMAL,
+                        player_c=0,
+                        delegated=False,
+                        game_variant=variant,
+                    )
+                    expected = [c.to_id() for c in compare_playable(play_input)]
+                    assert [c.to_id() for c in play_input.playable_cards()] == expected
+                    assert expected == rules.playable(
+                        [c.to_id() for c in card_sets[player].cards],
+                        [c.to_id() for c in cards],
+                        rules.suit_index(triumph),
+                        variant == butilib.OBLIGADA,
+                    )
+
+                    card = model.play(play_input).card
+                    card_sets[player].remove(card)
+                    cards = cards + [card]
+
+                win_i = rules.winner(
+                    [c.to_id() for c in cards], rules.suit_index(triumph)
+                )
+                history = butilib.History(
+                    bazas=history.bazas
+                    + [butilib.Baza(initial_player=leader, cards=cards)]
+                )
+                leader = (leader + win_i) % 4
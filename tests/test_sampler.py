@@ -0,0 +1,121 @@
+import itertools
+import random
+from collections import Counter
+
+import pytest
+
+import butilib
+from butilib import rules
+from butilib.sampler import Constraints, DealSampler, sample_deals
+
+
+class RecordingModel(butilib.Model):
+    def _cantar(self, input):
+        return butilib.CantarOutput(suit=butilib.OROS)
+
+    def _contrar(self, input):
+        return butilib.ContrarOutput(contrar=False)
+
+    def _play(self, input):
+        inputs.append(input.model_copy(deep=True))
+        return butilib.PlayOutput(card=random.choice(input.playable_cards()))
+
+
+inputs = []
+
+
+def recorded_inputs(seed, game_variant=butilib.LIBRE):
+    random.seed(seed)
+    inputs.clear()
+    deck = butilib.Deck.new()
+    deck.shuffle()
+    model = RecordingModel()
+    output = butilib.play_hand(
+        butilib.PlayHandInput(
+            players=[model] * 4,
+            card_sets=list(deck.deal()),
+            score=(0, 0),
+            player_c=0,
+            game_variant=game_variant,
+        )
+    )
+    return output, list(inputs)
+
+
+def is_consistent(input, hands):
+    """Replay the hand with the sampled cards and check every card played was legal."""
+    triumph = None if input.butifarra else rules.suit_index(input.triumph)
+    obligada = input.game_variant == butilib.OBLIGADA
+    bazas = [(b.initial_player, [c.to_id() for c in b.cards]) for b in input.history]
+    bazas.append((input.initial_player(), [c.to_id() for c in input.cards]))
+
+    held = [list(h) for h in hands]
+    for leader, baza in bazas:
+        for j, c in enumerate(baza):
+            held[(leader + j) % 4].append(c)
+    for leader, baza in bazas:
+        for j, c in enumerate(baza):
+            seat = (leader + j) % 4
+            if c not in rules.playable(held[seat], baza[:j], triumph, obligada):
+                return False
+            held[seat].remove(c)
+    return True
+
+
+def test_constraints_have_exact_counts_of_the_unknown_cards():
+    _, recorded = recorded_inputs(0)
+    for input in recorded:
+        constraints = Constraints.from_play_input(input)
+        assert sum(constraints.counts) == len(constraints.unknown)
+        assert constraints.counts[input.player_number] == 0
+        assert len(constraints.known[input.player_number]) == len(input.card_set)
+
+
+@pytest.mark.parametrize("game_variant", [butilib.LIBRE, butilib.OBLIGADA])
+def test_sampled_deals_are_consistent_with_everything_played(game_variant):
+    for seed in range(3):
+        _, recorded = recorded_inputs(seed, game_variant)
+        for input in recorded[::3]:
+            for hands in sample_deals(input, 5, random.Random(seed)):
+                assert [len(h) for h in hands] == [
+                    len(input.card_set)
+                    - (1 if (s - input.initial_player()) % 4 < len(input.cards) else 0)
+                    for s in range(4)
+                ]
+                assert sorted(itertools.chain(*hands)) == sorted(
+                    set(range(48))
+                    - {c.to_id() for b in input.history for c in b.cards}
+                    - {c.to_id() for c in input.cards}
+                )
+                assert is_consistent(input, hands)
+
+
+def test_deal_sampler_samples_uniformly_among_the_consistent_deals():
+    unknown = (0, 1, 2, 3, 4)
+    allowed = (0, 0b00111, 0b11110, 0b11011)
+    constraints = Constraints(((), (), (), ()), unknown, allowed, (0, 2, 2, 1))
+    sampler = DealSampler(constraints)
+
+    deals = []
+    for p in itertools.permutations(unknown):
+        hands = [(), tuple(sorted(p[:2])), tuple(sorted(p[2:4])), (p[4],)]
+        if all(allowed[s] >> c & 1 for s in range(4) for c in hands[s]):
+            deals.append(tuple(hands))
+    deals = set(deals)
+    assert sampler.total == len(deals)
+
+    rng = random.Random(0)
+    n = 200 * len(deals)
+    counts = Counter(
+        tuple(tuple(sorted(h)) for h in sampler.sample(rng)) for _ in range(n)
+    )
+    assert set(counts) == deals
+    assert all(abs(c - n / len(deals)) < 0.2 * n / len(deals) for c in counts.values())
+
+
+def test_deal_sampler_raises_a_value_error_if_no_deal_is_consistent():
+    constraints = Constraints(
+        ((), (), (), ()), (0, 1), (0, 0b01, 0b01, 0), (0, 1, 1, 0)
+    )
+    with pytest.raises(ValueError):
+        DealSampler(constraints)
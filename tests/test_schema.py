@@ -709,6 +709,9 @@ def test_play_input_has_initial_player_method_that_returns_the_number_of_the_pla
 
     assert play_input.initial_player() == 2
 
+    play_input.delegated = True
+    assert play_input.initial_player() == 0
+
     card_set.remove(butilib.Card(number=8, suit=butilib.BASTOS))
 
     play_input = butilib.PlayInput(
@@ -734,3 +737,58 @@ def test_play_input_has_initial_player_method_that_returns_the_number_of_the_pla
     )
 
     assert play_input.initial_player() == 1
+
+
+def test_play_input_has_playable_cards_method_that_returns_the_cards_allowed_by_the_rules():
+    card_set = butilib.CardSet(
+        cards=[
+            butilib.Card(number=1, suit=butilib.ESPADAS),
+            butilib.Card(number=5, suit=butilib.BASTOS),
+            butilib.Card(number=4, suit=butilib.BASTOS),
+            butilib.Card(number=7, suit=butilib.BASTOS),
+            butilib.Card(number=10, suit=butilib.BASTOS),
+            butilib.Card(number=1, suit=butilib.BASTOS),
+            butilib.Card(number=9, suit=butilib.BASTOS),
+            butilib.Card(number=2, suit=butilib.ESPADAS),
+            butilib.Card(number=10, suit=butilib.ESPADAS),
+            butilib.Card(number=11, suit=butilib.ESPADAS),
+            butilib.Card(number=9, suit=butilib.ESPADAS),
+        ]
+    )
+
+    play_input = butilib.PlayInput(
+        history=butilib.History(
+            bazas=[
+                butilib.Baza(
+                    initial_player=2,
+                    cards=[
+                        butilib.Card(number=i, suit=butilib.COPAS) for i in [9, 3, 2, 4]
+                    ],
+                )
+            ]
+        ),
+        triumph=butilib.OROS,
+        player_number=0,
+        cards=[
+            butilib.Card(number=5, suit=butilib.COPAS),
+            butilib.Card(number=10, suit=butilib.COPAS),
+        ],
+        card_set=card_set,
+        contrada=butilib.NORMAL,
+        player_c=1,
+        delegated=False,
+        game_variant=butilib.LIBRE,
+    )
+
+    assert play_input.playable_cards() == card_set.cards
+
+    play_input.cards = [
+        butilib.Card(number=5, suit=butilib.BASTOS),
+        butilib.Card(number=8, suit=butilib.BASTOS),
+    ]
+
+    assert play_input.playable_cards() == [
+        butilib.Card(number=10, suit=butilib.BASTOS),
+        butilib.Card(number=1, suit=butilib.BASTOS),
+        butilib.Card(number=9, suit=butilib.BASTOS),
+    ]
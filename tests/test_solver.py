@@ -0,0 +1,136 @@
+import random
+
+import butilib
+from butilib import rules
+from butilib.solver import ID_TO_POS, POS_TO_ID, Solver, legal_mask, solve
+from butilib.zobrist import TranspositionTable, ZobristHash
+
+
+def brute_force(hands, leader, baza, triumph, obligada):
+    player = (leader + len(baza)) % 4
+    if not hands[player]:
+        return 0
+
+    best = None
+    for c in rules.playable(hands[player], baza, triumph, obligada):
+        hands[player].remove(c)
+        cards = baza + [c]
+        if len(cards) == 4:
+            winner = (leader + rules.winner(cards, triumph)) % 4
+            points = rules.baza_points(cards) if winner % 2 == 0 else 0
+            value = points + brute_force(hands, winner, [], triumph, obligada)
+        else:
+            value = brute_force(hands, leader, cards, triumph, obligada)
+        hands[player].append(c)
+
+        if best is None or (value > best if player % 2 == 0 else value < best):
+            best = value
+    return best
+
+
+def test_card_positions_are_ordered_by_strength_inside_each_suit():
+    assert [POS_TO_ID[ID_TO_POS[i]] for i in range(48)] == list(range(48))
+    assert [POS_TO_ID[p] % 12 + 1 for p in range(12)] == [
+        2,
+        3,
+        4,
+        5,
+        6,
+        7,
+        8,
+        10,
+        11,
+        12,
+        1,
+        9,
+    ]
+
+
+def test_legal_mask_returns_the_same_cards_as_rules_playable():
+    random.seed(0)
+    for _ in range(500):
+        ids = random.sample(range(48), 12)
+        hand, baza = ids[:9], ids[9 : 9 + random.randrange(4)]
+        triumph = random.choice([None, 0, 1, 2, 3])
+        obligada = random.random() < 0.5
+
+        mask = legal_mask(
+            sum(1 << ID_TO_POS[c] for c in hand),
+            [ID_TO_POS[c] for c in baza],
+            triumph,
+            obligada,
+        )
+        expected = rules.playable(hand, baza, triumph, obligada)
+        assert sorted(POS_TO_ID[p] for p in range(48) if mask >> p & 1) == sorted(
+            expected
+        )
+
+
+def test_solver_finds_the_same_value_as_a_full_minimax_search():
+    random.seed(1)
+    for _ in range(60):
+        k = random.choice([2, 3, 4])
+        ids = random.sample(range(48), 4 * k)
+        hands = [ids[i * k : (i + 1) * k] for i in range(4)]
+        triumph = random.choice([None, 0, 1, 2, 3])
+        obligada = random.random() < 0.5
+        leader = random.randrange(4)
+
+        baza = []
+        for j in range(random.randrange(3)):
+            player = (leader + j) % 4
+            c = random.choice(rules.playable(hands[player], baza, triumph, obligada))
+            hands[player].remove(c)
+            baza.append(c)
+
+        expected = brute_force(
+            [list(h) for h in hands], leader, baza, triumph, obligada
+        )
+
+        solver = Solver(
+            None if triumph is None else rules.SUITS[triumph],
+            butilib.OBLIGADA if obligada else butilib.LIBRE,
+        )
+        value = solver.solve_positions(
+            [sum(1 << ID_TO_POS[c] for c in h) for h in hands],
+            leader,
+            [ID_TO_POS[c] for c in baza],
+        )
+        assert value == expected
+
+
+def test_solve_returns_the_points_of_both_teams():
+    card_sets = [
+        butilib.CardSet(cards=[butilib.Card(number=n, suit=s) for n in [9, 1, 12, 2]])
+        for s in butilib.Suit
+    ]
+
+    assert solve(card_sets, butilib.OROS, butilib.LIBRE, leader=0) == (52, 0)
+    assert solve(card_sets, butilib.BASTOS, butilib.LIBRE, leader=0) == (0, 52)
+
+    points = solve(
+        card_sets[1:] + card_sets[:1],
+        None,
+        butilib.OBLIGADA,
+        leader=1,
+        cards=[],
+    )
+    assert sum(points) == 52
+
+
+def test_solver_with_a_small_fixed_size_table_finds_the_same_values():
+    random.seed(2)
+    for _ in range(20):
+        ids = random.sample(range(48), 12)
+        hands = [ids[i * 3 : (i + 1) * 3] for i in range(4)]
+        triumph = random.choice([None, 0, 1, 2, 3])
+        positions = [sum(1 << ID_TO_POS[c] for c in h) for h in hands]
+        suit = None if triumph is None else rules.SUITS[triumph]
+
+        table = TranspositionTable(4)
+        value = Solver(suit, butilib.LIBRE, table).solve_positions(positions, 0)
+        assert value == Solver(suit, butilib.LIBRE).solve_positions(positions, 0)
+        assert len(table) <= 4
+        # The root position is the deepest one, so it is never replaced.
+        root = ZobristHash([[ID_TO_POS[c] for c in h] for h in hands], 0).value
+        assert root in table
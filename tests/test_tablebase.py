@@ -0,0 +1,178 @@
+import random
+
+import pytest
+
+from butilib import rules, tablebase
+from butilib.canonical import permute_cards, permute_suit
+from butilib.record import GameRecord
+from butilib.rules import SUITS
+from butilib.solver import ID_TO_POS, Solver
+from butilib.tablebase import (
+    Tablebase,
+    build_tablebase,
+    canonical_position,
+    endgame_positions,
+    position_key,
+    random_endgames,
+)
+from butilib.variants import LIBRE, OBLIGADA
+
+
+def solve_ids(hands, leader, triumph):
+    solver = Solver(None if triumph is None else SUITS[triumph], LIBRE)
+    masks = [sum(1 << ID_TO_POS[c] for c in h) for h in hands]
+    return solver.solve_positions(masks, leader)
+
+
+def random_record(seed):
+    rng = random.Random(seed)
+    ids = list(range(48))
+    rng.shuffle(ids)
+    hands = [ids[i * 12 : (i + 1) * 12] for i in range(4)]
+    triumph = rng.choice([None, 0, 1, 2, 3])
+    leader, cards, leaders = 1, [], []
+    for _ in range(12):
+        baza = []
+        for j in range(4):
+            hand = hands[(leader + j) % 4]
+            c = rng.choice(rules.playable(hand, baza, triumph, False))
+            hand.remove(c)
+            baza.append(c)
+        leaders.append(leader)
+        cards += baza
+        leader = (leader + rules.winner(baza, triumph)) % 4
+    return GameRecord(
+        tuple(cards),
+        tuple(leaders),
+        None if triumph is None else SUITS[triumph],
+        LIBRE,
+    )
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    path = tmp_path_factory.mktemp("tablebase") / "k2.bin"
+    positions = list(random_endgames(2, 40, random.Random(0)))
+    count = build_tablebase(path, positions, 2, LIBRE)
+    assert 0 < count <= len(positions)
+    with Tablebase(path) as tb:
+        yield tb, positions
+
+
+def test_tablebase_lookups_match_the_solver(table):
+    tb, positions = table
+    assert tb.k == 2 and not tb.obligada and len(tb) <= tb.size // 2
+    for hands, leader, triumph in positions:
+        assert tb.lookup(hands, leader, triumph) == solve_ids(hands, leader, triumph)
+
+
+def test_tablebase_lookups_are_invariant_to_suits_and_rotation(table):
+    tb, positions = table
+    rng = random.Random(1)
+    for hands, leader, triumph in positions:
+        perm = tuple(rng.sample(range(4), 4))
+        r = rng.randrange(4)
+        other = [permute_cards(hands[(i - r) % 4], perm) for i in range(4)]
+        other_leader = (leader + r) % 4
+        other_triumph = permute_suit(triumph, perm)
+
+        expected = solve_ids(other, other_leader, other_triumph)
+        assert tb.lookup(other, other_leader, other_triumph) == expected
+
+
+def test_tablebase_returns_none_on_a_miss(table):
+    tb, _ = table
+    misses = tb.misses
+    assert (
+        tb.lookup([[0, 1, 2], [12, 13, 14], [24, 25, 26], [36, 37, 38]], 0, 0) is None
+    )
+    assert tb.misses == misses + 1
+
+
+def test_position_key_ignores_the_cards_without_points():
+    # The 2 and 3 of OROS in the first position are the 5 and 7 in the second one.
+    a = [[1, 13], [2, 14], [8, 20], [9, 21]]
+    b = [[4, 13], [6, 14], [8, 20], [9, 21]]
+    masks = [[sum(1 << ID_TO_POS[c] for c in h) for h in hs] for hs in (a, b)]
+    assert position_key(masks[0], 0, None) != 0
+    assert position_key(masks[0], 0, None) == position_key(masks[1], 0, None)
+    assert position_key(masks[0], 0, None) != position_key(masks[0], 0, 0)
+
+
+def test_endgame_positions_returns_the_cards_left_in_recorded_hands():
+    records = [random_record(seed) for seed in range(5)]
+    for record, (hands, leader, triumph) in zip(records, endgame_positions(records, 3)):
+        assert sorted(c for h in hands for c in h) == sorted(record.cards[36:])
+        assert all(len(h) == 3 for h in hands)
+        assert leader == record.leaders[9]
+        assert triumph == rules.suit_index(record.triumph)
+
+
+def after_a_baza(hands, leader, triumph):
+    # The positions after every legal baza.
+    def walk(baza):
+        if len(baza) == 4:
+            rest = [[c for c in h if c not in baza] for h in hands]
+            yield rest, (leader + rules.winner(baza, triumph)) % 4, triumph
+            return
+        hand = hands[(leader + len(baza)) % 4]
+        for c in rules.playable(hand, baza, triumph, False):
+            yield from walk(baza + [c])
+
+    return walk([])
+
+
+def test_solver_uses_the_tablebase(tmp_path):
+    rng = random.Random(2)
+    deals = []
+    for _ in range(3):
+        ids = rng.sample(range(48), 16)
+        deals.append([ids[i * 4 : (i + 1) * 4] for i in range(4)])
+
+    # Every position of the deals after two bazas is in the table.
+    positions = [
+        p
+        for hands in deals
+        for first in after_a_baza(hands, 0, 0)
+        for p in after_a_baza(*first)
+    ]
+    path = tmp_path / "k2.bin"
+    build_tablebase(path, positions, 2, LIBRE)
+
+    with Tablebase(path) as tb:
+        for hands in deals:
+            masks = [sum(1 << ID_TO_POS[c] for c in h) for h in hands]
+            solver = Solver(SUITS[0], LIBRE, tablebase=tb)
+            assert solver.solve_positions(masks, 0) == solve_ids(hands, 0, 0)
+        assert tb.hits > 0 and tb.misses == 0
+
+
+def test_tablebase_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a tablebase" * 4)
+    with pytest.raises(ValueError):
+        Tablebase(path)
+
+
+def test_tablebase_tells_apart_positions_with_the_same_key(tmp_path, monkeypatch):
+    # Every position shares a key: the lookups must still match the solver.
+    monkeypatch.setattr(tablebase, "_key", lambda canonical: 1)
+    positions = list(random_endgames(2, 10, random.Random(3)))
+    path = tmp_path / "k2.bin"
+    build_tablebase(path, positions, 2, LIBRE)
+    with Tablebase(path) as tb:
+        for hands, leader, triumph in positions:
+            expected = solve_ids(hands, leader, triumph)
+            assert tb.lookup(hands, leader, triumph) == expected
+        assert tb.lookup([[0, 1], [12, 13], [24, 25], [36, 37]], 0, 0) is None
+
+
+def test_canonical_position_tells_apart_triumph_and_butifarra():
+    masks = [sum(1 << ID_TO_POS[c] for c in h) for h in [[0], [12], [24], [36]]]
+    assert canonical_position(masks, 0, None) != canonical_position(masks, 0, 0)
+
+
+def test_solver_rejects_a_tablebase_of_another_game_variant(table):
+    tb, _ = table
+    with pytest.raises(ValueError):
+        Solver(SUITS[0], OBLIGADA, tablebase=tb)
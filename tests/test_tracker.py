@@ -0,0 +1,117 @@
+import random
+
+import butilib
+from butilib import rules
+from butilib.tracker import FULL_MASK, SUIT_MASK, CardTracker, excluded_cards
+
+
+class TrackedModel(butilib.Model):
+    def _cantar(self, input):
+        if input.delegated:
+            return butilib.CantarOutput(butifarra=True)
+        return butilib.CantarOutput(delegate=True)
+
+    def _contrar(self, input):
+        return butilib.ContrarOutput(contrar=False)
+
+    def _play(self, input):
+        inputs.append(input.model_copy(deep=True))
+        return butilib.PlayOutput(card=random.choice(input.playable_cards()))
+
+
+inputs = []
+
+
+def test_excluded_cards_reveals_voids_and_cards_that_would_have_won():
+    # Lead 5 of OROS, the partner of the leader did not follow: void in OROS, and in triumph (BASTOS) since the
+    # enemy was winning.
+    assert excluded_cards([4], 14 + 12, 1, False) == (0xFFF | 0xFFF << 12)
+    # Trumped with a 2 of BASTOS: only void in OROS.
+    assert excluded_cards([4], 13, 1, False) == 0xFFF
+    # Followed with a 2 under a 5 of the enemy: no card of OROS beats the 5, and on OBLIGADA none is below the 2.
+    beating = sum(1 << c for c in range(12) if rules.STRENGTH[c] > rules.STRENGTH[4])
+    assert excluded_cards([4], 1, 1, False) == beating
+    assert excluded_cards([4], 1, 1, True) == beating | 1 << 0
+    # The partner is winning: nothing is revealed by following.
+    assert excluded_cards([0, 4], 1, 1, True) == 0
+    assert excluded_cards([], 7, None, True) == 0
+
+
+def test_card_tracker_updates_the_possible_cards_of_every_player():
+    tracker = CardTracker(butilib.BASTOS, butilib.LIBRE, leader=1)
+    assert tracker.player == 1
+    assert all(tracker.possible(s) == FULL_MASK for s in range(4))
+
+    tracker.play(4)  # 5 of OROS
+    tracker.play(26)  # 3 of ESPADAS, void in OROS and BASTOS
+    assert tracker.player == 3
+    assert tracker.counts == [12, 11, 11, 12]
+    assert tracker.played == 1 << 4 | 1 << 26
+    assert tracker.void(2, 0) and tracker.void(2, 1) and not tracker.void(2, 2)
+    assert tracker.voids(2) == 0b0011
+    assert tracker.voids(1) == 0
+    assert tracker.possible(2) == FULL_MASK & ~(
+        SUIT_MASK[0] | SUIT_MASK[1] | 1 << 4 | 1 << 26
+    )
+
+    tracker.play(0)  # 1 of OROS
+    tracker.play(13)  # 2 of BASTOS, trumps and wins
+    assert tracker.leader == 0
+    assert tracker.baza == []
+    assert tracker.points == [1 + 4, 0]
+
+
+def test_card_tracker_copy_is_independent():
+    tracker = CardTracker(None, butilib.OBLIGADA, leader=0)
+    tracker.play(4)
+    other = tracker.copy()
+    other.play(26)
+    assert tracker.baza == [4] and other.baza == [4, 26]
+    assert tracker.possible(1) == FULL_MASK & ~(1 << 4)
+
+
+def test_engine_hands_the_tracker_to_the_models_as_rebuilt_from_the_input():
+    random.seed(0)
+    inputs.clear()
+    deck = butilib.Deck.new()
+    deck.shuffle()
+    model = TrackedModel()
+    butilib.play_hand(
+        butilib.PlayHandInput(
+            players=[model] * 4,
+            card_sets=list(deck.deal()),
+            score=(0, 0),
+            player_c=2,
+            game_variant=butilib.OBLIGADA,
+        )
+    )
+
+    assert len(inputs) > 12
+    for input in inputs:
+        tracker = input.tracker
+        rebuilt = CardTracker.from_play_input(input)
+        assert tracker.player == input.player_number
+        assert tracker.leader == rebuilt.leader == input.initial_player()
+        assert tracker.baza == rebuilt.baza == [c.to_id() for c in input.cards]
+        assert tracker.counts == rebuilt.counts
+        assert tracker.counts[input.player_number] == len(input.card_set)
+        for s in range(4):
+            assert tracker.possible(s) == rebuilt.possible(s)
+        own = sum(1 << c.to_id() for c in input.card_set.cards)
+        assert tracker.possible(input.player_number) & own == own
+
+
+def test_play_input_built_by_hand_has_no_tracker():
+    deck = butilib.Deck.new()
+    play_input = butilib.PlayInput(
+        history=butilib.History(bazas=[]),
+        card_set=deck.deal()[0],
+        triumph=butilib.OROS,
+        player_number=1,
+        cards=[],
+        contrada=butilib.NORMAL,
+        player_c=0,
+        delegated=False,
+        game_variant=butilib.LIBRE,
+    )
+    assert play_input.tracker is None
@@ -0,0 +1,108 @@
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import butilib
+from butilib import rules
+from butilib.archive import ArchiveWriter, read_archive
+from butilib.record import GameRecord
+from butilib.training import build_training_shards, decision_arrays
+
+from .helpers import play_record
+
+
+def test_decision_arrays_have_a_row_per_decision():
+    records = [play_record(1, butilib.OBLIGADA, seed=0), play_record(2, seed=1)]
+
+    arrays = decision_arrays(records)
+
+    assert arrays["hand"].shape == (96, 48)
+    assert arrays["legal"].shape == (96, 48)
+    assert arrays["baza"].shape == (96, 3)
+    assert arrays["hand"][0].sum() == 12
+    assert arrays["hand"][47].sum() == 1
+    assert arrays["played"][0].sum() == 0
+    assert arrays["played"][4].sum() == 4
+    assert arrays["baza"][0].tolist() == [-1, -1, -1]
+    assert arrays["baza"][2].tolist() == list(records[0].cards[:2]) + [-1]
+    assert arrays["seat"][0] == records[0].leaders[0]
+    triumph = rules.suit_index(records[0].triumph)
+    assert arrays["trump"][0] == (-1 if triumph is None else triumph)
+    assert arrays["game_variant"].tolist() == [1] * 48 + [0] * 48
+    assert arrays["action"].tolist() == list(records[0].cards + records[1].cards)
+
+    rows = np.arange(96)
+    assert arrays["legal"][rows, arrays["action"]].all()
+    assert arrays["hand"][rows, arrays["action"]].all()
+    assert not (arrays["legal"] & ~arrays["hand"]).any()
+
+
+def test_decision_arrays_rejects_illegal_hands():
+    cards = [0, 12, 24, 36, 2, 1, 25, 37]
+    cards += [c for c in range(48) if c not in cards]
+    record = GameRecord(
+        cards=tuple(cards),
+        leaders=(1,) * 12,
+        triumph=None,
+        game_variant=butilib.LIBRE,
+    )
+
+    pytest.raises(ValueError, decision_arrays, [record])
+
+
+def test_build_training_shards_writes_npz_shards_per_archive(tmp_path):
+    sources = []
+    records = []
+    for k in range(2):
+        path = str(tmp_path / f"archive{k}.buti")
+        records.append([play_record(i % 4) for i in range(3)])
+        with ArchiveWriter(path) as writer:
+            writer.write_many(records[k])
+        sources.append(path)
+
+    out_dir = str(tmp_path / "shards")
+    paths = build_training_shards(sources, out_dir, hands_per_shard=2, processes=2)
+
+    assert [p.rsplit("/", 1)[1] for p in paths] == [
+        "0000-archive0-00000.npz",
+        "0000-archive0-00001.npz",
+        "0001-archive1-00000.npz",
+        "0001-archive1-00001.npz",
+    ]
+    assert len(np.load(paths[1])["action"]) == 48
+    assert np.load(paths[3])["action"].tolist() == list(records[1][2].cards)
+    assert paths == build_training_shards(sources, out_dir, hands_per_shard=2)
+
+
+def test_build_training_shards_keeps_archives_with_the_same_name_apart(tmp_path):
+    sources = []
+    for k in range(2):
+        os.makedirs(tmp_path / f"day{k}")
+        path = str(tmp_path / f"day{k}" / "games.buti")
+        with ArchiveWriter(path) as writer:
+            writer.write(play_record(k))
+        sources.append(path)
+
+    paths = build_training_shards(sources, str(tmp_path / "shards"))
+
+    assert len(set(paths)) == 2
+    for path, source in zip(paths, sources):
+        (record,) = read_archive(source)
+        assert np.load(path)["action"].tolist() == list(record.cards)
+
+
+def test_build_training_shards_splits_a_large_archive_across_processes(tmp_path):
+    source = str(tmp_path / "games.buti")
+    records = [play_record(i % 4) for i in range(7)]
+    with ArchiveWriter(source) as writer:
+        writer.write_many(records)
+
+    out_dir = str(tmp_path / "shards")
+    paths = build_training_shards([source], out_dir, hands_per_shard=3, processes=3)
+
+    assert len(paths) == 3
+    assert np.concatenate([np.load(p)["action"] for p in paths]).tolist() == [
+        c for r in records for c in r.cards
+    ]
@@ -0,0 +1,111 @@
+import json
+
+import pydantic
+import pytest
+
+import butilib
+from butilib.wire import (
+    dump_play_input,
+    dump_play_output,
+    load_play_input,
+    load_play_output,
+    play_input_from_wire,
+    play_input_to_wire,
+)
+
+
+def make_play_input():
+    deck = butilib.Deck.new()
+    card_set, _, _, _ = deck.deal()
+    card_set.remove(butilib.Card(number=8, suit=butilib.BASTOS))
+
+    return butilib.PlayInput(
+        history=butilib.History(
+            bazas=[
+                butilib.Baza(
+                    cards=[
+                        butilib.Card(number=i, suit=butilib.BASTOS)
+                        for i in [8, 10, 12, 9]
+                    ],
+                    initial_player=2,
+                )
+            ]
+        ),
+        card_set=card_set,
+        triumph=butilib.OROS,
+        player_number=2,
+        cards=[butilib.Card(number=1, suit=butilib.OROS)],
+        contrada=butilib.CONTRADA,
+        delegated=False,
+        player_c=1,
+        game_variant=butilib.OBLIGADA,
+    )
+
+
+def test_play_input_to_wire_uses_card_ids_and_small_ints():
+    wire = play_input_to_wire(make_play_input())
+
+    assert wire["h"] == [2, 19, 21, 23, 20]
+    assert wire["t"] == 0
+    assert wire["c"] == [0]
+    assert wire["k"] == 1
+    assert wire["v"] == 1
+
+
+def test_play_input_round_trips_through_the_wire_format():
+    play_input = make_play_input()
+    data = dump_play_input(play_input)
+
+    assert len(data) * 3 < len(play_input.model_dump_json())
+
+    for validate in [True, False]:
+        loaded = load_play_input(data, validate=validate)
+        assert isinstance(loaded, butilib.PlayInput)
+        assert loaded.history == play_input.history
+        assert loaded.card_set.cards == play_input.card_set.cards
+        assert loaded.cards == play_input.cards
+        assert loaded.model_dump() == play_input.model_dump()
+
+    assert load_play_input(data.decode()).initial_player() == 1
+
+
+def test_play_output_round_trips_through_the_wire_format():
+    output = butilib.PlayOutput(
+        card=butilib.Card(number=9, suit=butilib.COPAS), forced=True
+    )
+    data = dump_play_output(output)
+
+    assert data == b'{"c":44,"f":true}'
+    assert load_play_output(data) == output
+    assert load_play_output(data, validate=False) == output
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [
+        ("s", [-1]),
+        ("s", [48]),
+        ("c", [-1]),
+        ("h", [2, 19, 21, 23, 48]),
+        ("t", -2),
+        ("t", 4),
+        ("p", 4),
+        ("pc", -1),
+        ("k", 4),
+        ("v", 2),
+    ],
+)
+def test_play_input_wire_rejects_out_of_range_values(field, value):
+    wire = play_input_to_wire(make_play_input())
+    wire[field] = value
+
+    with pytest.raises(pydantic.ValidationError):
+        load_play_input(json.dumps(wire))
+    with pytest.raises(pydantic.ValidationError):
+        play_input_from_wire(wire)
+
+
+def test_play_output_wire_rejects_out_of_range_card_ids():
+    for card in [-1, 48]:
+        with pytest.raises(pydantic.ValidationError):
+            load_play_output(json.dumps({"c": card, "f": False}))
@@ -0,0 +1,106 @@
+import random
+
+from butilib import rules
+from butilib.zobrist import KEYS, TranspositionTable, ZobristHash, ZobristKeys
+
+
+def random_game(seed):
+    rng = random.Random(seed)
+    ids = list(range(48))
+    rng.shuffle(ids)
+    hands = [ids[i * 12 : (i + 1) * 12] for i in range(4)]
+    triumph = rng.choice([None, 0, 1, 2, 3])
+    return rng, hands, triumph
+
+
+def test_zobrist_hash_is_updated_incrementally_as_computed_from_scratch():
+    rng, hands, triumph = random_game(0)
+    zh = ZobristHash(hands, leader=1)
+    leader, points = 1, 0
+
+    for _ in range(12):
+        baza = []
+        for j in range(4):
+            player = (leader + j) % 4
+            c = rng.choice(rules.playable(hands[player], baza, triumph, False))
+            hands[player].remove(c)
+            baza.append(c)
+            zh.play(c)
+            assert zh.value == ZobristHash(hands, leader, baza, points).value
+
+        winner = (leader + rules.winner(baza, triumph)) % 4
+        zh.collect(winner, rules.baza_points(baza))
+        leader = winner
+        points += rules.baza_points(baza) if winner % 2 == 0 else 0
+        assert zh.value == ZobristHash(hands, leader, [], points).value
+
+    assert zh.points == points
+    assert zh.value == KEYS.leader[leader] ^ KEYS.points[points]
+
+
+def test_zobrist_hash_undo_restores_the_previous_positions():
+    rng, hands, triumph = random_game(1)
+    zh = ZobristHash(hands, leader=0)
+    values = [zh.value]
+
+    leader = 0
+    for _ in range(3):
+        baza = []
+        for j in range(4):
+            player = (leader + j) % 4
+            c = rng.choice(rules.playable(hands[player], baza, triumph, False))
+            hands[player].remove(c)
+            baza.append(c)
+            zh.play(c)
+            values.append(zh.value)
+        leader = (leader + rules.winner(baza, triumph)) % 4
+        zh.collect(leader, rules.baza_points(baza))
+        values.append(zh.value)
+
+    values.pop()
+    while values:
+        zh.undo()
+        assert zh.value == values.pop()
+    assert zh.leader == 0 and zh.points == 0 and zh.baza == []
+
+
+def test_zobrist_hash_depends_on_the_order_of_the_transposed_moves_only_through_the_position():
+    hands = [[0, 1], [12, 13], [24, 25], [36, 37]]
+    a = ZobristHash(hands, leader=0, keys=ZobristKeys(seed=5))
+    b = ZobristHash([[1, 0], [13, 12], [25, 24], [37, 36]], leader=0, keys=a.keys)
+    assert a.value == b.value
+    assert a.value != ZobristHash(hands, leader=1, keys=a.keys).value
+    assert a.value != ZobristHash(hands, leader=0, points=3, keys=a.keys).value
+
+
+def test_transposition_table_stores_and_returns_values():
+    table = TranspositionTable(100)
+    assert table.size == 128
+
+    assert table.get(7) is None
+    assert table.store(7, (1, 2), depth=3)
+    assert table.get(7) == (1, 2)
+    assert 7 in table and 8 not in table
+    assert len(table) == 1
+    assert table.hits == 1 and table.misses == 1
+
+    table.clear()
+    assert len(table) == 0 and table.get(7, "x") == "x"
+
+
+def test_transposition_table_depth_replacement_keeps_the_deepest_entry():
+    table = TranspositionTable(4)
+    assert table.store(1, "deep", depth=10)
+    assert not table.store(5, "shallow", depth=2)
+    assert table.get(1) == "deep" and table.get(5) is None
+    assert table.store(9, "deeper", depth=12)
+    assert table.get(9) == "deeper" and table.get(1) is None
+    assert table.store(9, "same key", depth=0)
+    assert table.store(13, "as deep", depth=0)
+
+
+def test_transposition_table_always_replacement_keeps_the_last_entry():
+    table = TranspositionTable(4, replacement="always")
+    table.store(1, "a", depth=10)
+    table.store(5, "b", depth=0)
+    assert table.get(5) == "b" and table.get(1) is None